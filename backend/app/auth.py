@@ -4,9 +4,9 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db
 import app.models as models
 from app.schemas import TokenData
 
@@ -65,7 +65,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> models.User:
     """Retrieve the currently authenticated user from the token"""
     print("\n========== AUTH DEBUG START ==========")
@@ -102,7 +102,7 @@ async def get_current_user(
         print(f"[AUTH][ERROR] Unexpected decoding error: {e}")
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.id == token_data.user_id).first()
+    user = await db.get(models.User, token_data.user_id)
     if not user:
         print(f"[AUTH][ERROR] No user found for ID {token_data.user_id}")
         raise credentials_exception
@@ -111,3 +111,14 @@ async def get_current_user(
     print("========== AUTH DEBUG END ==========\n")
 
     return user
+
+
+async def get_user_from_token(token: str, db: AsyncSession) -> Optional[models.User]:
+    """Resolve a raw JWT (e.g. from a WebSocket query string) to a user, or None"""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        user_id = int(payload.get("sub"))
+    except (JWTError, TypeError, ValueError) as e:
+        print(f"[AUTH][ERROR] Invalid token: {e}")
+        return None
+    return await db.get(models.User, user_id)
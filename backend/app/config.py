@@ -8,6 +8,17 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Database
+    DB_POOL_SIZE: int = 5  # Connections each engine (sync and async) keeps open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed again when returned
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds a request waits for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Connections older than this (seconds) are replaced; keep below the server's idle timeout (-1 = never)
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout so ones the server dropped are replaced, not failed (not SQLite)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL statement_timeout (0 = none)
+    SQLITE_PERFORMANCE_MODE: bool = True  # WAL journal (readers no longer wait on the writer) and synchronous=NORMAL
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Bytes of the SQLite file read through mmap (0 = off)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # How long a SQLite connection waits for a lock before 'database is locked'
+    
     # AI API Keys
     GROQ_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
@@ -29,6 +40,49 @@ class Settings(BaseSettings):
     # Environment
     ENVIRONMENT: str = "development"
     
+    # Rendering
+    TEMPLATE_CACHE_DIR: str = ""  # Jinja2 bytecode cache; defaults to a folder in the system temp dir
+    STYLESHEET_CACHE_SIZE: int = 256  # Distinct (template, customization) stylesheets kept in memory
+    SECTION_CACHE_SIZE: int = 4096  # Rendered section HTML fragments kept in memory, keyed by content hash
+    PDF_SHARED_CSS: bool = True  # Let xhtml2pdf reuse parsed stylesheets across documents
+    PDF_ENGINE: str = "auto"  # 'native' (ReportLab), 'html' (WeasyPrint/xhtml2pdf) or 'auto' (native unless custom CSS is set)
+    PDF_OPTIMIZE: bool = True  # Binary (not ASCII85) streams plus a compress/dedupe pass on finished PDFs
+    PDF_FIT_ONE_PAGE: bool = True  # Shrink fonts/spacing only as far as needed to fit one page
+    FIT_CACHE_SIZE: int = 1024  # Cached fit results, keyed by content hash
+    RENDERER_WARMUP: bool = True  # Pre-load and exercise the PDF/DOCX renderers in the background at startup
+    THUMBNAIL_CACHE_DIR: str = ""  # Rendered thumbnails; defaults to a folder in the system temp dir
+    THUMBNAIL_WIDTH: int = 320  # Default thumbnail width in pixels
+    THUMBNAIL_CACHE_MAX_FILES: int = 2000  # Least recently used thumbnails are pruned from disk beyond this
+    ARTIFACT_DIR: str = ""  # Rendered exports keyed by content hash; defaults to a folder in the system temp dir
+    ARTIFACT_STORE_MAX_FILES: int = 500  # Least recently used stored exports are pruned beyond this
+    PRERENDER_ENABLED: bool = True  # Render exports in the background after each save
+    PRERENDER_FORMATS: str = "pdf"  # Comma-separated formats to pre-render ('pdf', 'docx')
+    PRERENDER_DEBOUNCE_SECONDS: float = 2.0  # Wait for autosaves to settle before rendering
+    EXPORT_WORKERS: int = 2  # Worker processes for multi-format exports (0 renders in the request thread)
+    EXPORT_TIMEOUT_SECONDS: float = 60.0  # Upper bound on one format's render in the worker pool
+    LIVE_PREVIEW_THROTTLE_MS: int = 150  # Minimum gap between live-preview renders while the user types
+    LIVE_PREVIEW_ATS_INTERVAL_SECONDS: float = 1.0  # Minimum gap between live ATS score updates
+    
+    # Uploads
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024  # Larger resume uploads are rejected with 413 while streaming
+    UPLOAD_SPOOL_BYTES: int = 1024 * 1024  # Uploaded files above this size are spooled to a temp file on disk
+    PDF_PARSE_MODE: str = "adaptive"  # 'adaptive' (fast PyPDF2 pass, pdfplumber where it falls short) or 'layout' (pdfplumber first)
+    PARSE_WORKERS: int = 0  # Worker processes for PDF text extraction (0 = one per CPU, 1 = in-process only)
+    PARSE_PARALLEL_MIN_PAGES: int = 3  # PDFs with fewer pages are extracted in-process
+    PARSE_TIMEOUT_SECONDS: float = 60.0  # Wall-clock limit on one parse job; the worker is killed when it runs over
+    PARSE_SANDBOX: bool = True  # Parse uploads in the sandboxed worker pool (False: in the API process)
+    PARSE_CPU_SECONDS: int = 20  # CPU time one parse job may use
+    PARSE_MEMORY_MB: int = 512  # Memory one parse job may allocate on top of its worker's baseline
+    PARSE_MAX_JOBS_PER_WORKER: int = 100  # Parse workers are replaced after this many jobs
+    PARSE_CACHE_DIR: str = ""  # Parsed uploads keyed by file hash; defaults to a folder in the system temp dir
+    PARSE_CACHE_SIZE: int = 256  # Parsed uploads kept in memory
+    PARSE_CACHE_MAX_FILES: int = 2000  # Least recently used parsed uploads are pruned from disk beyond this
+    BULK_IMPORT_MAX_BYTES: int = 200 * 1024 * 1024  # Larger ZIP imports are rejected with 413 while streaming
+    BULK_IMPORT_MAX_FILES: int = 500  # Resume files per imported archive
+    BULK_IMPORT_MAX_TOTAL_BYTES: int = 500 * 1024 * 1024  # Uncompressed size of all resume files in an archive
+    BULK_IMPORT_MAX_RATIO: int = 100  # Members compressed more than this are skipped as likely zip bombs
+    BULK_IMPORT_BATCH_SIZE: int = 50  # Imported resumes saved per database transaction
+    
     class Config:
         env_file = ".env"
 
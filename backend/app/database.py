@@ -1,18 +1,77 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
 # Handle different database URLs
 connect_args = {}
-if "sqlite" in settings.DATABASE_URL:
+async_connect_args = {}
+async_engine_args = {}
+is_sqlite = "sqlite" in settings.DATABASE_URL
+in_memory = is_sqlite and (":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.rstrip("/") == "sqlite:")
+if is_sqlite:
     connect_args = {"check_same_thread": False}
+    if not in_memory:
+        # aiosqlite defaults to NullPool: a new connection (and its thread) per session
+        async_engine_args = {"poolclass": AsyncAdaptedQueuePool}
 elif settings.DATABASE_URL.startswith("postgres"):
     # For PostgreSQL (Supabase/Render)
     connect_args = {"sslmode": "require"}
+    async_connect_args = {"ssl": "require"}  # asyncpg's spelling of sslmode
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        async_connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+# An in-memory SQLite database lives in a single connection and keeps SQLAlchemy's pool for it
+pool_args = {} if in_memory else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING and not is_sqlite,  # No server to drop SQLite connections
+}
+
+
+def async_database_url(url: str) -> str:
+    """The DATABASE_URL with its async driver (aiosqlite / asyncpg)"""
+    scheme, sep, rest = url.partition("://")
+    driver = scheme.split("+")[0]
+    if driver == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if driver in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite settings, applied as each pooled connection is opened"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    if settings.SQLITE_PERFORMANCE_MODE:
+        # WAL lets readers run while a write commits; with WAL, synchronous=NORMAL can lose
+        # the last commits on power loss but never corrupts the database
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+# Sync engine: table creation and bulk import batches (both off the event loop)
+engine = create_engine(settings.DATABASE_URL, connect_args=connect_args, **pool_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engine: request handlers, so a query never blocks the event loop
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), connect_args=async_connect_args,
+                                   **async_engine_args, **pool_args)
+
+if is_sqlite:
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+# Objects stay readable after commit; response models serialize them once the session is done
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -23,6 +82,11 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,75 @@
+"""
+Conditional GET helpers (ETag / Last-Modified / 304 Not Modified)
+Validators are derived from the stored resume alone, so a request can be
+answered with 304 before any rendering happens.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+from fastapi import Request, Response, status
+from app.services.artifact_store import export_key
+
+# Cached copies must be revalidated, which is cheap thanks to the validators
+CACHE_CONTROL = "private, no-cache"
+
+
+def resume_etag(resume, variant: str) -> str:
+    """Strong ETag for one representation ('json', 'html', 'pdf', 'docx') of a resume"""
+    if variant == 'json':
+        payload = json.dumps(
+            [resume.id, resume.title, resume.content, resume.template, resume.personal_info,
+             resume.customization, resume.updated_at or resume.created_at],
+            sort_keys=True, default=str
+        )
+        return f'"{hashlib.sha256(payload.encode("utf-8")).hexdigest()}"'
+    # Exports share their key with the artifact store
+    return f'"{export_key(resume.content, resume.title, resume.template, resume.personal_info, resume.customization, variant)}"'
+
+
+def last_modified(resume) -> Optional[datetime]:
+    """When the resume last changed (naive database timestamps are UTC)"""
+    modified = resume.updated_at or resume.created_at
+    if modified is None:
+        return None
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    return modified.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def cache_headers(etag: str, modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if modified is not None:
+        headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+    return headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = (tag.strip() for tag in header.split(','))
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the validators"""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -1,8 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routers import auth, resumes
-from app.database import init_db  # ✅ import init_db
+from app.routers import auth, live_preview, resumes, templates
+from app.database import async_engine, init_db  # ✅ import init_db
+from app.upload_limits import UploadSizeLimitMiddleware
+from app.services.template_registry import load_templates
+from app.services.template_specs import load_specs
+from app.services.warmup import start_background_warmup
+from app.services.render_queue import queue_stats
 
 app = FastAPI(
     title="AI Resume Creator API",
@@ -14,6 +19,26 @@ app = FastAPI(
 @app.on_event("startup")
 def on_startup():
     init_db()
+    load_templates()  # Compile resume templates once, before the first render
+    load_specs()  # Validate template specs; a broken spec fails startup, not a render
+    if settings.RENDERER_WARMUP:
+        start_background_warmup()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await async_engine.dispose()  # Close pooled async connections
+
+# Bound upload bodies while they stream (added before CORS so 413s carry CORS headers)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.UPLOAD_MAX_BYTES,
+    paths=["/api/resumes/upload"],
+)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.BULK_IMPORT_MAX_BYTES,
+    paths=["/api/resumes/import"],
+)
 
 # CORS middleware
 app.add_middleware(
@@ -27,6 +52,8 @@ app.add_middleware(
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Resumes"])
+app.include_router(live_preview.router, prefix="/api/resumes", tags=["Live Preview"])
+app.include_router(templates.router, prefix="/api/templates", tags=["Templates"])
 
 @app.get("/")
 def root():
@@ -35,3 +62,8 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/render-queue")
+def render_queue_health():
+    """Depth and save-to-ready lag of the background export pre-renderer"""
+    return queue_stats()
@@ -1,27 +1,29 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 import app.models as models
 import app.schemas as schemas
-from app.database import get_db
+from app.database import get_async_db
 from app.auth import get_password_hash, verify_password, create_access_token, get_current_user
 from app.config import settings
 
 router = APIRouter()
 
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: schemas.UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: schemas.UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if email already exists
-    existing_user = db.query(models.User).filter(models.User.email == user_data.email).first()
+    existing_user = await db.scalar(select(models.User).where(models.User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (bcrypt is slow on purpose; hash off the event loop)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     new_user = models.User(
         name=user_data.name,
         email=user_data.email,
@@ -29,18 +31,18 @@ def register(user_data: schemas.UserRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 @router.post("/login", response_model=schemas.Token)
-def login(user_data: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login user and return JWT token"""
     # Find user by email
-    user = db.query(models.User).filter(models.User.email == user_data.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == user_data.email))
     
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await run_in_threadpool(verify_password, user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -56,7 +58,7 @@ def login(user_data: schemas.UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=schemas.UserResponse)
-def get_current_user_info(current_user: models.User = Depends(get_current_user)):
+async def get_current_user_info(current_user: models.User = Depends(get_current_user)):
     """Get current user information"""
     return current_user
 
@@ -0,0 +1,146 @@
+import asyncio
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+import app.models as models
+from app.auth import get_user_from_token
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.ats_service import check_ats_compatibility
+from app.services.live_preview import LivePreviewSession
+from app.services.render_queue import enqueue_render
+
+router = APIRouter()
+
+
+async def _open_session(resume_id: int, token: str):
+    """Authenticate the socket and load the resume into a live session (None if not allowed)"""
+    async with AsyncSessionLocal() as db:
+        user = await get_user_from_token(token, db)
+        if not user:
+            return None
+        resume = await db.scalar(select(models.Resume).where(
+            models.Resume.id == resume_id,
+            models.Resume.user_id == user.id
+        ))
+        if not resume:
+            return None
+        return user.id, LivePreviewSession(resume.content or '', resume.template, resume.personal_info,
+                                           resume.customization)
+
+
+async def _save(resume_id: int, user_id: int, session: LivePreviewSession) -> int:
+    """Persist the session's current version; returns the version saved"""
+    version, content, template, personal_info, customization = session.snapshot()
+    async with AsyncSessionLocal() as db:
+        resume = await db.scalar(select(models.Resume).where(
+            models.Resume.id == resume_id,
+            models.Resume.user_id == user_id
+        ))
+        if not resume:
+            raise ValueError("Resume not found")
+        resume.content = content
+        resume.template = template
+        resume.personal_info = personal_info
+        resume.customization = customization
+        await db.commit()
+        await db.refresh(resume)
+        enqueue_render(resume)
+        return version
+
+
+@router.websocket("/{resume_id}/live")
+async def live_preview(websocket: WebSocket, resume_id: int, token: str = Query(...)):
+    """
+    Live preview channel for the editor
+    Client -> server: {"type": "delta", "ops": [...], "seq"}, {"type": "save"}
+    Server -> client: "full" / "patch" HTML messages, "ats" scores, "ack", "saved", "error"
+    """
+    opened = await _open_session(resume_id, token)
+    if opened is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    user_id, session = opened
+    await websocket.accept()
+    print(f"[LIVE] Resume {resume_id} connected")
+
+    dirty = asyncio.Event()
+    send_lock = asyncio.Lock()
+
+    async def send(message):
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def render(full: bool = False):
+        # A failed render is reported; the next delta (or a resync) renders again
+        try:
+            message = await run_in_threadpool(session.render, full)
+        except Exception as e:
+            print(f"[LIVE][ERROR] Render failed for resume {resume_id}: {e}")
+            await send({'type': 'error', 'detail': 'Failed to render the preview'})
+            return
+        if message:
+            await send(message)
+
+    async def renderer():
+        # At most one render per throttle window: a burst of deltas is rendered once
+        while True:
+            await dirty.wait()
+            dirty.clear()
+            await render()
+            await asyncio.sleep(settings.LIVE_PREVIEW_THROTTLE_MS / 1000)
+
+    async def ats_scorer():
+        scored_version = None
+        while True:
+            version, content = session.snapshot()[:2]
+            if version != scored_version:
+                scored_version = version
+                try:
+                    result = await run_in_threadpool(check_ats_compatibility, content)
+                except Exception as e:
+                    print(f"[LIVE][ERROR] ATS check failed for resume {resume_id}: {e}")
+                    await send({'type': 'error', 'detail': 'Failed to score the resume'})
+                else:
+                    await send({'type': 'ats', 'version': version, **result})
+            await asyncio.sleep(settings.LIVE_PREVIEW_ATS_INTERVAL_SECONDS)
+
+    await render(True)
+    tasks = [asyncio.create_task(renderer()), asyncio.create_task(ats_scorer())]
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except ValueError:
+                await send({'type': 'error', 'detail': 'Messages must be JSON'})
+                continue
+            kind = message.get('type') if isinstance(message, dict) else None
+            if kind == 'delta':
+                ops = message.get('ops')
+                try:
+                    if not isinstance(ops, list):
+                        raise ValueError("'ops' must be a list")
+                    version = session.apply(ops)
+                except ValueError as e:
+                    # The client's model has drifted; it should resync with a 'replace' op
+                    await send({'type': 'error', 'seq': message.get('seq'), 'detail': str(e)})
+                    continue
+                await send({'type': 'ack', 'seq': message.get('seq'), 'version': version})
+                dirty.set()
+            elif kind == 'save':
+                try:
+                    version = await _save(resume_id, user_id, session)
+                except Exception as e:
+                    print(f"[LIVE][ERROR] Save failed for resume {resume_id}: {e}")
+                    await send({'type': 'error', 'detail': 'Failed to save resume'})
+                else:
+                    await send({'type': 'saved', 'version': version})
+            elif kind == 'resync':
+                await render(True)
+            else:
+                await send({'type': 'error', 'detail': f"Unknown message type {kind!r}"})
+    except WebSocketDisconnect:
+        print(f"[LIVE] Resume {resume_id} disconnected")
+    finally:
+        for task in tasks:
+            task.cancel()
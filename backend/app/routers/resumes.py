@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response, UploadFile, File
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
+from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import List
 import app.models as models
 import app.schemas as schemas
-from app.database import get_db
+from app.database import SessionLocal, get_async_db
 from app.auth import get_current_user
-from app.services.ai_service import generate_resume_with_ai, generate_section_with_ai, improve_resume_for_ats
-from app.services.export_service import generate_pdf, generate_docx
+from app.config import settings
+from app.http_cache import cache_headers, is_not_modified, last_modified, not_modified_response, resume_etag
 from app.services.ats_service import check_ats_compatibility
-from app.services.resume_parser import parse_resume_file
+from app.services.render_queue import enqueue_render
 import tempfile
 import os
+import hashlib
+import io
+import json
+import zipfile
+from urllib.parse import quote
+
+# The AI, export and parser services pull in the OpenAI/Groq SDKs, reportlab,
+# xhtml2pdf, python-docx and pdfplumber. They are imported inside the routes
+# that need them so the app starts serving (and answering /health) quickly.
 
 router = APIRouter()
 
@@ -20,7 +31,13 @@ async def generate_resume(
     request: schemas.ResumeGenerate,
     current_user: models.User = Depends(get_current_user)
 ):
-    """Generate a resume using AI"""
+    """Generate a resume using AI (or, with use_ai=false, format the data without it)"""
+    if not request.use_ai:
+        from app.services.resume_structure import resume_markdown
+        return resume_markdown(request.resume_data)
+    
+    from app.services.ai_service import generate_resume_with_ai
+    
     try:
         resume_content = await generate_resume_with_ai(
             request.resume_data, 
@@ -39,6 +56,8 @@ async def generate_section(
     current_user: models.User = Depends(get_current_user)
 ):
     """Generate a specific resume section using AI"""
+    from app.services.ai_service import generate_section_with_ai
+    
     try:
         section_content = await generate_section_with_ai(
             section_type=request.section_type,
@@ -58,23 +77,33 @@ async def upload_resume(
     file: UploadFile = File(...),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Upload and parse a resume file (PDF or DOCX)"""
-    # Check file type
-    filename = file.filename or ""
-    file_extension = os.path.splitext(filename)[1]
+    """
+    Upload and parse a resume file (PDF or DOCX)
+    The body size is bounded while it streams (UploadSizeLimitMiddleware), the
+    file is parsed in a sandboxed worker (422 when it hits a CPU, memory or time
+    limit), and results are cached by file hash
+    """
+    from app.services.parse_cache import get_or_parse
+    from app.services.parse_pool import ParseLimitError
+    from app.services.resume_parser import detect_file_type
+    from app.services.resume_structure import extract_resume_data
     
-    if file_extension.lower() not in ['.pdf', '.docx']:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported file format. Please upload a PDF or DOCX file."
-        )
+    filename = file.filename or ""
     
     try:
-        # Read file content
-        file_content = await file.read()
+        # Trust the content, not the extension
+        file_type = await run_in_threadpool(detect_file_type, file.file)
+        if file_type == 'doc':
+            raise ValueError("DOC format is not supported. Please convert to DOCX or PDF first.")
+        if file_type not in ('pdf', 'docx'):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported file format. Please upload a PDF or DOCX file."
+            )
         
-        # Parse the file
-        markdown_content = parse_resume_file(file_content, file_extension)
+        # Parse the file (identical re-uploads come from the parse cache)
+        parsed = await run_in_threadpool(get_or_parse, file.file, file_type)
+        markdown_content = parsed.markdown
         
         if not markdown_content or len(markdown_content.strip()) < 10:
             raise HTTPException(
@@ -82,12 +111,28 @@ async def upload_resume(
                 detail="Could not extract meaningful content from the file. Please ensure the file is a valid resume."
             )
         
+        extraction = await run_in_threadpool(extract_resume_data, markdown_content)
+        
         return schemas.ResumeUploadResponse(
             content=markdown_content,
             filename=filename,
-            message="Resume uploaded and parsed successfully"
+            message="Resume uploaded and parsed successfully",
+            metadata=schemas.ParseMetadata(**parsed.metadata),
+            extracted=schemas.ResumeExtraction(
+                resume_data=extraction.resume_data,
+                confidence=extraction.confidence,
+                overall_confidence=extraction.overall
+            )
         )
     
+    except HTTPException:
+        raise
+    except ParseLimitError as e:
+        # Parsed in a sandboxed worker that stopped it; the file is malformed or hostile
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.detail
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -98,12 +143,141 @@ async def upload_resume(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse resume file: {str(e)}"
         )
+    finally:
+        await file.close()
+
+@router.post("/extract", response_model=schemas.ResumeExtraction)
+def extract_resume(
+    request: schemas.ResumeExtractRequest,
+    current_user: models.User = Depends(get_current_user)
+):
+    """Extract structured resume data from resume markdown (rule-based, no LLM)"""
+    from app.services.resume_structure import extract_resume_data
+    
+    extraction = extract_resume_data(request.content)
+    return schemas.ResumeExtraction(
+        resume_data=extraction.resume_data,
+        confidence=extraction.confidence,
+        overall_confidence=extraction.overall
+    )
+
+def _import_lines(directory: str, members, skipped, user_id: int, save: bool):
+    """NDJSON progress for a bulk import; saves parsed resumes in batches when asked"""
+    from app.services.bulk_import import parse_members, remove_directory
+
+    def line(event):
+        return json.dumps(event) + "\n"
+
+    counts = {'parsed': 0, 'failed': 0, 'saved': 0}
+    batch = []
+
+    def flush():
+        # One transaction per batch; the ids go back in a 'saved' event
+        db = SessionLocal()
+        try:
+            rows = [models.Resume(user_id=user_id, title=title, content=content) for _, title, content in batch]
+            db.add_all(rows)
+            db.commit()
+            for row in rows:
+                db.refresh(row)
+                enqueue_render(row)
+            counts['saved'] += len(rows)
+            return line({'type': 'saved', 'resumes': [
+                {'index': index, 'resume_id': row.id} for (index, _, _), row in zip(batch, rows)
+            ]})
+        except Exception as e:
+            db.rollback()
+            print(f"[IMPORT][ERROR] Saving {len(batch)} resumes failed: {e}")
+            return line({'type': 'error', 'detail': 'Failed to save a batch of resumes',
+                         'indexes': [index for index, _, _ in batch]})
+        finally:
+            db.close()
+            batch.clear()
+
+    try:
+        yield line({'type': 'start', 'files': len(members), 'skipped': skipped})
+        for member, result in parse_members(members):
+            event = {'type': 'file', 'index': member.index, 'name': member.name, 'status': result['status']}
+            if result['status'] == 'ok' and len(result['markdown'].strip()) < 10:
+                result = {'status': 'error', 'error': 'Could not extract meaningful content from the file'}
+            if result['status'] == 'ok':
+                counts['parsed'] += 1
+                event.update(parser=result['metadata'].get('parser'), chars=len(result['markdown']))
+                if save:
+                    title = os.path.splitext(os.path.basename(member.name))[0][:200]
+                    batch.append((member.index, title, result['markdown']))
+            else:
+                counts['failed'] += 1
+                event.update(status='error', error=result['error'])
+            yield line(event)
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                yield flush()
+        if batch:
+            yield flush()
+        yield line({'type': 'done', 'files': len(members), 'skipped': len(skipped), **counts})
+        print(f"[IMPORT] User {user_id}: {counts['parsed']} parsed, {counts['failed']} failed, "
+              f"{counts['saved']} saved, {len(skipped)} skipped")
+    finally:
+        remove_directory(directory)
+
+@router.post("/import")
+async def import_resumes(
+    file: UploadFile = File(...),
+    save: bool = Query(False, description="Save each parsed resume to the account"),
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    Bulk import resumes (PDF or DOCX) from a ZIP archive
+    The archive is checked and extracted before the response starts; parsing
+    progress then streams back as NDJSON: a 'start' event, one 'file' event
+    per resume as it finishes, 'saved' events with the new resume IDs per
+    saved batch (save=true), and a final 'done' summary.
+    """
+    from app.services.bulk_import import ImportLimitError, extract_archive, remove_directory
+    
+    directory = tempfile.mkdtemp(prefix='resume-import-')
+    try:
+        members, skipped = await run_in_threadpool(extract_archive, file.file, directory)
+    except ImportLimitError as e:
+        remove_directory(directory)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception:
+        remove_directory(directory)
+        raise
+    finally:
+        await file.close()
+    
+    return StreamingResponse(
+        _import_lines(directory, members, skipped, current_user.id, save),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/preview", response_class=HTMLResponse)
+def preview_resume(
+    request: schemas.ResumePreviewRequest,
+    current_user: models.User = Depends(get_current_user)
+):
+    """Render unsaved resume content to the server-side template HTML"""
+    from app.services.template_html_generator import generate_template_html
+    
+    customization = request.customization.dict() if request.customization else None
+    html = generate_template_html(
+        request.content,
+        request.template,
+        request.personal_info,
+        customization,
+        one_page=request.one_page
+    )
+    return HTMLResponse(content=html)
 
 @router.post("/", response_model=schemas.ResumeResponse, status_code=status.HTTP_201_CREATED)
-def create_resume(
+async def create_resume(
     resume_data: schemas.ResumeCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Save a resume to database"""
     # Convert None or empty dict to None for JSON fields
@@ -121,34 +295,39 @@ def create_resume(
     )
     
     db.add(new_resume)
-    db.commit()
-    db.refresh(new_resume)
+    await db.commit()
+    await db.refresh(new_resume)
+    
+    # Render the export now so the first download is served from the artifact store
+    enqueue_render(new_resume)
     
     return new_resume
 
 @router.get("/", response_model=List[schemas.ResumeResponse])
-def get_resumes(
+async def get_resumes(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all resumes for current user"""
-    resumes = db.query(models.Resume).filter(
+    resumes = await db.scalars(select(models.Resume).where(
         models.Resume.user_id == current_user.id
-    ).order_by(models.Resume.created_at.desc()).all()
+    ).order_by(models.Resume.created_at.desc()))
     
-    return resumes
+    return resumes.all()
 
 @router.get("/{resume_id}", response_model=schemas.ResumeResponse)
-def get_resume(
+async def get_resume(
     resume_id: int,
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific resume"""
-    resume = db.query(models.Resume).filter(
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -156,20 +335,25 @@ def get_resume(
             detail="Resume not found"
         )
     
+    headers = cache_headers(resume_etag(resume, 'json'), last_modified(resume))
+    if is_not_modified(request, headers['ETag'], last_modified(resume)):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    
     return resume
 
 @router.put("/{resume_id}", response_model=schemas.ResumeResponse)
-def update_resume(
+async def update_resume(
     resume_id: int,
     resume_data: schemas.ResumeUpdate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a resume"""
-    resume = db.query(models.Resume).filter(
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -188,22 +372,25 @@ def update_resume(
     if resume_data.customization is not None:
         resume.customization = resume_data.customization.dict()
     
-    db.commit()
-    db.refresh(resume)
+    await db.commit()
+    await db.refresh(resume)
+    
+    # Debounced: rapid autosaves only render the latest version
+    enqueue_render(resume)
     
     return resume
 
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_resume(
+async def delete_resume(
     resume_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a resume"""
-    resume = db.query(models.Resume).filter(
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -211,22 +398,32 @@ def delete_resume(
             detail="Resume not found"
         )
     
-    db.delete(resume)
-    db.commit()
+    await db.delete(resume)
+    await db.commit()
     
     return None
 
+def _attachment(filename: str) -> str:
+    """Content-Disposition for a download, percent-encoding names that are not plain ASCII"""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
 @router.get("/{resume_id}/download/pdf")
-def download_pdf(
+async def download_pdf(
     resume_id: int,
+    request: Request,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download resume as PDF"""
-    resume = db.query(models.Resume).filter(
+    from app.services.artifact_store import read_or_render
+    
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -234,32 +431,39 @@ def download_pdf(
             detail="Resume not found"
         )
     
-    # Generate PDF with template styling
-    pdf_file = generate_pdf(
-        resume.content, 
+    # Answer unchanged downloads before touching the renderer
+    headers = cache_headers(resume_etag(resume, 'pdf'), last_modified(resume))
+    if is_not_modified(request, headers['ETag'], last_modified(resume)):
+        return not_modified_response(headers)
+    
+    # Generate PDF with template styling (or reuse the pre-rendered file)
+    pdf_bytes = await run_in_threadpool(
+        read_or_render,
+        resume.content,
         resume.title,
         template=resume.template,
         personal_info=resume.personal_info,
-        customization=resume.customization
+        customization=resume.customization,
+        export_format='pdf'
     )
     
-    return FileResponse(
-        pdf_file,
-        media_type="application/pdf",
-        filename=f"{resume.title.replace(' ', '_')}.pdf"
-    )
+    headers["Content-Disposition"] = _attachment(f"{resume.title.replace(' ', '_')}.pdf")
+    return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
 
 @router.get("/{resume_id}/download/docx")
-def download_docx(
+async def download_docx(
     resume_id: int,
+    request: Request,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Download resume as DOCX"""
-    resume = db.query(models.Resume).filter(
+    from app.services.artifact_store import read_or_render
+    
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -267,19 +471,190 @@ def download_docx(
             detail="Resume not found"
         )
     
-    # Generate DOCX with template styling
-    docx_file = generate_docx(
-        resume.content, 
+    # Answer unchanged downloads before touching the renderer
+    headers = cache_headers(resume_etag(resume, 'docx'), last_modified(resume))
+    if is_not_modified(request, headers['ETag'], last_modified(resume)):
+        return not_modified_response(headers)
+    
+    # Generate DOCX with template styling (or reuse the pre-rendered file)
+    docx_bytes = await run_in_threadpool(
+        read_or_render,
+        resume.content,
         resume.title,
         template=resume.template,
         personal_info=resume.personal_info,
-        customization=resume.customization
+        customization=resume.customization,
+        export_format='docx'
     )
     
-    return FileResponse(
-        docx_file,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=f"{resume.title.replace(' ', '_')}.docx"
+    headers["Content-Disposition"] = _attachment(f"{resume.title.replace(' ', '_')}.docx")
+    return Response(content=docx_bytes, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", headers=headers)
+
+def _zip_exports(paths, formats, base_name: str) -> bytes:
+    """Bundle rendered exports; PDF and DOCX are already compressed, so the archive only stores them"""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as bundle:
+        for export_format in formats:
+            bundle.write(paths[export_format], arcname=f"{base_name}.{export_format}")
+    return archive.getvalue()
+
+@router.get("/{resume_id}/download")
+async def download_bundle(
+    resume_id: int,
+    request: Request,
+    formats: str = Query("pdf,docx", description="Comma-separated export formats"),
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download several formats of a resume in one ZIP, rendered concurrently"""
+    from app.services.export_pool import render_formats
+    
+    requested = list(dict.fromkeys(f.strip().lower() for f in formats.split(',') if f.strip()))
+    if not requested or any(f not in ('pdf', 'docx') for f in requested):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported format. Choose from: pdf, docx"
+        )
+    
+    resume = await db.scalar(select(models.Resume).where(
+        models.Resume.id == resume_id,
+        models.Resume.user_id == current_user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    etags = ''.join(resume_etag(resume, f) for f in requested)
+    headers = cache_headers(f'"{hashlib.sha256(etags.encode()).hexdigest()}"', last_modified(resume))
+    if is_not_modified(request, headers['ETag'], last_modified(resume)):
+        return not_modified_response(headers)
+    
+    base_name = resume.title.replace(' ', '_')
+    # A stored export pruned before it is zipped is rendered again
+    for attempt in range(2):
+        try:
+            paths = await run_in_threadpool(
+                render_formats,
+                resume.content,
+                resume.title,
+                template=resume.template,
+                personal_info=resume.personal_info,
+                customization=resume.customization,
+                formats=requested
+            )
+            archive = await run_in_threadpool(_zip_exports, paths, requested, base_name)
+            break
+        except FileNotFoundError as e:
+            if attempt:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to export resume: {str(e)}"
+                )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to export resume: {str(e)}"
+            )
+    
+    headers["Content-Disposition"] = _attachment(f"{base_name}.zip")
+    return Response(content=archive, media_type="application/zip", headers=headers)
+
+@router.get("/{resume_id}/preview", response_class=HTMLResponse)
+async def preview_saved_resume(
+    resume_id: int,
+    request: Request,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Render a saved resume to the server-side template HTML"""
+    from app.services.template_html_generator import generate_template_html
+    
+    resume = await db.scalar(select(models.Resume).where(
+        models.Resume.id == resume_id,
+        models.Resume.user_id == current_user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    headers = cache_headers(resume_etag(resume, 'html'), last_modified(resume))
+    if is_not_modified(request, headers['ETag'], last_modified(resume)):
+        return not_modified_response(headers)
+    
+    html = await run_in_threadpool(
+        generate_template_html,
+        resume.content,
+        resume.template,
+        resume.personal_info,
+        resume.customization
+    )
+    return HTMLResponse(content=html, headers=headers)
+
+@router.get("/{resume_id}/thumbnail")
+async def get_thumbnail(
+    resume_id: int,
+    request: Request,
+    width: int = Query(None, ge=80, le=1200),
+    image_format: str = Query("png", alias="format", pattern="^(png|webp)$"),
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a PNG/WebP thumbnail of the first page of a resume"""
+    from app.services.thumbnail_service import THUMBNAIL_FORMATS, cache_key, get_thumbnail as render_thumbnail
+    
+    resume = await db.scalar(select(models.Resume).where(
+        models.Resume.id == resume_id,
+        models.Resume.user_id == current_user.id
+    ))
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    # Clients version the URL (?v=<updated_at>), so the image never changes under it
+    key = cache_key(resume.content, resume.title, resume.template, resume.personal_info,
+                    resume.customization, width, image_format)
+    headers = {
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": f'"{key}"'
+    }
+    if is_not_modified(request, headers['ETag'], None):
+        return not_modified_response(headers)
+    
+    try:
+        image, _ = await run_in_threadpool(
+            render_thumbnail,
+            resume.content,
+            resume.title,
+            template=resume.template,
+            personal_info=resume.personal_info,
+            customization=resume.customization,
+            width=width,
+            image_format=image_format
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to render thumbnail: {str(e)}"
+        )
+    
+    return Response(
+        content=image,
+        media_type=THUMBNAIL_FORMATS[image_format],
+        headers=headers
     )
 
 @router.post("/check-ats", response_model=schemas.ATSResponse)
@@ -298,16 +673,16 @@ def check_ats(
         )
 
 @router.get("/{resume_id}/check-ats", response_model=schemas.ATSResponse)
-def check_resume_ats(
+async def check_resume_ats(
     resume_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Check ATS compatibility for a saved resume"""
-    resume = db.query(models.Resume).filter(
+    resume = await db.scalar(select(models.Resume).where(
         models.Resume.id == resume_id,
         models.Resume.user_id == current_user.id
-    ).first()
+    ))
     
     if not resume:
         raise HTTPException(
@@ -316,7 +691,7 @@ def check_resume_ats(
         )
     
     try:
-        ats_result = check_ats_compatibility(resume.content)
+        ats_result = await run_in_threadpool(check_ats_compatibility, resume.content)
         return ats_result
     except Exception as e:
         raise HTTPException(
@@ -330,6 +705,8 @@ async def improve_resume(
     current_user: models.User = Depends(get_current_user)
 ):
     """Improve resume content based on ATS analysis"""
+    from app.services.ai_service import improve_resume_for_ats
+    
     try:
         # First check ATS compatibility
         ats_result = check_ats_compatibility(request.content)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Request, Response
+from typing import List
+import app.schemas as schemas
+from app.http_cache import is_not_modified, not_modified_response
+from app.services.template_specs import catalog
+
+router = APIRouter()
+
+# The catalog only changes with a deploy, so it is public and cacheable
+CATALOG_CACHE_CONTROL = "public, max-age=3600"
+
+
+@router.get("/", response_model=List[schemas.TemplateInfo])
+def list_templates(request: Request, response: Response):
+    """List the available resume templates (compiled from the template specs at startup)"""
+    entries, etag = catalog()
+    headers = {"ETag": etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    if is_not_modified(request, etag, None):
+        return not_modified_response(headers)
+    response.headers.update(headers)
+    return entries
@@ -35,6 +35,16 @@ class ResumeData(BaseModel):
 class ResumeGenerate(BaseModel):
     resume_data: ResumeData
     use_openai: bool = False
+    use_ai: bool = True  # False: format resume_data as is, without an LLM round trip
+
+class ResumeExtraction(BaseModel):
+    """Structured data extracted from resume markdown by rules, without an LLM"""
+    resume_data: ResumeData
+    confidence: dict  # Per field, 0-1 (experience and education hold one score per entry)
+    overall_confidence: float
+
+class ResumeExtractRequest(BaseModel):
+    content: str
 
 class ResumeCustomization(BaseModel):
     """Schema for resume customization options"""
@@ -60,6 +70,13 @@ class ResumeUpdate(BaseModel):
     personal_info: Optional[dict] = None
     customization: Optional[ResumeCustomization] = None
 
+class ResumePreviewRequest(BaseModel):
+    content: str
+    template: Optional[dict] = None
+    personal_info: Optional[dict] = None
+    customization: Optional[ResumeCustomization] = None
+    one_page: bool = True
+
 class ResumeResponse(BaseModel):
     id: int
     user_id: int
@@ -117,14 +134,41 @@ class ATSResponse(BaseModel):
     found_keywords_count: int
     has_numbers: bool
 
+class ParseMetadata(BaseModel):
+    """How an upload was parsed"""
+    file_type: str
+    parser: Optional[str] = None  # 'pypdf2', 'pdfplumber', 'pypdf2+pdfplumber' or 'ooxml'
+    pages: Optional[int] = None
+    layout_pages: List[int] = []  # 1-based pages re-extracted with the layout extractor
+    reasons: dict = {}  # Page -> why the fast pass was rejected
+    timings_ms: dict = {}
+    cached: bool = False
+
 class ResumeUploadResponse(BaseModel):
     """Schema for resume upload response"""
     content: str
     filename: str
     message: str
+    metadata: Optional[ParseMetadata] = None
+    extracted: Optional[ResumeExtraction] = None  # Pre-fills the builder
 
 class ResumeImproveRequest(BaseModel):
     """Schema for resume improvement request"""
     content: str
     use_openai: bool = False
 
+
+class TemplatePalette(BaseModel):
+    """Schema for a template's default colors"""
+    header: str
+    accent: str
+
+class TemplateInfo(BaseModel):
+    """Schema for a template catalog entry"""
+    id: str
+    name: str
+    description: str
+    category: str
+    palette: TemplatePalette
+    layout: str  # Native PDF layout family
+    native_pdf: bool  # Rendered natively (not via HTML) under PDF_ENGINE=auto
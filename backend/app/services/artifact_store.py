@@ -0,0 +1,153 @@
+"""
+On-disk store of rendered exports
+Rendered PDF/DOCX files are kept under the hash of everything that affects
+them (the same hash is used as the download ETag), so a resume is rendered
+once per version, whether by a download or by the background pre-renderer.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+
+EXPORT_FORMATS = ('pdf', 'docx')
+
+# Bump when the export output changes for unchanged resumes, so stored files
+# (and ETags handed out for them) are not reused
+EXPORT_VERSION = 2
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_puts_since_prune = 0
+
+
+def export_key(content: str, title: str, template: Optional[Dict], personal_info: Optional[Dict],
+               customization: Optional[Dict], export_format: str) -> str:
+    """Hash of everything that affects an exported file"""
+    payload = json.dumps(
+        [export_format, EXPORT_VERSION, settings.PDF_ENGINE, settings.PDF_FIT_ONE_PAGE, settings.PDF_OPTIMIZE,
+         content, title, template, personal_info, customization],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _store_dir() -> str:
+    directory = settings.ARTIFACT_DIR or os.path.join(tempfile.gettempdir(), 'ai-resume-artifacts')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _path(key: str, export_format: str) -> str:
+    return os.path.join(_store_dir(), f"{key}.{export_format}")
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def get(key: str, export_format: str) -> Optional[str]:
+    """Path of a stored export, or None"""
+    path = _path(key, export_format)
+    try:
+        os.utime(path)  # Pruning drops the least recently used files
+    except OSError:
+        return None
+    return path
+
+
+def put(key: str, export_format: str, source_path: str) -> str:
+    """Move a freshly rendered file into the store and return its new path"""
+    global _puts_since_prune
+    path = _path(key, export_format)
+    shutil.move(source_path, path)
+
+    _puts_since_prune += 1
+    if _puts_since_prune >= 50:
+        _puts_since_prune = 0
+        prune()
+    return path
+
+
+def prune(max_files: Optional[int] = None) -> int:
+    """Delete the least recently used files beyond ARTIFACT_STORE_MAX_FILES"""
+    max_files = settings.ARTIFACT_STORE_MAX_FILES if max_files is None else max_files
+    directory = _store_dir()
+    entries = []
+    for name in os.listdir(directory):
+        try:
+            entries.append((os.path.getmtime(os.path.join(directory, name)), name))
+        except OSError:
+            continue
+    removed = 0
+    for _, name in sorted(entries)[:max(len(entries) - max_files, 0)]:
+        try:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _render(content, title, template, personal_info, customization, export_format, parsed=None) -> str:
+    from app.services.export_service import generate_docx, generate_pdf
+
+    contact_info, sections = parsed or (None, None)
+    if export_format == 'pdf':
+        rendered = generate_pdf(content, title, template=template, personal_info=personal_info,
+                                customization=customization, contact_info=contact_info, sections=sections)
+    else:
+        rendered = generate_docx(content, title, template=template, personal_info=personal_info,
+                                 customization=customization, contact_info=contact_info)
+    debug_html = rendered.replace('.pdf', '_debug.html')
+    if export_format == 'pdf' and os.path.exists(debug_html):
+        os.remove(debug_html)
+    return rendered
+
+
+def get_or_render(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                  customization: Optional[Dict] = None, export_format: str = 'pdf',
+                  parsed: Optional[Tuple[Dict, List]] = None) -> str:
+    """
+    Return the path of the stored export, rendering it first if needed.
+    Concurrent callers for the same version wait for a single render.
+    `parsed` is the (contact_info, sections) pair when the caller already parsed the resume.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    key = export_key(content, title, template, personal_info, customization, export_format)
+
+    path = get(key, export_format)
+    if path:
+        return path
+    try:
+        with _lock_for(key):
+            path = get(key, export_format)
+            if path is None:
+                path = put(key, export_format,
+                           _render(content, title, template, personal_info, customization, export_format, parsed))
+    finally:
+        with _locks_guard:
+            _locks.pop(key, None)
+    return path
+
+
+def read_or_render(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                   customization: Optional[Dict] = None, export_format: str = 'pdf') -> bytes:
+    """
+    Return the bytes of the stored export, rendering it first if needed.
+    A file pruned between lookup and read is rendered again.
+    """
+    for attempt in range(2):
+        path = get_or_render(content, title, template=template, personal_info=personal_info,
+                             customization=customization, export_format=export_format)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            if attempt:
+                raise
@@ -0,0 +1,141 @@
+"""
+Bulk import of resumes from a ZIP archive
+The archive is checked against zip-bomb limits (member count, declared and
+actual uncompressed sizes, compression ratio) before anything is extracted.
+Members are copied out under generated names, so archive paths never touch
+the filesystem, and parsed in the parse worker pool. Results are yielded in
+completion order for the caller to stream back.
+"""
+import os
+import shutil
+import zipfile
+from concurrent.futures import Future, as_completed
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Tuple
+from app.config import settings
+from app.services import parse_pool
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+COPY_CHUNK = 64 * 1024
+
+
+class ImportMember(NamedTuple):
+    index: int  # Position among the archive's resume files
+    name: str  # Path inside the archive, as reported back to the client
+    path: str  # Extracted copy
+
+
+class ImportLimitError(ValueError):
+    """The archive as a whole breaks an import limit"""
+
+
+def _skip_reason(info: zipfile.ZipInfo) -> str:
+    """Why a member is not imported, or '' to import it"""
+    base = os.path.basename(info.filename.rstrip('/'))
+    if info.is_dir() or info.filename.startswith('__MACOSX/') or base.startswith('.'):
+        return 'not a file'
+    if not base.lower().endswith(RESUME_EXTENSIONS):
+        return 'not a PDF or DOCX file'
+    if info.flag_bits & 0x1:
+        return 'encrypted'
+    if info.file_size > settings.UPLOAD_MAX_BYTES:
+        return 'too large'
+    if info.compress_size and info.file_size / info.compress_size > settings.BULK_IMPORT_MAX_RATIO:
+        return 'suspicious compression ratio'
+    return ''
+
+
+def _copy_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, path: str):
+    """Extract one member, refusing to write more than it declared (sizes in the header can lie)"""
+    limit = min(info.file_size, settings.UPLOAD_MAX_BYTES)
+    written = 0
+    with archive.open(info) as source, open(path, 'wb') as target:
+        for chunk in iter(lambda: source.read(COPY_CHUNK), b''):
+            written += len(chunk)
+            if written > limit:
+                raise ValueError('uncompressed size exceeds the declared size')
+            target.write(chunk)
+
+
+def extract_archive(stream: BinaryIO, directory: str) -> Tuple[List[ImportMember], List[Dict]]:
+    """
+    Extract an archive's resume files into directory
+    Returns the extracted members and the skipped ones ({'name', 'reason'});
+    raises ImportLimitError when the archive itself is over a limit.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ImportLimitError('The file is not a valid ZIP archive')
+
+    with archive:
+        candidates = []
+        skipped = []
+        for info in archive.infolist():
+            reason = _skip_reason(info)
+            if reason == 'not a file':
+                continue
+            if reason:
+                skipped.append({'name': info.filename, 'reason': reason})
+            else:
+                candidates.append(info)
+
+        if len(candidates) > settings.BULK_IMPORT_MAX_FILES:
+            raise ImportLimitError(f"The archive holds {len(candidates)} resumes; "
+                                   f"the limit is {settings.BULK_IMPORT_MAX_FILES} per import")
+        if sum(info.file_size for info in candidates) > settings.BULK_IMPORT_MAX_TOTAL_BYTES:
+            raise ImportLimitError(f"The archive expands to more than "
+                                   f"{settings.BULK_IMPORT_MAX_TOTAL_BYTES // (1024 * 1024)} MB")
+
+        members = []
+        for info in candidates:
+            path = os.path.join(directory, f"{len(members)}{os.path.splitext(info.filename)[1].lower()}")
+            try:
+                _copy_member(archive, info, path)
+            except (ValueError, zipfile.BadZipFile, OSError, EOFError) as e:  # BadZipFile covers CRC errors
+                skipped.append({'name': info.filename, 'reason': f"unreadable: {e}"})
+                continue
+            members.append(ImportMember(len(members), info.filename, path))
+    return members, skipped
+
+
+def _parse_result(future) -> Dict:
+    try:
+        result = future.result()
+    except parse_pool.ParseLimitError as e:
+        return {'status': 'error', 'error': e.detail}
+    except ValueError as e:
+        return {'status': 'error', 'error': str(e)}
+    except Exception as e:
+        print(f"[IMPORT][ERROR] Parse failed: {e}")
+        return {'status': 'error', 'error': 'Failed to parse the file'}
+    return {'status': 'ok', 'markdown': result.markdown, 'metadata': result.metadata}
+
+
+def parse_members(members: List[ImportMember]) -> Iterator[Tuple[ImportMember, Dict]]:
+    """
+    Parse extracted members, yielding (member, result) as each one finishes
+    result is {'status': 'ok', 'markdown', 'metadata'} or {'status': 'error', 'error'}
+    """
+    if not settings.PARSE_SANDBOX and parse_pool.worker_count() <= 1:
+        for member in members:
+            future = Future()
+            try:
+                future.set_result(parse_pool.parse_file(member.path))
+            except Exception as e:
+                future.set_exception(e)
+            yield member, _parse_result(future)
+        return
+
+    # The sandboxed pool resolves every job, killing the ones that run over their time limit
+    executor = parse_pool.get_executor()
+    pending = {executor.submit(parse_pool.parse_file, member.path): member for member in members}
+    try:
+        for future in as_completed(list(pending)):
+            yield pending.pop(future), _parse_result(future)
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def remove_directory(directory: str):
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,335 @@
+"""
+DOCX writer for resume exports
+Every template has a pre-styled base document (app/templates/docx/<id>.docx)
+that is loaded once. An export copies the base package and only writes a new
+document body, generated straight from the markdown element tree: no
+HTML-to-text round trip, and no per-run styling through python-docx.
+"""
+import io
+import os
+import re
+import threading
+import zipfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from xml.etree.ElementTree import Element
+from xml.sax.saxutils import escape
+from markdown.treeprocessors import Treeprocessor
+from markdown.util import HTML_PLACEHOLDER_RE
+from app.services.markdown_renderer import pooled_converter
+from app.services.template_specs import get_spec, load_specs
+
+DOCX_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'docx')
+DOCX_EXTENSION = '.docx'
+DOCUMENT_PART = 'word/document.xml'
+
+# Style names the writer references; their IDs are read from the base document
+NAME_STYLE = 'Resume Name'
+CONTACT_STYLE = 'Resume Contact'
+BODY_STYLES = (
+    'Heading 1', 'Heading 2', 'Heading 3',
+    'List Bullet', 'List Bullet 2', 'List Bullet 3',
+    'List Number', 'List Number 2', 'List Number 3',
+)
+
+# Contact lines are already shown in the header
+CONTACT_LABELS = ('Email:', 'Phone:', 'Location:')
+
+# Run formatting flags
+BOLD, ITALIC, CODE = 1, 2, 4
+
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_BODY_OPEN = re.compile(r'<w:body>')
+_SECTION_PROPERTIES = re.compile(r'<w:sectPr[ >]')
+
+Run = Tuple[str, int]
+Line = List[Run]
+
+
+class BasePackage(NamedTuple):
+    """A base document split into the static package and the body insertion point"""
+    archive: bytes  # Zip of every part except the document body
+    head: str  # word/document.xml up to and including <w:body>
+    tail: str  # Section properties and closing tags
+    style_ids: Dict[str, str]
+
+
+_bases: Dict[str, BasePackage] = {}
+_lock = threading.Lock()
+
+
+# ===================== Base documents =====================
+
+def _base_template_id(template_id: Optional[str]) -> str:
+    return get_spec(template_id).docx_base
+
+
+def _base_template_ids() -> List[str]:
+    return sorted({spec.docx_base for spec in load_specs().values()})
+
+
+def build_base_document(template_id: str):
+    """Create the styled, empty base document for a template from the `docx` block of its spec"""
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt, RGBColor
+
+    spec = get_spec(template_id).docx
+    doc = Document()
+    styles = doc.styles
+
+    normal = styles['Normal']
+    normal.font.name = spec.font
+    normal.font.size = Pt(11)
+
+    name = styles.add_style(NAME_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    name.base_style = normal
+    name.font.size = Pt(spec.name.size)
+    name.font.bold = True
+    if spec.name.color:
+        name.font.color.rgb = RGBColor.from_string(spec.name.color)
+    if spec.name.center:
+        name.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    contact = styles.add_style(CONTACT_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    contact.base_style = normal
+    contact.font.size = Pt(spec.contact.size)
+    if spec.contact.center:
+        contact.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    for style_name, heading in spec.headings.items():
+        font = styles[style_name].font
+        if heading.color:
+            font.color.rgb = RGBColor.from_string(heading.color)
+        if heading.size:
+            font.size = Pt(heading.size)
+    return doc
+
+
+def save_base_documents(directory: str = DOCX_TEMPLATE_DIR) -> List[str]:
+    """Write every base document named by the specs to `directory`"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for template_id in _base_template_ids():
+        path = os.path.join(directory, template_id + DOCX_EXTENSION)
+        build_base_document(template_id).save(path)
+        paths.append(path)
+    return paths
+
+
+def _package(doc) -> BasePackage:
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    archive = io.BytesIO()
+    document_xml = ''
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as source, \
+            zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            if info.filename == DOCUMENT_PART:
+                document_xml = source.read(info).decode('utf-8')
+            else:
+                target.writestr(info.filename, source.read(info))
+
+    body = _BODY_OPEN.search(document_xml)
+    section = _SECTION_PROPERTIES.search(document_xml)
+    if body is None or section is None:
+        raise ValueError("Base document has no body with section properties")
+
+    style_ids = {}
+    for style_name in (NAME_STYLE, CONTACT_STYLE) + BODY_STYLES:
+        try:
+            style_ids[style_name] = doc.styles[style_name].style_id
+        except KeyError:
+            pass
+    return BasePackage(
+        archive=archive.getvalue(),
+        head=document_xml[:body.end()],
+        tail=document_xml[section.start():],
+        style_ids=style_ids,
+    )
+
+
+def get_base(template_id: Optional[str]) -> BasePackage:
+    """Get the base package for a template, loading it on first use"""
+    template_id = _base_template_id(template_id)
+    base = _bases.get(template_id)
+    if base is None:
+        with _lock:
+            base = _bases.get(template_id)
+            if base is None:
+                path = os.path.join(DOCX_TEMPLATE_DIR, template_id + DOCX_EXTENSION)
+                if os.path.exists(path):
+                    from docx import Document
+                    doc = Document(path)
+                else:
+                    doc = build_base_document(template_id)
+                base = _bases[template_id] = _package(doc)
+    return base
+
+
+def load_bases() -> Dict[str, BasePackage]:
+    """Load every base package named by the specs"""
+    for template_id in _base_template_ids():
+        get_base(template_id)
+    return _bases
+
+
+# ===================== Markdown tree =====================
+
+class _CaptureTree(Treeprocessor):
+    """Keep the finished element tree instead of only the serialized HTML"""
+
+    def run(self, root):
+        self.md.resume_tree = root
+
+
+def _capture_tree(md):
+    # After 'unescape' (priority 0), so the tree holds the final text
+    md.treeprocessors.register(_CaptureTree(md), 'resume_tree', -10)
+
+
+def parse_markdown(content: str) -> Element:
+    """Parse markdown into an element tree (inline markup included)"""
+    with pooled_converter(('nl2br',), _capture_tree) as md:
+        md.convert(content)
+        return md.resume_tree
+
+
+def _collect_runs(element: Element, flags: int, lines: List[Line], nested: Optional[List[Element]] = None):
+    """Append the text of `element` as runs, starting a new line at each <br>"""
+    if element.text:
+        lines[-1].append((element.text, flags))
+    for child in element:
+        if child.tag == 'br':
+            lines.append([])
+        elif nested is not None and child.tag in ('ul', 'ol'):
+            nested.append(child)
+        else:
+            child_flags = flags
+            if child.tag in ('strong', 'b'):
+                child_flags |= BOLD
+            elif child.tag in ('em', 'i'):
+                child_flags |= ITALIC
+            elif child.tag == 'code':
+                child_flags |= CODE
+            if child.tag == 'p' and lines[-1]:
+                lines.append([])  # Paragraphs of a loose list item
+            _collect_runs(child, child_flags, lines, nested)
+        # nl2br keeps the source newline after each <br>
+        tail = child.tail.lstrip('\n') if child.tag == 'br' and child.tail else child.tail
+        if tail:
+            lines[-1].append((tail, flags))
+
+
+def _clean(lines: List[Line]) -> List[Line]:
+    """Drop raw-HTML placeholders and the whitespace around each line"""
+    cleaned = []
+    for line in lines:
+        line = [(HTML_PLACEHOLDER_RE.sub('', text).replace('\n', ' '), flags) for text, flags in line]
+        if line:
+            line[0] = (line[0][0].lstrip(), line[0][1])
+            line[-1] = (line[-1][0].rstrip(), line[-1][1])
+        line = [run for run in line if run[0]]
+        if line:
+            cleaned.append(line)
+    return cleaned
+
+
+def _is_contact_line(line: Line) -> bool:
+    return any(flags & BOLD and text.strip() in CONTACT_LABELS for text, flags in line)
+
+
+# ===================== WordprocessingML =====================
+
+def _text(value: str) -> str:
+    return escape(_INVALID_XML.sub('', value))
+
+
+def _run(text: str, flags: int = 0) -> str:
+    properties = ''
+    if flags:
+        properties = '<w:rPr>'
+        if flags & CODE:
+            properties += '<w:rFonts w:ascii="Courier New" w:hAnsi="Courier New"/>'
+        if flags & BOLD:
+            properties += '<w:b/>'
+        if flags & ITALIC:
+            properties += '<w:i/>'
+        properties += '</w:rPr>'
+    return f'<w:r>{properties}<w:t xml:space="preserve">{_text(text)}</w:t></w:r>'
+
+
+def _paragraph(lines: List[Line], style_id: Optional[str] = None) -> str:
+    properties = f'<w:pPr><w:pStyle w:val="{style_id}"/></w:pPr>' if style_id else ''
+    runs = '<w:r><w:br/></w:r>'.join(
+        ''.join(_run(text, flags) for text, flags in line)
+        for line in lines
+    )
+    return f'<w:p>{properties}{runs}</w:p>'
+
+
+def _list(element: Element, depth: int, style_ids: Dict[str, str], out: List[str]):
+    base_style = 'List Bullet' if element.tag == 'ul' else 'List Number'
+    style_id = style_ids.get(base_style if depth == 0 else f'{base_style} {min(depth + 1, 3)}')
+    for item in element:
+        if item.tag != 'li':
+            continue
+        lines: List[Line] = [[]]
+        nested: List[Element] = []
+        _collect_runs(item, 0, lines, nested)
+        lines = _clean(lines)
+        if lines:
+            out.append(_paragraph(lines, style_id))
+        for child in nested:
+            _list(child, depth + 1, style_ids, out)
+
+
+def _blocks(parent: Element, style_ids: Dict[str, str], out: List[str]):
+    for element in parent:
+        tag = element.tag
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            lines: List[Line] = [[]]
+            _collect_runs(element, 0, lines)
+            out.append(_paragraph(_clean(lines), style_ids.get(f'Heading {min(int(tag[1]), 3)}')))
+        elif tag == 'p':
+            lines = [[]]
+            _collect_runs(element, 0, lines)
+            lines = [line for line in _clean(lines) if not _is_contact_line(line)]
+            if lines:
+                out.append(_paragraph(lines))
+        elif tag in ('ul', 'ol'):
+            _list(element, 0, style_ids, out)
+        elif tag == 'pre':
+            code = ''.join(element.itertext()).rstrip('\n')
+            out.append(_paragraph([[(line, CODE)] for line in code.split('\n')]))
+        elif tag == 'hr':
+            continue
+        else:
+            _blocks(element, style_ids, out)
+
+
+def _header(contact_info: Dict, title: str, style_ids: Dict[str, str]) -> List[str]:
+    details = ' | '.join(
+        contact_info[key] for key in ('email', 'phone', 'location') if contact_info.get(key)
+    )
+    return [
+        _paragraph([[(contact_info.get('name') or title, 0)]], style_ids.get(NAME_STYLE)),
+        _paragraph([[(details, 0)]] if details else [], style_ids.get(CONTACT_STYLE)),
+        _paragraph([]),  # Spacing
+    ]
+
+
+def write_docx(content: str, title: str, template_id: Optional[str], contact_info: Dict) -> bytes:
+    """Build a DOCX for a resume on top of its template's base document"""
+    base = get_base(template_id)
+
+    parts = _header(contact_info, title, base.style_ids)
+    _blocks(parse_markdown(content), base.style_ids, parts)
+
+    # The static parts are copied as-is; only the body is new
+    out = io.BytesIO(base.archive)
+    out.seek(0, io.SEEK_END)
+    with zipfile.ZipFile(out, 'a', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(DOCUMENT_PART, base.head + ''.join(parts) + base.tail)
+    return out.getvalue()
@@ -0,0 +1,98 @@
+"""
+Concurrent rendering of several export formats of one resume
+The resume is parsed once in the request process; formats missing from the
+artifact store are then rendered side by side: the PDF in the request thread
+and the others in a pool of worker processes (rendering is CPU-bound, so
+threads would serialize on the GIL).
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from app.config import settings
+from app.services import artifact_store
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def _init_worker():
+    # Pay for imports and template compilation once per worker, not per job
+    from app.services import export_service  # noqa: F401
+    from app.services.template_registry import load_templates
+    load_templates()
+
+
+def _render(content, title, template, personal_info, customization, export_format, parsed) -> str:
+    return artifact_store.get_or_render(content, title, template=template, personal_info=personal_info,
+                                        customization=customization, export_format=export_format, parsed=parsed)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared worker pool, starting it on first use"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: forking a process that runs server threads is not safe
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.EXPORT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _discard_executor():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def render_formats(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                   customization: Optional[Dict] = None, formats: List[str] = ('pdf', 'docx')) -> Dict[str, str]:
+    """Return {format: path of the stored export}, rendering missing formats concurrently"""
+    from app.services.export_service import parse_resume
+
+    paths = {}
+    missing = []
+    for export_format in formats:
+        key = artifact_store.export_key(content, title, template, personal_info, customization, export_format)
+        path = artifact_store.get(key, export_format)
+        if path:
+            paths[export_format] = path
+        else:
+            missing.append(export_format)
+    if not missing:
+        return paths
+
+    parsed = parse_resume(content, personal_info)
+    args = (content, title, template, personal_info, customization)
+
+    futures = {}
+    if len(missing) > 1 and settings.EXPORT_WORKERS > 0:
+        # The slowest format (PDF) renders here while the workers take the rest
+        missing.sort(key=lambda fmt: fmt != 'pdf')
+        try:
+            executor = get_executor()
+            futures = {fmt: executor.submit(_render, *args, fmt, parsed) for fmt in missing[1:]}
+        except BrokenProcessPool:
+            _discard_executor()
+            futures = {}
+        paths[missing[0]] = _render(*args, missing[0], parsed)
+        for export_format, future in futures.items():
+            try:
+                paths[export_format] = future.result(timeout=settings.EXPORT_TIMEOUT_SECONDS)
+            except BrokenProcessPool as e:
+                print(f"[EXPORT POOL][ERROR] Worker pool broke ({e}), rendering in-process")
+                _discard_executor()
+            except FutureTimeoutError:
+                print(f"[EXPORT POOL][ERROR] {export_format} render timed out in the pool, rendering in-process")
+                future.cancel()
+
+    for export_format in missing:
+        if export_format not in paths:
+            paths[export_format] = _render(*args, export_format, parsed)
+    return paths
@@ -1,6 +1,6 @@
 import tempfile
 import os
-import markdown
+import io
 import html2text
 from typing import Optional, Dict
 from reportlab.lib.pagesizes import letter, A4
@@ -8,10 +8,12 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER
-from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from reportlab import rl_config
+from app.config import settings
 from app.services.template_html_generator import generate_template_html
+from app.services.stylesheet import enable_shared_pdf_css
+from app.services.fit_engine import fit_key, fit_one_page, fit_scale
+from app.services.template_html_generator import extract_contact_info, parse_content_sections
 
 # Try to import PDF generation libraries (optional)
 try:
@@ -20,13 +22,103 @@ try:
 except ImportError:
     HAS_XHTML2PDF = False
 
+if HAS_XHTML2PDF and settings.PDF_SHARED_CSS:
+    # Parse each distinct stylesheet once instead of once per PDF
+    enable_shared_pdf_css()
+
 try:
     from weasyprint import HTML
     HAS_WEASYPRINT = True
 except (ImportError, OSError):
     HAS_WEASYPRINT = False
 
-def generate_pdf(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None, customization: Optional[Dict] = None) -> str:
+if settings.PDF_OPTIMIZE:
+    # ReportLab wraps compressed streams in ASCII85 by default, which adds 25%
+    rl_config.useA85 = 0
+
+# Running totals of the PDF size optimization
+pdf_size_stats = {'documents': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+def optimize_pdf(pdf: bytes) -> bytes:
+    """
+    Shrink a finished PDF: compress any uncompressed content streams and merge
+    identical objects (fonts, images, resource dictionaries shared between pages).
+    Returns the original bytes when the rewrite is not smaller.
+    """
+    from pypdf import PdfReader, PdfWriter
+    
+    try:
+        writer = PdfWriter(clone_from=PdfReader(io.BytesIO(pdf)))
+        for page in writer.pages:
+            page.compress_content_streams()
+        writer.compress_identical_objects()
+        out = io.BytesIO()
+        writer.write(out)
+        optimized = out.getvalue()
+    except Exception as e:
+        print(f"[PDF OPTIMIZE][ERROR] {e}")
+        return pdf
+    
+    if len(optimized) >= len(pdf):
+        optimized = pdf
+    pdf_size_stats['documents'] += 1
+    pdf_size_stats['bytes_in'] += len(pdf)
+    pdf_size_stats['bytes_out'] += len(optimized)
+    print(f"[PDF OPTIMIZE] {len(pdf)} -> {len(optimized)} bytes (saved {len(pdf) - len(optimized)})")
+    return optimized
+
+def optimize_pdf_file(path: str):
+    """Run optimize_pdf on a PDF file in place"""
+    with open(path, 'rb') as pdf_file:
+        pdf = pdf_file.read()
+    optimized = optimize_pdf(pdf)
+    if optimized is not pdf:
+        with open(path, 'wb') as pdf_file:
+            pdf_file.write(optimized)
+
+def use_native_renderer(template: Optional[Dict] = None, customization: Optional[Dict] = None) -> bool:
+    """Whether a PDF should go through the native ReportLab renderer"""
+    if settings.PDF_ENGINE == 'native':
+        return True
+    if settings.PDF_ENGINE == 'html':
+        return False
+    # auto: custom CSS can only be honoured by the HTML engines, and only
+    # layouts verified against the HTML output are rendered natively
+    if (customization or {}).get('custom_css'):
+        return False
+    from app.services.pdf_renderer import is_native_default
+    return is_native_default((template or {}).get('id'))
+
+def parse_resume(content: str, personal_info: Optional[Dict] = None):
+    """Parse contact info and sections once, for callers rendering several formats"""
+    return extract_contact_info(content, personal_info), parse_content_sections(content)
+
+def generate_native_pdf(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None, customization: Optional[Dict] = None,
+                        contact_info: Optional[Dict] = None, sections: Optional[list] = None) -> bytes:
+    """Render a PDF straight from the parsed sections with ReportLab (no HTML step)"""
+    from app.services import pdf_renderer
+    
+    # Parse once; the fit search and the final render share the result
+    if sections is None:
+        sections = parse_content_sections(content)
+    if contact_info is None:
+        contact_info = extract_contact_info(content, personal_info)
+    
+    scale = None
+    if settings.PDF_FIT_ONE_PAGE:
+        # ReportLab renders are cheap enough to measure by rendering for real
+        fit = fit_scale(
+            fit_key(content, template, personal_info, customization, engine='native'),
+            lambda s: pdf_renderer.render(content, title, template, personal_info, customization, s, sections, contact_info)
+        )
+        if fit.pdf:
+            return fit.pdf
+        scale = fit.scale
+    
+    return pdf_renderer.render_pdf(content, title, template, personal_info, customization, scale, sections, contact_info)
+
+def generate_pdf(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None, customization: Optional[Dict] = None,
+                 contact_info: Optional[Dict] = None, sections: Optional[list] = None) -> str:
     """Generate PDF from markdown content with template styling"""
     # Create temporary file
     temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
@@ -40,14 +132,43 @@ def generate_pdf(content: str, title: str, template: Optional[Dict] = None, pers
     
     print(f"[PDF DEBUG] Template: {template}, Type: {type(template)}")
     
+    # Method 0: Native ReportLab renderer (fast path, no HTML parsing)
+    if use_native_renderer(template, customization):
+        try:
+            pdf_bytes = generate_native_pdf(content, title, template, personal_info, customization, contact_info, sections)
+            if settings.PDF_OPTIMIZE:
+                pdf_bytes = optimize_pdf(pdf_bytes)
+            with open(temp_file.name, 'wb') as pdf_file:
+                pdf_file.write(pdf_bytes)
+            return temp_file.name
+        except Exception as e:
+            print(f"Native renderer failed: {e}. Trying HTML engines...")
+    
+    # Find the largest font size/spacing that still fits on one page
+    fit = None
+    if settings.PDF_FIT_ONE_PAGE and HAS_XHTML2PDF:
+        try:
+            fit = fit_one_page(content, template, personal_info, customization)
+        except Exception as e:
+            print(f"One-page fit failed: {e}. Using fixed one-page sizes...")
+    
     # Generate HTML from template with one-page constraint
-    html_content = generate_template_html(content, template, personal_info, customization, one_page=True)
+    html_content = generate_template_html(
+        content, template, personal_info, customization,
+        one_page=True, fit_scale=fit.scale if fit else None
+    )
     
     # Try different PDF generation methods
     pdf_generated = False
     
+    # The fit engine already rendered this exact HTML with xhtml2pdf
+    if fit and fit.pdf and not HAS_WEASYPRINT:
+        with open(temp_file.name, 'wb') as pdf_file:
+            pdf_file.write(fit.pdf)
+        pdf_generated = True
+    
     # Method 1: Try WeasyPrint (best quality, requires system libs on Windows)
-    if HAS_WEASYPRINT:
+    if not pdf_generated and HAS_WEASYPRINT:
         try:
             HTML(string=html_content).write_pdf(temp_file.name)
             pdf_generated = True
@@ -57,9 +178,6 @@ def generate_pdf(content: str, title: str, template: Optional[Dict] = None, pers
     # Method 2: Try xhtml2pdf (pure Python, works on Windows)
     if not pdf_generated and HAS_XHTML2PDF:
         try:
-            from xhtml2pdf.config import httpConfig
-            httpConfig.save_keys = False
-            
             # Debug: Save HTML to file for inspection
             import os
             debug_html_file = temp_file.name.replace('.pdf', '_debug.html')
@@ -82,7 +200,6 @@ def generate_pdf(content: str, title: str, template: Optional[Dict] = None, pers
                 # Try with alternative settings
                 try:
                     with open(temp_file.name, 'wb') as pdf_file:
-                        from xhtml2pdf import pisa
                         from io import BytesIO
                         result = BytesIO()
                         pisa_status = pisa.CreatePDF(
@@ -183,118 +300,33 @@ def generate_pdf(content: str, title: str, template: Optional[Dict] = None, pers
         # Build PDF
         doc.build(story)
     
+    if settings.PDF_OPTIMIZE:
+        optimize_pdf_file(temp_file.name)
+    
     return temp_file.name
 
-def generate_docx(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None, customization: Optional[Dict] = None) -> str:
+def generate_docx(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None, customization: Optional[Dict] = None,
+                  contact_info: Optional[Dict] = None) -> str:
     """Generate DOCX from markdown content with template styling"""
+    from app.services.docx_writer import write_docx
+    
     # Create temporary file
     temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.docx')
     temp_file.close()
     
-    # Create Document
-    doc = Document()
-    
     # Get template styling info
     template_id = 'minimalist-clean'
     if template and isinstance(template, dict):
         template_id = template.get('id', 'minimalist-clean')
     
-    # Set default font based on template
-    style = doc.styles['Normal']
-    font = style.font
-    if template_id == 'professional-classic':
-        font.name = 'Calibri'
-    else:
-        font.name = 'Arial'
-    font.size = Pt(11)
-    
-    # Extract contact info
-    from app.services.template_html_generator import extract_contact_info
-    contact_info = extract_contact_info(content, personal_info)
-    
-    # Add header with contact info
-    if template_id == 'professional-classic':
-        # Professional Classic Header
-        name_para = doc.add_paragraph()
-        name_run = name_para.add_run(contact_info.get('name', title))
-        name_run.font.size = Pt(28)
-        name_run.font.bold = True
-        name_run.font.color.rgb = RGBColor(0x1e, 0x40, 0xaf)
-        
-        contact_para = doc.add_paragraph()
-        if contact_info.get('email'):
-            contact_para.add_run(contact_info['email'])
-        if contact_info.get('phone'):
-            if contact_info.get('email'):
-                contact_para.add_run(' | ')
-            contact_para.add_run(contact_info['phone'])
-        if contact_info.get('location'):
-            contact_para.add_run(' | ')
-            contact_para.add_run(contact_info['location'])
-        contact_para.runs[0].font.size = Pt(10)
-        
-        doc.add_paragraph()  # Spacing
-    else:
-        # Minimalist Clean Header
-        name_para = doc.add_paragraph(alignment=WD_ALIGN_PARAGRAPH.CENTER)
-        name_run = name_para.add_run(contact_info.get('name', title))
-        name_run.font.size = Pt(24)
-        name_run.font.bold = True
-        
-        contact_para = doc.add_paragraph(alignment=WD_ALIGN_PARAGRAPH.CENTER)
-        if contact_info.get('email'):
-            contact_para.add_run(contact_info['email'])
-        if contact_info.get('phone'):
-            if contact_info.get('email'):
-                contact_para.add_run(' | ')
-            contact_para.add_run(contact_info['phone'])
-        if contact_info.get('location'):
-            contact_para.add_run(' | ')
-            contact_para.add_run(contact_info['location'])
-        contact_para.runs[0].font.size = Pt(9.5)
-        
-        doc.add_paragraph()  # Spacing
-    
-    # Convert markdown to HTML
-    html_content = markdown.markdown(content)
-    h = html2text.HTML2Text()
-    h.ignore_links = True
-    plain_text = h.handle(html_content)
-    
-    # Process content
-    for line in plain_text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Skip contact info already added
-        if '**Email:**' in line or '**Phone:**' in line or '**Location:**' in line:
-            continue
-        
-        # Check for headers
-        if line.startswith('# '):
-            p = doc.add_heading(line[2:], level=1)
-            if template_id == 'professional-classic':
-                p.runs[0].font.color.rgb = RGBColor(0x25, 0x63, 0xeb)
-        elif line.startswith('## '):
-            p = doc.add_heading(line[3:], level=2)
-            if template_id == 'professional-classic':
-                p.runs[0].font.color.rgb = RGBColor(0x25, 0x63, 0xeb)
-                p.runs[0].font.size = Pt(14)
-        elif line.startswith('### '):
-            p = doc.add_heading(line[4:], level=3)
-        else:
-            # Regular paragraph
-            if line.startswith('- '):
-                # Bullet point
-                p = doc.add_paragraph(line[2:], style='List Bullet')
-            elif line.startswith('* '):
-                p = doc.add_paragraph(line[2:], style='List Bullet')
-            else:
-                p = doc.add_paragraph(line)
+    # Styles come from the template's base document; the body is written directly
+    if contact_info is None:
+        contact_info = extract_contact_info(content, personal_info)
+    docx_bytes = write_docx(content, title, template_id, contact_info)
     
     # Save document
-    doc.save(temp_file.name)
+    with open(temp_file.name, 'wb') as docx_file:
+        docx_file.write(docx_bytes)
     
     return temp_file.name
 
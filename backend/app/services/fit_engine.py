@@ -0,0 +1,120 @@
+"""
+One-page fit engine
+Finds the largest font size and spacing at which a resume still renders on
+a single page, by measuring real xhtml2pdf renders and binary-searching a
+ladder of scale factors. The chosen scale is cached per content hash.
+"""
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from app.config import settings
+from app.services.template_html_generator import generate_template_html
+
+# Scale factors applied to the user's chosen font size and spacing, largest first
+FIT_SCALES = (1.0, 0.95, 0.9, 0.85, 0.8, 0.75, 0.7)
+
+
+class FitResult(NamedTuple):
+    scale: float
+    pages: int
+    fits: bool
+    renders: int  # Number of measured renders; 0 when served from the cache
+    pdf: Optional[bytes] = None  # The measured render at `scale`, when one was made
+
+
+_fit_cache: "OrderedDict[str, FitResult]" = OrderedDict()
+_fit_cache_lock = threading.Lock()
+
+
+def fit_key(content: str, template: Optional[Dict], personal_info: Optional[Dict], customization: Optional[Dict],
+            engine: str = 'html') -> str:
+    """Hash of everything that affects the rendered height"""
+    payload = json.dumps(
+        [engine, content, (template or {}).get('id'), personal_info, customization],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_pdf_bytes(html: str) -> bytes:
+    """Render HTML to PDF bytes with xhtml2pdf"""
+    from xhtml2pdf import pisa
+
+    out = io.BytesIO()
+    status = pisa.CreatePDF(html, dest=out, encoding='utf-8')
+    if status.err:
+        raise ValueError(f"xhtml2pdf reported {status.err} error(s)")
+    return out.getvalue()
+
+
+def count_pages(pdf: bytes) -> int:
+    """Count the pages of a PDF"""
+    from pypdf import PdfReader
+
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+
+def _measure(content, template, personal_info, customization, scale):
+    html = generate_template_html(content, template, personal_info, customization, one_page=True, fit_scale=scale)
+    pdf = render_pdf_bytes(html)
+    return count_pages(pdf), pdf
+
+
+def fit_scale(key: str, measure: Callable[[float], Tuple[int, Optional[bytes]]]) -> FitResult:
+    """
+    Pick the largest scale in FIT_SCALES for which `measure(scale)` reports one page.
+    `measure` returns (pages, pdf bytes or None). If nothing fits, the smallest
+    scale is used and the overflow flows onto a second page instead of being clipped.
+    """
+    with _fit_cache_lock:
+        cached = _fit_cache.get(key)
+        if cached is not None:
+            _fit_cache.move_to_end(key)
+            return cached._replace(renders=0, pdf=None)
+
+    renders = 0
+    measured = {}
+
+    def pages_at(index):
+        nonlocal renders
+        if index not in measured:
+            measured[index] = measure(FIT_SCALES[index])
+            renders += 1
+        return measured[index][0]
+
+    if pages_at(0) <= 1:
+        best = 0
+    elif pages_at(len(FIT_SCALES) - 1) > 1:
+        best = len(FIT_SCALES) - 1
+    else:
+        # Invariant: FIT_SCALES[low] overflows, FIT_SCALES[high] fits
+        low, high = 0, len(FIT_SCALES) - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if pages_at(middle) <= 1:
+                high = middle
+            else:
+                low = middle
+        best = high
+
+    pages, pdf = measured[best]
+    result = FitResult(scale=FIT_SCALES[best], pages=pages, fits=pages <= 1, renders=renders, pdf=pdf)
+    print(f"[FIT] scale={result.scale} pages={pages} renders={renders}")
+
+    with _fit_cache_lock:
+        _fit_cache[key] = result._replace(pdf=None)
+        while len(_fit_cache) > settings.FIT_CACHE_SIZE:
+            _fit_cache.popitem(last=False)
+    return result
+
+
+def fit_one_page(content: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                 customization: Optional[Dict] = None) -> FitResult:
+    """Fit the xhtml2pdf rendering of a resume on one page"""
+    return fit_scale(
+        fit_key(content, template, personal_info, customization),
+        lambda scale: _measure(content, template, personal_info, customization, scale)
+    )
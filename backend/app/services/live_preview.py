@@ -0,0 +1,211 @@
+"""
+Server-side document model for the live-preview WebSocket
+The editor sends section-level deltas instead of the whole resume; the
+session applies them to its model, re-renders (unchanged sections come from
+the markdown fragment cache) and diffs the result against the fragments it
+sent last, so only the changed header/section HTML goes back over the wire.
+"""
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.schemas import ResumeCustomization, ResumeUpdate
+from app.services.template_html_generator import generate_template_html
+
+_FRAGMENT_RE = re.compile(r'<div\b[^>]*\bdata-fragment="([^"]+)"[^>]*>')
+_DIV_RE = re.compile(r'<div\b|</div>')
+_STYLE_RE = re.compile(r'<style[^>]*>(.*?)</style>', re.S)
+
+
+def split_fragments(html: str) -> Tuple[str, Dict[str, str], str]:
+    """
+    Split a rendered page into (skeleton, {fragment id: outer HTML}, css)
+    The skeleton is the page with every fragment and the stylesheet cut out.
+    """
+    fragments = {}
+    skeleton = []
+    pos = 0
+    for match in _FRAGMENT_RE.finditer(html):
+        if match.start() < pos:
+            continue  # Nested inside the previous fragment
+        depth = 1
+        end = len(html)
+        for tag in _DIV_RE.finditer(html, match.end()):
+            depth += 1 if tag.group(0) == '<div' else -1
+            if depth == 0:
+                end = tag.end()
+                break
+        skeleton.append(html[pos:match.start()])
+        skeleton.append(f'<!--fragment:{match.group(1)}-->')
+        fragments[match.group(1)] = html[match.start():end]
+        pos = end
+    skeleton.append(html[pos:])
+    skeleton = ''.join(skeleton)
+
+    css = ''
+    style = _STYLE_RE.search(skeleton)
+    if style:
+        css = style.group(1)
+        skeleton = skeleton[:style.start(1)] + skeleton[style.end(1):]
+    return skeleton, fragments, css
+
+
+def render_option(op: Dict):
+    """Validate a 'template' / 'personal_info' / 'customization' op like the REST update; returns the value"""
+    name = op['op']
+    try:
+        value = getattr(ResumeUpdate(**{name: op.get(name)}), name)
+    except ValidationError as e:
+        raise ValueError(f"Invalid {name}: {e.errors()[0]['msg']}")
+    return value.dict() if isinstance(value, ResumeCustomization) else value
+
+
+class LiveDocument:
+    """
+    Resume markdown held as a header plus (title, body) sections
+    Sections start at '## ' lines, so content() gives back the text as typed.
+    """
+
+    def __init__(self, content: str = ''):
+        self.header = ''
+        self.sections: List[List[str]] = []
+        current = None
+        for line in (content or '').splitlines(keepends=True):
+            if line.startswith('## '):
+                current = [line[3:].rstrip('\r\n'), '']
+                self.sections.append(current)
+            elif current is None:
+                self.header += line
+            else:
+                current[1] += line
+
+    def content(self) -> str:
+        return self.header + ''.join(f'## {title}\n{body}' for title, body in self.sections)
+
+    def _section(self, op: Dict) -> List[str]:
+        index = op.get('index')
+        if not isinstance(index, int) or not 0 <= index < len(self.sections):
+            raise ValueError(f"No section at index {index!r}")
+        return self.sections[index]
+
+    def apply(self, op: Dict):
+        """
+        Apply one delta; raises ValueError for malformed ops
+        {'op': 'splice', 'index', 'start', 'end', 'text'}  replace body[start:end] of a section
+        {'op': 'section', 'index', 'text'}                 replace a section's body
+        {'op': 'title', 'index', 'text'}                   rename a section
+        {'op': 'insert', 'index', 'title', 'text'}         add a section before index
+        {'op': 'delete', 'index'}                          remove a section
+        {'op': 'header', 'text'}                           replace the text above the first section
+        {'op': 'replace', 'text'}                          replace the whole document
+        """
+        kind = op.get('op')
+        text = op.get('text', '')
+        if not isinstance(text, str):
+            raise ValueError("'text' must be a string")
+
+        if kind == 'splice':
+            section = self._section(op)
+            start, end = op.get('start'), op.get('end', op.get('start'))
+            if not (isinstance(start, int) and isinstance(end, int) and 0 <= start <= end <= len(section[1])):
+                raise ValueError("Invalid splice range")
+            section[1] = section[1][:start] + text + section[1][end:]
+        elif kind == 'section':
+            self._section(op)[1] = text
+        elif kind == 'title':
+            self._section(op)[0] = text.replace('\n', ' ')
+        elif kind == 'insert':
+            index = op.get('index', len(self.sections))
+            if not isinstance(index, int) or not 0 <= index <= len(self.sections):
+                raise ValueError(f"Cannot insert at index {index!r}")
+            title = op.get('title', '')
+            if not isinstance(title, str):
+                raise ValueError("'title' must be a string")
+            if text and not text.endswith('\n'):
+                text += '\n'
+            self.sections.insert(index, [title.replace('\n', ' '), text])
+        elif kind == 'delete':
+            self.sections.remove(self._section(op))
+        elif kind == 'header':
+            self.header = text if not text or text.endswith('\n') else text + '\n'
+        elif kind == 'replace':
+            self.__init__(text)
+        else:
+            raise ValueError(f"Unknown op {kind!r}")
+
+
+class LivePreviewSession:
+    """One editor connection: the document, its render options and the last HTML sent"""
+
+    def __init__(self, content: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                 customization: Optional[Dict] = None):
+        self.document = LiveDocument(content)
+        self.template = template
+        self.personal_info = personal_info
+        self.customization = customization
+        self.version = 0  # Deltas applied so far
+        self.rendered_version = -1
+        self._skeleton: Optional[str] = None
+        self._fragments: Dict[str, str] = {}
+        self._css = ''
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+
+    def apply(self, ops: List[Dict]) -> int:
+        """Apply a batch of deltas (all or nothing) and return the new version"""
+        with self._lock:
+            content = self.document.content()
+            template, personal_info, customization = self.template, self.personal_info, self.customization
+            try:
+                for op in ops:
+                    if not isinstance(op, dict):
+                        raise ValueError("Ops must be objects")
+                    if op.get('op') == 'template':
+                        self.template = render_option(op)
+                    elif op.get('op') == 'personal_info':
+                        self.personal_info = render_option(op)
+                    elif op.get('op') == 'customization':
+                        self.customization = render_option(op)
+                    else:
+                        self.document.apply(op)
+            except ValueError:
+                self.document = LiveDocument(content)
+                self.template, self.personal_info, self.customization = template, personal_info, customization
+                raise
+            self.version += 1
+            return self.version
+
+    def snapshot(self) -> Tuple[int, str, Optional[Dict], Optional[Dict], Optional[Dict]]:
+        with self._lock:
+            return self.version, self.document.content(), self.template, self.personal_info, self.customization
+
+    def render(self, full: bool = False) -> Optional[Dict]:
+        """
+        Render the current version and return the message for the client:
+        {'type': 'full', 'html'} on the first render or when the page structure
+        changed, else {'type': 'patch', 'fragments', 'css'?}; None if nothing changed
+        """
+        with self._render_lock:
+            return self._render(full)
+
+    def _render(self, full: bool) -> Optional[Dict]:
+        version, content, template, personal_info, customization = self.snapshot()
+        if version == self.rendered_version and not full:
+            return None
+        html = generate_template_html(content, template, personal_info, customization)
+        skeleton, fragments, css = split_fragments(html)
+
+        previous = self._fragments
+        structural = full or skeleton != self._skeleton or fragments.keys() != previous.keys()
+        self._skeleton, self._fragments, self._css, css_changed = skeleton, fragments, css, css != self._css
+        self.rendered_version = version
+        if structural:
+            return {'type': 'full', 'version': version, 'html': html}
+
+        changed = {key: value for key, value in fragments.items() if previous.get(key) != value}
+        if not changed and not css_changed:
+            return {'type': 'patch', 'version': version, 'fragments': {}}
+        message = {'type': 'patch', 'version': version, 'fragments': changed}
+        if css_changed:
+            message['css'] = css
+        return message
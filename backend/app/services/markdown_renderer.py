@@ -0,0 +1,101 @@
+"""
+Markdown rendering layer for resume sections
+Converters are expensive to build (every extension is loaded and registered),
+so each thread keeps one per configuration and resets it after every use.
+Section fragments are cached by content hash. Each section missing from the
+cache is converted on its own, so reference links, footnotes and abbreviations
+defined in one section never resolve in another.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import markdown
+from app.config import settings
+
+SECTION_EXTENSIONS = ('nl2br', 'fenced_code')
+
+_local = threading.local()
+_fragments: "OrderedDict[bytes, str]" = OrderedDict()
+_fragments_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'batches': 0}
+
+
+@contextmanager
+def pooled_converter(extensions: Tuple[str, ...] = SECTION_EXTENSIONS,
+                     setup: Optional[Callable[[markdown.Markdown], None]] = None) -> Iterator[markdown.Markdown]:
+    """
+    Borrow this thread's converter for an extension set (and optional setup hook).
+    The converter is reset when it is returned, so no state leaks between documents.
+    """
+    converters: Dict = getattr(_local, 'converters', None)
+    if converters is None:
+        converters = _local.converters = {}
+    key = (extensions, setup)
+    md = converters.get(key)
+    if md is None:
+        md = markdown.Markdown(extensions=list(extensions))
+        if setup is not None:
+            setup(md)
+        converters[key] = md
+    try:
+        yield md
+    finally:
+        md.reset()
+
+
+def _key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+def _convert_batch(texts: List[str]) -> List[str]:
+    """Convert several markdown texts with one borrowed converter, resetting it between texts"""
+    results = []
+    with pooled_converter() as md:
+        for text in texts:
+            results.append(md.convert(text))
+            md.reset()
+    return results
+
+
+def convert_sections(texts: List[str]) -> List[str]:
+    """Convert the markdown of each section to HTML, reusing cached fragments"""
+    keys = [_key(text) for text in texts]
+    results: List[Optional[str]] = [None] * len(texts)
+    with _fragments_lock:
+        for i, key in enumerate(keys):
+            fragment = _fragments.get(key)
+            if fragment is not None:
+                _fragments.move_to_end(key)
+                results[i] = fragment
+    missing = [i for i, fragment in enumerate(results) if fragment is None]
+
+    if missing:
+        converted = _convert_batch([texts[i] for i in missing])
+        with _fragments_lock:
+            for i, fragment in zip(missing, converted):
+                results[i] = _fragments[keys[i]] = fragment
+            while len(_fragments) > settings.SECTION_CACHE_SIZE:
+                _fragments.popitem(last=False)
+
+    with _fragments_lock:
+        _stats['hits'] += len(texts) - len(missing)
+        _stats['misses'] += len(missing)
+        _stats['batches'] += 1 if missing else 0
+    return results
+
+
+def convert_section(text: str) -> str:
+    """Convert the markdown of a single section (cached)"""
+    return convert_sections([text])[0]
+
+
+def cache_stats() -> Dict[str, int]:
+    with _fragments_lock:
+        return dict(_stats, size=len(_fragments))
+
+
+def clear_cache():
+    with _fragments_lock:
+        _fragments.clear()
@@ -0,0 +1,222 @@
+"""
+Streaming DOCX to markdown
+Reads word/document.xml straight out of the zip with an incremental XML
+parser instead of building python-docx's object model. Headings, paragraphs,
+list items and tables come out in document order, and each element is
+dropped as soon as it has been converted. Styles and list numbering are
+resolved once per document, from styles.xml and numbering.xml.
+"""
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+DOCUMENT_PART = 'word/document.xml'
+STYLES_PART = 'word/styles.xml'
+NUMBERING_PART = 'word/numbering.xml'
+
+_HEADING_NAME = re.compile(r'^heading\s*(\d*)$', re.IGNORECASE)
+
+
+class ParagraphStyle(NamedTuple):
+    heading: Optional[int]  # Markdown heading level, None for body text
+    numbering: Optional[Tuple[str, int]]  # (numId, ilvl) the style itself numbers paragraphs with
+
+
+def _val(element: Optional[ET.Element], child: str) -> Optional[str]:
+    if element is None:
+        return None
+    found = element.find(f'{W}{child}')
+    return found.get(f'{W}val') if found is not None else None
+
+
+def _numbering_of(ppr: Optional[ET.Element]) -> Optional[Tuple[str, int]]:
+    num_pr = ppr.find(f'{W}numPr') if ppr is not None else None
+    if num_pr is None:
+        return None
+    num_id = _val(num_pr, 'numId')
+    if not num_id or num_id == '0':  # numId 0 switches numbering off
+        return None
+    return num_id, int(_val(num_pr, 'ilvl') or 0)
+
+
+def _styles_of(part: BinaryIO) -> Iterator[ET.Element]:
+    """Each w:style element of styles.xml, discarded once the caller is done with it"""
+    for _, element in ET.iterparse(part):
+        if element.tag == f'{W}style':
+            yield element
+            element.clear()
+        elif element.tag == f'{W}latentStyles':
+            element.clear()  # Hundreds of entries for styles the document does not define
+
+
+def read_styles(archive: zipfile.ZipFile) -> Tuple[Dict[str, ParagraphStyle], Optional[str]]:
+    """Paragraph styles by style ID, and the ID of the default paragraph style"""
+    try:
+        part = archive.open(STYLES_PART)
+    except KeyError:
+        return {}, None
+
+    raw = {}
+    default_id = None
+    with part:
+        for style in _styles_of(part):
+            if style.get(f'{W}type') != 'paragraph':
+                continue
+            style_id = style.get(f'{W}styleId')
+            if style.get(f'{W}default') in ('1', 'true'):
+                default_id = style_id
+            ppr = style.find(f'{W}pPr')
+            outline = _val(ppr, 'outlineLvl')
+            raw[style_id] = (_val(style, 'name') or '', _val(style, 'basedOn'),
+                             int(outline) + 1 if outline is not None else None, _numbering_of(ppr))
+
+    def resolve(style_id, seen=()):
+        name, based_on, outline, numbering = raw[style_id]
+        heading = None
+        match = _HEADING_NAME.match(name.strip())
+        if match:
+            # Same levels as python-docx's 'Heading N' style names; a bare 'Heading' is level 4
+            heading = int(match.group(1)) if match.group(1) else 4
+        elif outline is not None and outline <= 9:
+            heading = outline
+        if based_on in raw and based_on not in seen:
+            parent = resolve(based_on, seen + (style_id,))
+            heading = heading if heading is not None else parent.heading
+            numbering = numbering or parent.numbering
+        return ParagraphStyle(heading, numbering)
+
+    return {style_id: resolve(style_id) for style_id in raw}, default_id
+
+
+def read_numbering(archive: zipfile.ZipFile) -> Dict[Tuple[str, int], str]:
+    """Number format ('bullet', 'decimal', ...) by (numId, ilvl)"""
+    try:
+        root = ET.fromstring(archive.read(NUMBERING_PART))
+    except KeyError:
+        return {}
+
+    abstract_formats = {}
+    for abstract in root.iter(f'{W}abstractNum'):
+        levels = {}
+        for level in abstract.iter(f'{W}lvl'):
+            levels[int(level.get(f'{W}ilvl') or 0)] = _val(level, 'numFmt') or 'bullet'
+        abstract_formats[abstract.get(f'{W}abstractNumId')] = levels
+
+    formats = {}
+    for num in root.iter(f'{W}num'):
+        levels = abstract_formats.get(_val(num, 'abstractNumId'), {})
+        for ilvl, num_format in levels.items():
+            formats[(num.get(f'{W}numId'), ilvl)] = num_format
+    return formats
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """Text of a paragraph's runs (hyperlinks and fields included), like python-docx's para.text"""
+    parts = []
+    for node in paragraph.iter():
+        tag = node.tag
+        if tag == f'{W}t':
+            parts.append(node.text or '')
+        elif tag == f'{W}tab':
+            parts.append('\t')
+        elif tag in (f'{W}br', f'{W}cr'):
+            parts.append('\n')
+        elif tag == f'{W}noBreakHyphen':
+            parts.append('-')
+    return ''.join(parts)
+
+
+def _blocks(stream: BinaryIO, styles: Dict[str, ParagraphStyle], default_style: Optional[str],
+            formats: Dict[Tuple[str, int], str]) -> Iterator[Tuple[str, object]]:
+    """
+    Yield ('heading', (level, text)), ('item', (marker, depth, text)),
+    ('paragraph', text), ('row', [cell texts]) and ('table_end', None) in document order
+    Rows of nested tables are folded into the text of their outer cell.
+    """
+    table_depth = 0
+    fallback_depth = 0  # mc:Fallback repeats the mc:Choice content (text boxes); skip it
+    cells: List[List[str]] = []  # Paragraph texts of each cell of the current top-level row
+    body = None
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == f'{W}body':
+                body = element
+            elif tag == f'{W}tbl':
+                table_depth += 1
+            elif tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif tag == f'{W}tc' and table_depth == 1:
+                cells.append([])
+            continue
+
+        if tag == f'{W}p':
+            text = _paragraph_text(element).strip()
+            ppr = element.find(f'{W}pPr')
+            style_id = _val(ppr, 'pStyle')
+            numbering = _numbering_of(ppr)
+            element.clear()  # Done with it; also keeps text-box paragraphs out of their anchor
+            if body is not None and not table_depth:
+                del body[:]  # Drop the converted blocks so memory stays flat
+            if not text or fallback_depth:
+                continue
+            if table_depth:
+                if cells:
+                    cells[-1].append(text)
+                continue
+
+            style = styles.get(style_id or default_style)
+            numbering = numbering or (style.numbering if style else None)
+            if style and style.heading is not None:
+                yield 'heading', (style.heading, text)
+            elif numbering:
+                marker = '-' if formats.get(numbering, 'bullet') in ('bullet', 'none') else '1.'
+                yield 'item', (marker, numbering[1], text)
+            else:
+                yield 'paragraph', text
+        elif tag == f'{W}tr' and table_depth == 1:
+            yield 'row', [' '.join(texts) for texts in cells]
+            cells = []
+            element.clear()
+        elif tag == f'{W}tbl':
+            table_depth -= 1
+            if not table_depth:
+                yield 'table_end', None
+                if body is not None:
+                    del body[:]
+        elif tag == MC_FALLBACK:
+            fallback_depth -= 1
+            element.clear()
+
+
+def docx_to_markdown(stream: BinaryIO) -> str:
+    """Convert a DOCX file object to markdown, in document order"""
+    with zipfile.ZipFile(stream) as archive:
+        styles, default_style = read_styles(archive)
+        formats = read_numbering(archive)
+        markdown_content = []
+        previous = None
+        with archive.open(DOCUMENT_PART) as document:
+            for kind, value in _blocks(document, styles, default_style, formats):
+                if previous == 'item' and kind != 'item':
+                    markdown_content.append("\n")  # Close the list
+                if kind == 'heading':
+                    level, text = value
+                    markdown_content.append(f"{'#' * min(level, 4)} {text}\n")
+                elif kind == 'item':
+                    marker, depth, text = value
+                    markdown_content.append(f"{'  ' * depth}{marker} {text}\n")
+                elif kind == 'paragraph':
+                    markdown_content.append(f"{value}\n\n")
+                elif kind == 'row':
+                    if previous not in ('row', 'item'):
+                        markdown_content.append("\n")  # Add spacing before table
+                    markdown_content.append(f"| {' | '.join(value)} |\n")
+                elif kind == 'table_end':
+                    markdown_content.append("\n")
+                previous = kind
+    return "".join(markdown_content).strip()
@@ -0,0 +1,143 @@
+"""
+Cache of parsed uploads
+Uploads are hashed as they are read from their spooled file, and the parsed
+markdown (with its parse metadata) is kept under (file hash, parser version)
+in memory and on disk, so uploading the same file again skips the PDF/DOCX
+parsers entirely.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, BinaryIO, Dict, Optional
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.services.resume_parser import ParseResult
+
+# Bump when the parsers' output changes for the same file, so stale results are not served
+PARSER_VERSION = 3
+
+HASH_CHUNK = 1024 * 1024
+
+_memory: "OrderedDict[str, Dict]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+_puts_since_prune = 0
+
+
+def file_digest(stream: BinaryIO) -> str:
+    """sha256 of a file object, read in chunks from the start"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(HASH_CHUNK), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(digest: str, file_type: str) -> str:
+    return f"{digest}-{file_type}-v{PARSER_VERSION}"
+
+
+def _cache_dir() -> str:
+    directory = settings.PARSE_CACHE_DIR or os.path.join(tempfile.gettempdir(), 'ai-resume-parses')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _path(key: str) -> str:
+    return os.path.join(_cache_dir(), f"{key}.json")
+
+
+def _remember(key: str, entry: Dict):
+    with _lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+        while len(_memory) > settings.PARSE_CACHE_SIZE:
+            _memory.popitem(last=False)
+
+
+def get(key: str) -> Optional[Dict]:
+    """{'markdown', 'metadata'} for a key, from memory or disk, or None"""
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+            _stats['memory_hits'] += 1
+            return entry
+
+    path = _path(key)
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        os.utime(path)  # Pruning drops the least recently used files
+    except (OSError, ValueError):
+        with _lock:
+            _stats['misses'] += 1
+        return None
+    with _lock:
+        _stats['disk_hits'] += 1
+    _remember(key, entry)
+    return entry
+
+
+def put(key: str, markdown: str, metadata: Optional[Dict] = None):
+    """Store parsed markdown and its metadata in memory and (atomically) on disk"""
+    global _puts_since_prune
+    entry = {'markdown': markdown, 'metadata': metadata or {}}
+    _remember(key, entry)
+    fd, tmp_path = tempfile.mkstemp(dir=_cache_dir(), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(entry, f)
+    os.replace(tmp_path, _path(key))
+
+    _puts_since_prune += 1
+    if _puts_since_prune >= 50:
+        _puts_since_prune = 0
+        prune()
+
+
+def prune(max_files: Optional[int] = None) -> int:
+    """Delete the least recently used files beyond PARSE_CACHE_MAX_FILES"""
+    max_files = settings.PARSE_CACHE_MAX_FILES if max_files is None else max_files
+    directory = _cache_dir()
+    entries = []
+    for name in os.listdir(directory):
+        try:
+            entries.append((os.path.getmtime(os.path.join(directory, name)), name))
+        except OSError:
+            continue
+    removed = 0
+    for _, name in sorted(entries)[:max(len(entries) - max_files, 0)]:
+        try:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def get_or_parse(stream: BinaryIO, file_type: str) -> "ParseResult":
+    """
+    Parse an upload ('pdf' or 'docx'), or return the cached result for identical bytes
+    Raises parse_pool.ParseLimitError when parsing hits a sandbox limit (nothing is cached then)
+    """
+    from app.services.parse_pool import parse_isolated
+    from app.services.resume_parser import ParseResult
+
+    key = cache_key(file_digest(stream), file_type)
+    entry = get(key)
+    if entry is not None:
+        print(f"[PARSE CACHE] Hit for {key[:12]}")
+        return ParseResult(entry['markdown'], dict(entry['metadata'], cached=True))
+    result = parse_isolated(stream, file_type)
+    put(key, result.markdown, result.metadata)
+    return ParseResult(result.markdown, dict(result.metadata, cached=False))
+
+
+def cache_stats() -> Dict[str, int]:
+    with _lock:
+        return dict(_stats, size=len(_memory))
@@ -0,0 +1,143 @@
+"""
+Parallel text extraction for long PDFs
+Pages are split into contiguous ranges, one per worker process; each worker
+opens the document once and extracts its range, and the ranges are merged
+back in page order. Short documents (most resumes) never leave the request
+process, where the pool's overhead would outweigh the gain. Bulk imports use
+the same pool to parse whole files side by side (parse_file), and uploads are
+parsed in it too (parse_isolated). The workers are sandboxed (see
+parse_sandbox): jobs that exceed their CPU, memory or time limit fail with
+ParseLimitError instead of hurting the API process.
+"""
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from app.config import settings
+# Callers catch parse_pool.ParseLimitError; parse_sandbox is an implementation detail of this module
+from app.services.parse_sandbox import ParseLimitError, SandboxPool  # noqa: F401
+
+_executor: Optional[SandboxPool] = None
+_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    return settings.PARSE_WORKERS or os.cpu_count() or 1
+
+
+def _init_worker():
+    import pdfplumber  # noqa: F401 (warms the worker: the import is paid once, not by its first job)
+    # Workers parse in-process; they never start pools of their own
+    settings.PARSE_WORKERS = 1
+    settings.PARSE_SANDBOX = False
+
+
+def extract_page_range(path: str, start: int, end: int) -> List[str]:
+    """Raw text of pages [start, end) of a PDF, opened once"""
+    import pdfplumber
+
+    texts = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:end]:
+            texts.append(page.extract_text() or '')
+            page.flush_cache()  # Layout objects are not needed once the text is out
+    return texts
+
+
+def parse_file(path: str):
+    """Detect and parse one resume file on disk (through the parse cache); returns a ParseResult"""
+    from app.services.parse_cache import get_or_parse
+    from app.services.resume_parser import detect_file_type
+
+    with open(path, 'rb') as f:
+        file_type = detect_file_type(f)
+        if file_type == 'doc':
+            raise ValueError("DOC format is not supported. Please convert to DOCX or PDF first.")
+        if file_type not in ('pdf', 'docx'):
+            raise ValueError("Unsupported file format. Please upload a PDF or DOCX file.")
+        return get_or_parse(f, file_type)
+
+
+def _parse_path(path: str, file_type: str):
+    from app.services.resume_parser import parse_upload
+
+    with open(path, 'rb') as f:
+        return parse_upload(f, file_type)
+
+
+def get_executor() -> SandboxPool:
+    """Return the shared sandboxed worker pool, starting it on first use"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = SandboxPool(
+                workers=worker_count(),
+                initializer=_init_worker,
+                cpu_seconds=settings.PARSE_CPU_SECONDS,
+                memory_mb=settings.PARSE_MEMORY_MB,
+                timeout=settings.PARSE_TIMEOUT_SECONDS,
+                max_jobs_per_worker=settings.PARSE_MAX_JOBS_PER_WORKER,
+            )
+        return _executor
+
+
+def parse_isolated(stream: BinaryIO, file_type: str):
+    """
+    Parse an upload ('pdf' or 'docx') in a sandboxed worker (PARSE_SANDBOX) or in-process;
+    returns a ParseResult and raises ParseLimitError when the file hits a limit
+    """
+    from app.services.resume_parser import parse_upload
+
+    if not settings.PARSE_SANDBOX:
+        return parse_upload(stream, file_type)
+    with _on_disk(stream) as path:
+        return get_executor().submit(_parse_path, path, file_type).result()
+
+
+def page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split pages into at most `parts` contiguous, near-equal ranges"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+@contextmanager
+def _on_disk(stream: BinaryIO) -> Iterator[str]:
+    """A path the workers can open: the stream's own file, or a temporary copy"""
+    name = getattr(stream, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        yield name
+        return
+    fd, path = tempfile.mkstemp(prefix='resume-parse-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            stream.seek(0)
+            shutil.copyfileobj(stream, f)
+        stream.seek(0)
+        yield path
+    finally:
+        os.remove(path)
+
+
+def should_parallelize(page_count: int) -> bool:
+    return worker_count() > 1 and page_count >= settings.PARSE_PARALLEL_MIN_PAGES
+
+
+def extract_pages(stream: BinaryIO, page_count: int) -> List[str]:
+    """Raw text of every page, extracted by the worker pool, in page order"""
+    ranges = page_ranges(page_count, worker_count())
+    with _on_disk(stream) as path:
+        executor = get_executor()
+        futures = [executor.submit(extract_page_range, path, start, end) for start, end in ranges]
+        texts = []
+        for future in futures:
+            texts.extend(future.result())  # The pool enforces the time limit
+        return texts
@@ -0,0 +1,224 @@
+"""
+Sandboxed worker processes for parsing untrusted files
+Each worker is a long-lived spawned process serving one job at a time over a
+pipe. Every job runs under a CPU-time limit (SIGXCPU is turned into an
+exception) and the worker's address space is capped at its start-up size plus
+a per-job allowance, so a hostile PDF fails its own job instead of taking the
+API process down. A job still running at its wall-clock deadline is killed
+with its process. Workers are replaced after a crash or a kill, after a set
+number of jobs, or when they hold on to too much memory.
+"""
+import multiprocessing
+import pickle
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not on Windows: jobs there get the wall-clock limit only
+    resource = None
+
+MB = 1024 * 1024
+
+
+LIMIT_DETAILS = {
+    'cpu': 'took too much processing time',
+    'memory': 'needed too much memory',
+    'time': 'took too long',
+    'crash': 'crashed the parser',
+}
+
+
+class ParseLimitError(Exception):
+    """A parse job exceeded its CPU, memory or time limit, or crashed its worker"""
+
+    def __init__(self, limit: str):
+        super().__init__(limit)
+        self.limit = limit  # 'cpu', 'memory', 'time' or 'crash'
+
+    @property
+    def detail(self) -> str:
+        return f"The file could not be parsed: it {LIMIT_DETAILS.get(self.limit, 'hit a server limit')}."
+
+
+def _status_kb(field: str) -> int:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _on_cpu_limit(signum, frame):
+    raise ParseLimitError('cpu')
+
+
+def _arm_cpu_limit(seconds: int):
+    """Stop the coming job once it has used `seconds` of CPU time (RLIMIT_CPU counts the process's total)"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+
+
+def _disarm_cpu_limit():
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _worker_main(conn, initializer: Optional[Callable], cpu_seconds: int, memory_mb: int):
+    if initializer is not None:
+        initializer()
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+        baseline = _status_kb('VmSize') * 1024
+        if baseline:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = baseline + memory_mb * MB
+            resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        fn, args = job
+        try:
+            if resource is not None:
+                _arm_cpu_limit(cpu_seconds)
+            outcome = ('ok', fn(*args))
+        except ParseLimitError as e:
+            outcome = ('limit', e.limit)
+        except MemoryError:
+            outcome = ('limit', 'memory')
+        except Exception as e:
+            outcome = ('error', e)
+        finally:
+            if resource is not None:
+                _disarm_cpu_limit()
+        try:
+            conn.send((outcome, _status_kb('VmRSS')))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # The result or exception does not pickle; report it as a plain error
+            conn.send((('error', RuntimeError(str(outcome[1]))), _status_kb('VmRSS')))
+
+
+class _Worker:
+    def __init__(self, context, initializer, cpu_seconds: int, memory_mb: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, initializer, cpu_seconds, memory_mb),
+                                       daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def stop(self, kill: bool = False):
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    A fixed number of sandboxed workers fed from one queue
+    submit() returns a concurrent.futures.Future; limit breaches resolve it with ParseLimitError.
+    """
+
+    def __init__(self, workers: int, initializer: Optional[Callable] = None, cpu_seconds: int = 20,
+                 memory_mb: int = 512, timeout: float = 60.0, max_jobs_per_worker: int = 100):
+        self._context = multiprocessing.get_context('spawn')  # Forking a process that runs server threads is not safe
+        self._initializer = initializer
+        self._cpu_seconds = cpu_seconds
+        self._memory_mb = memory_mb
+        self._timeout = timeout
+        self._max_jobs = max_jobs_per_worker
+        self._jobs: "queue.Queue[Optional[Tuple[Future, Callable, tuple]]]" = queue.Queue()
+        self._stats = {'jobs': 0, 'limits': 0, 'recycled': 0}
+        self._stats_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        for index in range(max(1, workers)):
+            thread = threading.Thread(target=self._serve, name=f'parse-sandbox-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, workers=len(self._threads), queued=self._jobs.qsize())
+
+    def _new_worker(self) -> _Worker:
+        return _Worker(self._context, self._initializer, self._cpu_seconds, self._memory_mb)
+
+    def _serve(self):
+        worker = self._new_worker()  # Started up front so the first job does not wait for the imports
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                if worker is not None:
+                    worker.stop()
+                return
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            if worker is None or not worker.process.is_alive():
+                worker = self._new_worker()
+
+            self._count('jobs')
+            deadline = time.monotonic() + self._timeout
+            try:
+                worker.conn.send((fn, args))
+                ready = worker.conn.poll(max(deadline - time.monotonic(), 0))
+                (kind, value), rss_kb = worker.conn.recv() if ready else (('limit', 'time'), 0)
+            except (EOFError, OSError):
+                kind, value, rss_kb = 'limit', 'crash', 0  # Killed by the kernel (or died some other way)
+
+            worker.jobs += 1
+            if kind == 'limit':
+                self._count('limits')
+                print(f"[PARSE SANDBOX][ERROR] {getattr(fn, '__name__', fn)} hit the {value} limit")
+                future.set_exception(ParseLimitError(value))
+            elif kind == 'error':
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+
+            if kind == 'limit':
+                # A job that hit a limit may have left the worker in a bad state
+                worker.stop(kill=value in ('time', 'crash'))
+                worker = None
+            elif worker.jobs >= self._max_jobs or rss_kb * 1024 > self._memory_mb * MB:
+                self._count('recycled')
+                worker.stop()
+                worker = None
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
@@ -0,0 +1,265 @@
+"""
+Native PDF renderer
+Turns the parsed section structure straight into styled ReportLab flowables,
+skipping the markdown -> HTML -> xhtml2pdf round trip. Each template layout
+mirrors its HTML counterpart (palette, typography, header and section style)
+and is described by the `pdf` block of the template's spec.
+"""
+import io
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from app.services.template_html_generator import extract_contact_info, parse_content_sections
+from app.services.template_registry import DEFAULT_TEMPLATE_ID
+from app.services.stylesheet import StyleOptions, resolve_sizes, style_options
+from app.services.template_specs import get_spec
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+
+_UNITS = {'pt': 1.0, 'px': 0.75, 'in': 72.0}
+_LENGTH = re.compile(r'^([\d.]+)([a-z]*)$')
+
+_BOLD = re.compile(r'\*\*(.+?)\*\*|__(.+?)__')
+_ITALIC = re.compile(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])|(?<![\w_])_(?!\s)(.+?)(?<!\s)_(?![\w_])')
+_CODE = re.compile(r'`([^`]+)`')
+_LINK = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+_BULLET = re.compile(r'^\s*[-*+]\s+')
+_NUMBERED = re.compile(r'^\s*(\d+)[.)]\s+')
+
+_ALIGNMENTS = {'left': TA_LEFT, 'center': TA_CENTER}
+
+
+def to_points(length: str) -> float:
+    """Convert a CSS length ('10pt', '15px', '0.5in') to points"""
+    match = _LENGTH.match(length.strip())
+    if not match:
+        return 0.0
+    return float(match.group(1)) * _UNITS.get(match.group(2) or 'px', 1.0)
+
+
+def inline_markup(text: str, link_color: str = '#2563eb', strong_color: Optional[str] = None) -> str:
+    """Convert inline markdown (bold, italic, code, links) to ReportLab paragraph markup"""
+    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    text = _CODE.sub(r'<font face="Courier">\1</font>', text)
+    text = _LINK.sub(lambda m: f'<link href="{m.group(2)}" color="{link_color}">{m.group(1)}</link>', text)
+    if strong_color:
+        text = _BOLD.sub(lambda m: f'<b><font color="{strong_color}">{m.group(1) or m.group(2)}</font></b>', text)
+    else:
+        text = _BOLD.sub(lambda m: f'<b>{m.group(1) or m.group(2)}</b>', text)
+    text = _ITALIC.sub(lambda m: f'<i>{m.group(1) or m.group(2)}</i>', text)
+    return text
+
+
+class _Styles:
+    """Paragraph styles for one layout at one set of sizes"""
+
+    def __init__(self, theme: Dict, options: StyleOptions):
+        fonts, spacing = resolve_sizes(options)
+        self.theme = theme
+        self.accent = options.accent_color
+        self.header_color = theme.get('name_color') or options.header_color
+        self.base = to_points(fonts['base'])
+        self.padding = to_points(spacing['padding'])
+        self.margin_section = to_points(spacing['margin_section'])
+        self.margin_item = to_points(spacing['margin_item'])
+
+        self.name = ParagraphStyle(
+            'Name', fontName=theme['name_font'], fontSize=to_points(fonts['name']),
+            leading=to_points(fonts['name']) * 1.2, textColor=colors.HexColor(self.header_color),
+            alignment=theme['name_align'], spaceAfter=4,
+        )
+        self.contact = ParagraphStyle(
+            'Contact', fontName=theme['font'], fontSize=self.base, leading=self.base * 1.35,
+            textColor=colors.HexColor(theme['muted']), alignment=theme['contact_align'],
+        )
+        self.title = ParagraphStyle(
+            'SectionTitle', fontName=theme['bold_font'], fontSize=to_points(fonts['section']),
+            leading=to_points(fonts['section']) * 1.3, textColor=colors.HexColor(self.accent), spaceAfter=4,
+        )
+        self.subheading = ParagraphStyle(
+            'Subheading', fontName=theme['bold_font'], fontSize=self.base * 1.1, leading=self.base * 1.45,
+            textColor=colors.HexColor(theme.get('strong') or '#1f2937'), spaceBefore=2, spaceAfter=self.margin_item,
+        )
+        self.text = ParagraphStyle(
+            'Text', fontName=theme['font'], fontSize=self.base, leading=self.base * 1.45,
+            textColor=colors.HexColor(theme['text']), spaceAfter=self.margin_item,
+        )
+        self.item = ParagraphStyle(
+            'Item', parent=self.text, textColor=colors.HexColor(theme['item']),
+            leftIndent=13.5, bulletIndent=2, bulletFontName=theme['bold_font'],
+            bulletColor=colors.HexColor(self.accent if theme['page_background'] else theme['item']),
+        )
+
+
+def _layout_for(template_id: str) -> Dict:
+    """The native theme of a template's spec, in the form the flowable builders use"""
+    return _theme(get_spec(template_id).id)
+
+
+@lru_cache(maxsize=None)
+def _theme(spec_id: str) -> Dict:
+    spec = get_spec(spec_id)
+    theme = dict(spec.pdf)
+    theme['name_align'] = _ALIGNMENTS[spec.pdf.name_align]
+    theme['contact_align'] = _ALIGNMENTS[spec.pdf.contact_align]
+    theme['bullet'] = spec.bullets.pdf
+    return theme
+
+
+def is_native_default(template_id: Optional[str]) -> bool:
+    """
+    Whether PDF_ENGINE=auto should use the native renderer for a template
+    Set per spec for layouts whose native output matches xhtml2pdf within the
+    tolerance of benchmarks/bench_pdf_engines.py ('tech' is not: xhtml2pdf
+    never paints its dark page background).
+    """
+    return get_spec(template_id).pdf.native_default
+
+
+def _header(contact: Dict, title: str, styles: _Styles) -> List:
+    theme = styles.theme
+    name = contact.get('name') or title or 'Your Name'
+    if theme['name_upper']:
+        name = name.upper()
+
+    parts = [inline_markup(contact[key]) for key in ('email', 'phone', 'location') if contact.get(key)]
+    if theme.get('show_linkedin') and contact.get('linkedin'):
+        parts.append('LinkedIn: ' + inline_markup(contact['linkedin'].replace('https://', '').replace('http://', '')))
+    separator = f' <font color="{theme["separator_color"]}">{theme["separator"]}</font> '
+
+    flowables = [Paragraph(inline_markup(name), styles.name)]
+    if parts:
+        flowables.append(Paragraph(separator.join(parts), styles.contact))
+
+    if theme.get('header_box'):
+        background, border = theme['header_box']
+        box = Table([[flowables]], colWidths=[PAGE_WIDTH - 2 * styles.padding])
+        box.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor(background)),
+            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor(border)),
+            ('ROUNDEDCORNERS', [6, 6, 6, 6]),
+            ('LEFTPADDING', (0, 0), (-1, -1), 11), ('RIGHTPADDING', (0, 0), (-1, -1), 11),
+            ('TOPPADDING', (0, 0), (-1, -1), 11), ('BOTTOMPADDING', (0, 0), (-1, -1), 11),
+        ]))
+        return [box, Spacer(1, styles.margin_section)]
+
+    if theme['header_rule']:
+        color, width = theme['header_rule']
+        flowables.append(Spacer(1, styles.margin_item))
+        flowables.append(HRFlowable(
+            width='100%', thickness=width, spaceAfter=0,
+            color=colors.HexColor(styles.accent if color == 'accent' else color)
+        ))
+    flowables.append(Spacer(1, styles.margin_section))
+    return flowables
+
+
+def _section_body(section: Dict, styles: _Styles) -> List:
+    strong = styles.theme.get('strong') if styles.theme['page_background'] else None
+    flowables = []
+    for item in section['content']:
+        text = item['text']
+        if item['type'] == 'subheading':
+            flowables.append(Paragraph(inline_markup(text, styles.accent), styles.subheading))
+            continue
+        bullet = _BULLET.match(text)
+        numbered = _NUMBERED.match(text)
+        if bullet:
+            flowables.append(Paragraph(
+                inline_markup(text[bullet.end():], styles.accent, strong), styles.item,
+                bulletText=styles.theme['bullet']
+            ))
+        elif numbered:
+            flowables.append(Paragraph(
+                inline_markup(text[numbered.end():], styles.accent, strong), styles.item,
+                bulletText=f'{numbered.group(1)}.'
+            ))
+        else:
+            flowables.append(Paragraph(inline_markup(text.strip(), styles.accent, strong), styles.text))
+    return flowables
+
+
+def _section(section: Dict, styles: _Styles) -> List:
+    theme = styles.theme
+    title = section['title'].upper() if theme['title_upper'] else section['title']
+    heading = [Paragraph(theme['title_prefix'] + inline_markup(title), styles.title)]
+    if theme['title_underline']:
+        color, width = theme['title_underline']
+        heading.append(HRFlowable(
+            width='100%', thickness=width, spaceBefore=0, spaceAfter=4,
+            color=colors.HexColor(styles.accent if color == 'accent' else color)
+        ))
+    if theme['title_rule']:
+        color, width = theme['title_rule']
+        heading.append(HRFlowable(width='100%', thickness=width, spaceAfter=styles.margin_item, color=colors.HexColor(color)))
+
+    body = _section_body(section, styles)
+
+    if theme.get('section_box'):
+        # One row per flowable so long sections can still split across pages
+        rows = [[flowable] for flowable in heading + body]
+        box = Table(rows, colWidths=[PAGE_WIDTH - 2 * styles.padding], splitByRow=1)
+        box.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor(theme['section_box'])),
+            ('LINEBEFORE', (0, 0), (0, -1), 3, colors.HexColor(styles.accent)),
+            ('LEFTPADDING', (0, 0), (-1, -1), 9), ('RIGHTPADDING', (0, 0), (-1, -1), 9),
+            ('TOPPADDING', (0, 0), (-1, -1), 1), ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+            ('TOPPADDING', (0, 0), (-1, 0), 9), ('BOTTOMPADDING', (0, -1), (-1, -1), 9),
+        ]))
+        return [box, Spacer(1, styles.margin_section)]
+
+    # Keep the title with the first entry, like page-break-inside: avoid on .section
+    for flowable in heading:
+        flowable.keepWithNext = 1
+    return heading + body + [Spacer(1, styles.margin_section)]
+
+
+def build_story(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                customization: Optional[Dict] = None, scale: Optional[float] = None,
+                sections: Optional[List[Dict]] = None, contact: Optional[Dict] = None) -> Tuple[List, _Styles]:
+    """Build the flowables for a resume. Pre-parsed sections/contact info can be passed in."""
+    template_id = (template or {}).get('id', DEFAULT_TEMPLATE_ID) if isinstance(template, dict) else DEFAULT_TEMPLATE_ID
+    styles = _Styles(_layout_for(template_id), style_options(template_id, customization, one_page=True, scale=scale))
+    contact = contact if contact is not None else extract_contact_info(content, personal_info)
+    sections = sections if sections is not None else parse_content_sections(content)
+
+    story = _header(contact, title, styles)
+    for section in sections:
+        story.extend(_section(section, styles))
+    return story, styles
+
+
+def render(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+           customization: Optional[Dict] = None, scale: Optional[float] = None,
+           sections: Optional[List[Dict]] = None, contact: Optional[Dict] = None) -> Tuple[int, bytes]:
+    """Render a resume with ReportLab, returning (page count, PDF bytes)"""
+    story, styles = build_story(content, title, template, personal_info, customization, scale, sections, contact)
+    background = styles.theme['page_background']
+
+    def paint_background(canvas, doc):
+        if background:
+            canvas.saveState()
+            canvas.setFillColor(colors.HexColor(background))
+            canvas.rect(0, 0, PAGE_WIDTH, PAGE_HEIGHT, stroke=0, fill=1)
+            canvas.restoreState()
+
+    out = io.BytesIO()
+    doc = SimpleDocTemplate(
+        out, pagesize=letter, title=title,
+        leftMargin=styles.padding, rightMargin=styles.padding,
+        topMargin=styles.padding, bottomMargin=styles.padding,
+    )
+    doc.build(story, onFirstPage=paint_background, onLaterPages=paint_background)
+    return doc.page, out.getvalue()
+
+
+def render_pdf(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+               customization: Optional[Dict] = None, scale: Optional[float] = None,
+               sections: Optional[List[Dict]] = None, contact: Optional[Dict] = None) -> bytes:
+    """Render a resume to PDF bytes with ReportLab"""
+    return render(content, title, template, personal_info, customization, scale, sections, contact)[1]
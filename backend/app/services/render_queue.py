@@ -0,0 +1,147 @@
+"""
+Background pre-rendering of exports after a resume is saved
+Saves enqueue a render of the new version into the artifact store, so the
+first download after a save is served from disk. Jobs are debounced per
+resume: a burst of autosaves only renders the version saved last.
+"""
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+from app.config import settings
+
+
+class RenderJob(NamedTuple):
+    resume_id: int
+    content: str
+    title: str
+    template: Optional[Dict]
+    personal_info: Optional[Dict]
+    customization: Optional[Dict]
+    saved_at: float  # When the version was saved (time.time())
+    due: float  # Monotonic time after which the job may run
+
+
+_pending: Dict[int, RenderJob] = {}
+_condition = threading.Condition()
+_thread: Optional[threading.Thread] = None
+_active: Optional[int] = None
+
+_stats = {
+    'enqueued': 0,
+    'superseded': 0,  # Jobs replaced by a newer save before they ran
+    'rendered': 0,
+    'failed': 0,
+    'last_lag_seconds': None,  # Save to artifact ready, for the last job
+    'max_lag_seconds': 0.0,
+    'total_lag_seconds': 0.0,
+}
+
+
+def prerender_formats() -> List[str]:
+    """Formats rendered after each save (PRERENDER_FORMATS, e.g. 'pdf' or 'pdf,docx')"""
+    return [f.strip() for f in settings.PRERENDER_FORMATS.split(',') if f.strip() in ('pdf', 'docx')]
+
+
+def enqueue_render(resume) -> bool:
+    """Schedule a pre-render of a saved resume; replaces any pending job for it"""
+    if not settings.PRERENDER_ENABLED or not prerender_formats():
+        return False
+
+    job = RenderJob(
+        resume_id=resume.id,
+        content=resume.content or '',
+        title=resume.title or '',
+        template=resume.template,
+        personal_info=resume.personal_info,
+        customization=resume.customization,
+        saved_at=time.time(),
+        due=time.monotonic() + settings.PRERENDER_DEBOUNCE_SECONDS,
+    )
+    with _condition:
+        if job.resume_id in _pending:
+            _stats['superseded'] += 1
+        _pending[job.resume_id] = job
+        _stats['enqueued'] += 1
+        _ensure_worker()
+        _condition.notify()
+    return True
+
+
+def _ensure_worker():
+    global _thread
+    if _thread is None or not _thread.is_alive():
+        _thread = threading.Thread(target=_worker, name='render-queue', daemon=True)
+        _thread.start()
+
+
+def _next_job() -> RenderJob:
+    """Block until a job is due and take it off the queue"""
+    global _active
+    with _condition:
+        while True:
+            now = time.monotonic()
+            due = [job for job in _pending.values() if job.due <= now]
+            if due:
+                job = min(due, key=lambda j: j.due)
+                del _pending[job.resume_id]
+                _active = job.resume_id
+                return job
+            timeout = min((job.due for job in _pending.values()), default=now + 60) - now
+            _condition.wait(timeout=max(timeout, 0.01))
+
+
+def _render(job: RenderJob):
+    from app.services.artifact_store import get_or_render
+
+    for export_format in prerender_formats():
+        get_or_render(job.content, job.title, template=job.template, personal_info=job.personal_info,
+                      customization=job.customization, export_format=export_format)
+
+
+def _worker():
+    global _active
+    while True:
+        job = _next_job()
+        try:
+            _render(job)
+        except Exception as e:
+            with _condition:
+                _stats['failed'] += 1
+            print(f"[PRERENDER][ERROR] Resume {job.resume_id}: {e}")
+        else:
+            lag = time.time() - job.saved_at
+            with _condition:
+                _stats['rendered'] += 1
+                _stats['last_lag_seconds'] = round(lag, 3)
+                _stats['max_lag_seconds'] = round(max(_stats['max_lag_seconds'], lag), 3)
+                _stats['total_lag_seconds'] += lag
+            print(f"[PRERENDER] Resume {job.resume_id} ready {lag:.2f}s after save")
+        finally:
+            with _condition:
+                _active = None
+
+
+def queue_stats() -> Dict:
+    """Queue depth, throughput and save-to-ready lag of the pre-renderer"""
+    with _condition:
+        stats = dict(_stats)
+        now = time.time()
+        stats['depth'] = len(_pending)
+        stats['busy'] = _active is not None  # Not which resume: /health/render-queue is public
+        stats['oldest_pending_seconds'] = round(max((now - job.saved_at for job in _pending.values()), default=0.0), 3)
+        total = stats.pop('total_lag_seconds')
+        stats['avg_lag_seconds'] = round(total / stats['rendered'], 3) if stats['rendered'] else None
+        stats['formats'] = prerender_formats()
+        stats['debounce_seconds'] = settings.PRERENDER_DEBOUNCE_SECONDS
+    return stats
+
+
+def wait_idle(timeout: float = 30.0) -> bool:
+    """Wait until nothing is pending or rendering (used by benchmarks and tests)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with _condition:
+            if not _pending and _active is None:
+                return True
+        time.sleep(0.05)
+    return False
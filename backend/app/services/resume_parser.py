@@ -1,108 +1,283 @@
 """
 Service for parsing uploaded resume files (PDF and DOCX)
 Converts them to markdown format for editing
+Parsers accept raw bytes or a binary file object (such as an upload's
+spooled temp file), which is read in place rather than copied.
 """
 import io
-from typing import Optional
-from docx import Document
+import re
+import time
+import zipfile
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple, Union
 import PyPDF2
 import pdfplumber
+from app.config import settings
+from app.services.ooxml_parser import docx_to_markdown
+from app.services.parse_pool import extract_pages, should_parallelize
 
+FileSource = Union[bytes, BinaryIO]
 
-def parse_docx(file_content: bytes) -> str:
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # Legacy .doc (and other MS Office binary files)
+PDF_HEADER_WINDOW = 1024  # The PDF header may follow some junk bytes
+
+# Fast-pass quality heuristic (see assess_page)
+MIN_PAGE_CHARS = 20  # Less text than this: empty or scanned page
+MAX_GARBLED_RATIO = 0.02  # Share of unmapped glyphs, control and private-use characters
+MAX_GLUED_RATIO = 0.1  # Share of words over 20 letters (spaces lost between words)
+COLUMN_MIN_RUN = 25  # Text runs at least this long count towards column detection
+COLUMN_SPLIT = 0.45  # Runs starting beyond this fraction of the page width are in a right column
+COLUMN_MIN_SHARE = 0.2  # Share of long runs in a right column that makes a page multi-column
+MAX_FAILED_PAGE_RATIO = 0.5  # Beyond this, the whole document goes to the layout extractor
+
+_CID = re.compile(r'\(cid:\d+\)')
+_GARBLED = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ufffd\ue000-\uf8ff]')
+_WORD = re.compile(r'[A-Za-z]+')
+# Bullet glyphs that extractors return unmapped or as symbols at the start of a line
+_BULLET_ARTIFACT = re.compile('^(?:\\(cid:127\\)|[\x7f\u2022\u25cf\u25aa\u2023\uf0b7])\\s*')
+
+
+class ParseResult(NamedTuple):
+    markdown: str
+    metadata: Dict  # Parser(s) used, pages re-extracted and why, timings
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _as_stream(source: FileSource) -> BinaryIO:
+    """A readable stream positioned at the start, without copying file objects"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def detect_file_type(source: FileSource) -> Optional[str]:
+    """Identify an upload from its content: 'pdf', 'docx', 'doc' or None"""
+    stream = _as_stream(source)
+    head = stream.read(PDF_HEADER_WINDOW)
+    stream.seek(0)
+    if head.startswith(ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        finally:
+            stream.seek(0)
+        return 'docx' if 'word/document.xml' in names else None
+    if head.startswith(OLE_MAGIC):
+        return 'doc'
+    if PDF_MAGIC in head:
+        return 'pdf'
+    return None
+
+
+def parse_docx(file_content: FileSource) -> str:
     """
     Parse DOCX file and convert to markdown
+    Streams word/document.xml (see ooxml_parser), keeping tables in document order
     """
     try:
-        doc = Document(io.BytesIO(file_content))
-        markdown_content = []
-        
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if not text:
-                continue
-                
-            # Check for heading styles
-            if para.style.name.startswith('Heading'):
-                level = para.style.name.replace('Heading', '').strip()
-                if level == '1':
-                    markdown_content.append(f"# {text}\n")
-                elif level == '2':
-                    markdown_content.append(f"## {text}\n")
-                elif level == '3':
-                    markdown_content.append(f"### {text}\n")
-                else:
-                    markdown_content.append(f"#### {text}\n")
-            else:
-                # Regular paragraph
-                markdown_content.append(f"{text}\n\n")
-        
-        # Parse tables
-        for table in doc.tables:
-            markdown_content.append("\n")  # Add spacing before table
-            for row in table.rows:
-                row_text = " | ".join([cell.text.strip() for cell in row.cells])
-                markdown_content.append(f"| {row_text} |\n")
-            markdown_content.append("\n")
-        
-        return "".join(markdown_content).strip()
-    
+        return docx_to_markdown(_as_stream(file_content))
     except Exception as e:
         raise ValueError(f"Failed to parse DOCX file: {str(e)}")
 
 
-def parse_pdf(file_content: bytes) -> str:
+def parse_pdf(file_content: FileSource) -> str:
     """
     Parse PDF file and convert to markdown
-    Tries pdfplumber first (better), falls back to PyPDF2
+    Adaptive by default (fast PyPDF2 pass, pdfplumber only where it falls short);
+    with PDF_PARSE_MODE=layout, tries pdfplumber first and falls back to PyPDF2
     """
+    if settings.PDF_PARSE_MODE == 'adaptive':
+        return parse_pdf_adaptive(file_content).markdown
+    return _parse_pdf_layout(file_content)[0]
+
+
+def _parse_pdf_layout(file_content: FileSource) -> Tuple[str, str]:
+    """(markdown, parser used): pdfplumber, or PyPDF2 when pdfplumber fails"""
     try:
         # Try pdfplumber first (better for formatting)
-        return parse_pdf_pdfplumber(file_content)
+        return parse_pdf_pdfplumber(file_content), 'pdfplumber'
     except Exception:
         # Fallback to PyPDF2
         try:
-            return parse_pdf_pypdf2(file_content)
+            return parse_pdf_pypdf2(file_content), 'pypdf2'
         except Exception as e:
             raise ValueError(f"Failed to parse PDF file: {str(e)}")
 
 
-def parse_pdf_pdfplumber(file_content: bytes) -> str:
-    """Parse PDF using pdfplumber (better formatting)"""
+def _normalize_bullet(line: str) -> str:
+    return _BULLET_ARTIFACT.sub('- ', line)
+
+
+def _page_markdown(text: str) -> List[str]:
+    """Clean up the text of one page and mark likely headers"""
+    cleaned_lines = []
+    for line in text.split('\n'):
+        line = _normalize_bullet(line.strip())
+        if not line:
+            continue
+        
+        # Detect potential headers (all caps, short lines, bold-like formatting)
+        if len(line) < 50 and line.isupper():
+            cleaned_lines.append(f"## {line.title()}\n")
+        elif len(line) < 80 and not any(c.islower() for c in line):
+            cleaned_lines.append(f"### {line}\n")
+        else:
+            cleaned_lines.append(f"{line}\n")
+    return cleaned_lines
+
+
+def _pages_markdown(page_texts: List[Optional[str]]) -> str:
     markdown_content = []
-    
-    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if text:
-                # Clean up the text
-                lines = text.split('\n')
-                cleaned_lines = []
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Detect potential headers (all caps, short lines, bold-like formatting)
-                    if len(line) < 50 and line.isupper():
-                        cleaned_lines.append(f"## {line.title()}\n")
-                    elif len(line) < 80 and not any(c.islower() for c in line):
-                        cleaned_lines.append(f"### {line}\n")
-                    else:
-                        cleaned_lines.append(f"{line}\n")
-                
-                markdown_content.extend(cleaned_lines)
-                markdown_content.append("\n")
+    for text in page_texts:
+        if text:
+            markdown_content.extend(_page_markdown(text))
+            markdown_content.append("\n")
     
     result = "\n".join(markdown_content).strip()
     return result if result else ""
 
 
-def parse_pdf_pypdf2(file_content: bytes) -> str:
+def _pdfplumber_page_texts(stream: BinaryIO, pages: Optional[List[int]] = None) -> List[Optional[str]]:
+    """
+    Text of the given pages (0-based; all pages by default) with pdfplumber
+    Long documents are extracted page range by page range in worker processes
+    """
+    page_texts = None
+    with pdfplumber.open(stream) as pdf:
+        page_count = len(pdf.pages)
+        if pages is not None or not should_parallelize(page_count):
+            page_texts = []
+            for index in (range(page_count) if pages is None else pages):
+                page = pdf.pages[index]
+                page_texts.append(page.extract_text())
+                page.flush_cache()
+    if page_texts is None:
+        page_texts = extract_pages(stream, page_count)
+    return page_texts
+
+
+def parse_pdf_pdfplumber(file_content: FileSource) -> str:
+    """Parse PDF using pdfplumber (better formatting)"""
+    return _pages_markdown(_pdfplumber_page_texts(_as_stream(file_content)))
+
+
+def _pypdf2_pages(stream: BinaryIO) -> List[Tuple[str, List[Tuple[float, int]], float]]:
+    """Fast pass: (text, [(x, length) of each text run], page width) per page"""
+    pages = []
+    for page in PyPDF2.PdfReader(stream).pages:
+        runs = []
+
+        def visit(text, cm, tm, font_dict, font_size):
+            stripped = text.strip()
+            if stripped:
+                runs.append((tm[4] * cm[0] + tm[5] * cm[2] + cm[4], len(stripped)))
+
+        text = page.extract_text(visitor_text=visit) or ''
+        pages.append((text, runs, float(page.mediabox.width)))
+    return pages
+
+
+def assess_page(text: str, runs: List[Tuple[float, int]], page_width: float) -> Optional[str]:
+    """
+    Why a fast-pass page needs the layout extractor, or None if its text is usable:
+    'empty' (scanned or no text layer), 'garbled' (unmapped glyphs),
+    'glued' (spaces lost between words) or 'columns' (several text columns,
+    which the fast pass reads line by line across)
+    """
+    text = '\n'.join(_normalize_bullet(line.strip()) for line in text.split('\n'))
+    visible = len(text) - text.count(' ') - text.count('\n')
+    if visible < MIN_PAGE_CHARS:
+        return 'empty'
+
+    garbled = len(_GARBLED.findall(text)) + sum(len(cid) for cid in _CID.findall(text))
+    if garbled / visible > MAX_GARBLED_RATIO:
+        return 'garbled'
+
+    words = _WORD.findall(text)
+    if words and sum(1 for word in words if len(word) > 20) / len(words) > MAX_GLUED_RATIO:
+        return 'glued'
+
+    long_runs = [x for x, length in runs if length >= COLUMN_MIN_RUN]
+    if long_runs and page_width > 0:
+        right = sum(1 for x in long_runs if x > page_width * COLUMN_SPLIT)
+        if right / len(long_runs) >= COLUMN_MIN_SHARE:
+            return 'columns'
+    return None
+
+
+def parse_pdf_adaptive(file_content: FileSource) -> ParseResult:
+    """
+    Parse a PDF with a fast PyPDF2 pass, re-extracting with pdfplumber only the
+    pages that fail assess_page (or the whole document when most pages fail)
+    """
+    stream = _as_stream(file_content)
+    timings = {}
+    start = time.perf_counter()
+    try:
+        fast_pages = _pypdf2_pages(stream)
+    except Exception as e:
+        print(f"[PARSER] Fast pass failed ({e}), using the layout extractor")
+        fast_pages = None
+    timings['fast_pass'] = _ms(start)
+
+    failed = {}
+    page_texts = None
+    if fast_pages is not None:
+        for index, (text, runs, width) in enumerate(fast_pages):
+            reason = assess_page(text, runs, width)
+            if reason:
+                failed[index] = reason
+        page_texts = [text for text, _, _ in fast_pages]
+    whole_document = page_texts is None or len(failed) > len(page_texts) * MAX_FAILED_PAGE_RATIO
+    if failed or whole_document:
+        start = time.perf_counter()
+        try:
+            if whole_document:
+                page_texts = _pdfplumber_page_texts(_as_stream(stream))
+            else:
+                pages = sorted(failed)
+                for index, text in zip(pages, _pdfplumber_page_texts(_as_stream(stream), pages)):
+                    page_texts[index] = text
+        except Exception as e:
+            if page_texts is None:
+                raise ValueError(f"Failed to parse PDF file: {str(e)}")
+            print(f"[PARSER][ERROR] Layout extractor failed ({e}), keeping the fast pass text")
+            failed = {}
+        timings['layout_pass'] = _ms(start)
+
+    if whole_document:
+        parser = 'pdfplumber'
+    elif failed:
+        parser = 'pypdf2+pdfplumber'
+    else:
+        parser = 'pypdf2'
+    start = time.perf_counter()
+    markdown = _pages_markdown(page_texts)
+    timings['markdown'] = _ms(start)
+
+    metadata = {
+        'file_type': 'pdf',
+        'parser': parser,
+        'pages': len(page_texts),
+        'layout_pages': list(range(1, len(page_texts) + 1)) if whole_document else [index + 1 for index in sorted(failed)],
+        'reasons': {str(index + 1): reason for index, reason in sorted(failed.items())},
+        'timings_ms': timings,
+    }
+    print(f"[PARSER] PDF: {parser}, {len(page_texts)} pages, {len(metadata['layout_pages'])} via layout extractor")
+    return ParseResult(markdown, metadata)
+
+
+def parse_pdf_pypdf2(file_content: FileSource) -> str:
     """Parse PDF using PyPDF2 (fallback)"""
     markdown_content = []
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    pdf_reader = PyPDF2.PdfReader(_as_stream(file_content))
     
     for page_num, page in enumerate(pdf_reader.pages):
         text = page.extract_text()
@@ -119,7 +294,22 @@ def parse_pdf_pypdf2(file_content: bytes) -> str:
     return result if result else ""
 
 
-def parse_resume_file(file_content: bytes, file_extension: str) -> str:
+def parse_upload(file_content: FileSource, file_type: str) -> ParseResult:
+    """Parse a 'pdf' or 'docx' file into markdown plus metadata on how it was parsed"""
+    if file_type == 'pdf':
+        if settings.PDF_PARSE_MODE == 'adaptive':
+            return parse_pdf_adaptive(file_content)
+        start = time.perf_counter()
+        markdown, parser = _parse_pdf_layout(file_content)
+        return ParseResult(markdown, {'file_type': 'pdf', 'parser': parser, 'timings_ms': {'total': _ms(start)}})
+    if file_type == 'docx':
+        start = time.perf_counter()
+        markdown = parse_docx(file_content)
+        return ParseResult(markdown, {'file_type': 'docx', 'parser': 'ooxml', 'timings_ms': {'total': _ms(start)}})
+    return ParseResult(parse_resume_file(file_content, file_type), {'file_type': file_type})
+
+
+def parse_resume_file(file_content: FileSource, file_extension: str) -> str:
     """
     Main parsing function - routes to appropriate parser based on file type
     """
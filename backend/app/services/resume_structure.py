@@ -0,0 +1,410 @@
+"""
+Structured resume data from markdown and back, without an LLM
+extract_resume_data turns parsed uploads (or saved resume markdown) into
+ResumeData with a confidence score per field, using compiled patterns and
+section-aware rules; resume_markdown formats ResumeData as a resume, for
+users who only want re-formatting.
+"""
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.schemas import ResumeData
+
+SECTION_ALIASES = {
+    'summary': ('summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about', 'about me'),
+    'experience': ('experience', 'professional experience', 'work experience', 'employment',
+                   'employment history', 'work history', 'career history', 'relevant experience'),
+    'education': ('education', 'academic background', 'education and training'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'key skills', 'competencies',
+               'skills and tools', 'technologies'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses and certifications',
+                       'certifications and licenses'),
+    'languages': ('languages',),
+}
+_SECTIONS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+_MONTH = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+          r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?')
+_DATE = rf'(?:{_MONTH}\s+\d{{4}}|\d{{1,2}}/\d{{4}}|(?:19|20)\d{{2}})'
+
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE = re.compile(r'\+?\(?\d[\d\s().-]{6,}\d')
+LINKEDIN = re.compile(r'(?:https?://)?(?:[\w-]+\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?', re.IGNORECASE)
+URL = re.compile(r'(?:https?://|www\.)[^\s|,;()]+|\b(?:github|gitlab)\.com/[\w.-]+', re.IGNORECASE)
+DATE_RANGE = re.compile(rf'(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)',
+                        re.IGNORECASE)
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+GPA = re.compile(r'\bGPA\b\s*:?\s*(\d(?:\.\d{1,2})?(?:\s*/\s*\d(?:\.\d)?)?)', re.IGNORECASE)
+DEGREE = re.compile(r"\b(?:[Bb]achelor|[Mm]aster|[Dd]octor(?:ate)?|[Aa]ssociate(?:'s)? [Dd]egree|[Dd]iploma"
+                    r"|[BM]\.?Sc\.?|BS|BA|MS|MA|MBA|PhD|Ph\.D\.?|B\.S\.|B\.A\.|M\.S\.|M\.A\.|B\.?Tech|M\.?Tech"
+                    r"|B\.E\.|M\.E\.|A\.A\.|A\.S\.)(?![\w])")
+INSTITUTION = re.compile(r'\b(?:university|college|institute|school|academy|polytechnic|universit[äa]t'
+                         r'|hochschule|conservatory)\b|\b(?-i:TU|ETH|MIT|UCLA)\b', re.IGNORECASE)
+JOB_TITLE = re.compile(r'\b(?:engineer|developer|manager|director|analyst|designer|consultant|lead|intern'
+                       r'|architect|scientist|specialist|coordinator|administrator|officer|assistant'
+                       r'|head|vp|president|founder|owner|teacher|nurse|accountant|technician'
+                       r'|representative|executive|programmer|researcher|editor|writer|associate)s?\b',
+                       re.IGNORECASE)
+LOCATION = re.compile(r"^[A-Z][\w.' -]+,\s*[A-Z][\w.' -]+$")
+LABEL = re.compile(r'^(email|e-mail|phone|mobile|tel|location|address|linkedin|website|portfolio|github)\s*:\s*',
+                   re.IGNORECASE)
+NAME = re.compile(r"^[A-Z][\w.'-]*(?:\s+[A-Z][\w.'-]*){1,3}$")
+
+_EMPHASIS = re.compile(r'\*\*|__|(?<!\w)[*_](?=\w)|(?<=\w)[*_](?!\w)')
+_BULLET = re.compile(r'^(?:[-*•▪●◦]|\d{1,2}[.)])\s+')
+_HEADING = re.compile(r'^(#{1,6})\s+')
+_SEGMENT_SPLIT = re.compile(r'\s+[|•·]\s+|\s+\|\s*|\s*\|\s+')
+_PART_SPLIT = re.compile(r'\s+(?:-|–|—|\||@|at)\s+|,\s+')
+_SKILL_SPLIT = re.compile(r'\s*[,;|•·]\s*')
+_SKILL_LABEL = re.compile(r'^[\w /&+-]{2,30}:\s*')
+_LANGUAGE = re.compile(r'^(?P<language>[^(:–—-]+?)\s*(?:[(:–—-]\s*(?P<level>[^)]+?)\)?)?$')
+
+
+class Line(NamedTuple):
+    text: str  # Without markdown markers
+    heading: int  # Markdown heading level, 0 for none
+    bullet: bool
+    bold: bool  # The whole line was bold (a heading in disguise)
+
+
+class Extraction(NamedTuple):
+    resume_data: ResumeData
+    confidence: Dict  # Per field (lists per entry), each 0-1
+    overall: float
+
+
+def _line(raw: str) -> Line:
+    text = raw.strip()
+    heading = 0
+    match = _HEADING.match(text)
+    if match:
+        heading = len(match.group(1))
+        text = text[match.end():]
+    bullet = bool(_BULLET.match(text))
+    if bullet:
+        text = _BULLET.sub('', text, count=1)
+    bold = text.startswith('**') and text.endswith('**') and text.count('**') == 2
+    text = _EMPHASIS.sub('', text).strip()
+    return Line(text, heading, bullet, bold)
+
+
+def _section_of(line: Line) -> Optional[str]:
+    """The section a line opens, 'other' for an unknown heading, or None"""
+    key = line.text.lower().rstrip(':').replace('&', 'and').strip()
+    key = re.sub(r'\s+', ' ', key)
+    if key in _SECTIONS and len(line.text) <= 40:
+        return _SECTIONS[key]
+    if line.heading and line.heading <= 2 and not line.bullet:
+        return 'other'
+    return None
+
+
+def split_sections(markdown: str) -> Tuple[List[Line], Dict[str, List[Line]], bool]:
+    """(header lines, lines per section, whether the header had a '#' name heading)"""
+    header: List[Line] = []
+    sections: Dict[str, List[Line]] = {}
+    current = None
+    has_title = False
+    for raw in markdown.splitlines():
+        if not raw.strip():
+            continue
+        line = _line(raw)
+        if not line.text:
+            continue
+        section = _section_of(line)
+        if section == 'other' and current is None and line.heading == 1:
+            section = None  # '# Name' opens the document, not a section
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif current:
+            sections[current].append(line)
+        else:
+            has_title = has_title or line.heading == 1
+            header.append(line)
+    return header, sections, has_title
+
+
+def _contact(header: List[Line], has_title: bool, search: List[Line]) -> Tuple[Dict[str, str], Dict[str, float]]:
+    info = {'name': '', 'email': '', 'phone': '', 'location': '', 'linkedin': '', 'portfolio': ''}
+    confidence = dict.fromkeys(info, 0.0)
+
+    for line in search:
+        text = line.text
+        if not info['email'] and EMAIL.search(text):
+            info['email'], confidence['email'] = EMAIL.search(text).group(0), 1.0
+        if not info['linkedin'] and LINKEDIN.search(text):
+            info['linkedin'], confidence['linkedin'] = LINKEDIN.search(text).group(0), 1.0
+        if not info['portfolio']:
+            for url in URL.findall(text):
+                if 'linkedin.com' not in url.lower():
+                    info['portfolio'], confidence['portfolio'] = url.rstrip('/.'), 0.9
+                    break
+        if not info['phone']:
+            for candidate in PHONE.findall(LINKEDIN.sub('', URL.sub('', text))):
+                digits = sum(c.isdigit() for c in candidate)
+                if 9 <= digits <= 15 and not DATE_RANGE.search(candidate):
+                    info['phone'], confidence['phone'] = candidate.strip(), 0.9
+                    break
+
+    for line in header:
+        for segment in _SEGMENT_SPLIT.split(line.text):
+            segment = segment.strip()
+            label = LABEL.match(segment)
+            value = segment[label.end():].strip() if label else segment
+            if not value:
+                continue
+            if label and label.group(1).lower() in ('location', 'address') and not info['location']:
+                info['location'], confidence['location'] = value, 0.9
+            elif (not label and not info['location'] and LOCATION.match(value)
+                  and not any(c.isdigit() for c in value)):
+                info['location'], confidence['location'] = value, 0.6
+
+    for line in header:
+        text = line.text
+        if EMAIL.search(text) or URL.search(text) or any(c.isdigit() for c in text):
+            continue
+        if NAME.match(text) and _section_of(line) in (None, 'other'):
+            info['name'] = text.title() if text.isupper() else text
+            confidence['name'] = 0.95 if line.heading == 1 else 0.8 if (has_title or line.bold) else 0.6
+            break
+    return info, confidence
+
+
+def _blocks(lines: List[Line], anchor: Optional[re.Pattern] = None) -> List[Tuple[List[Line], List[Line]]]:
+    """
+    Group section lines into entries: (header lines, detail lines)
+    A line matching anchor always opens a new entry once the current one has its own match.
+    """
+    blocks = []
+    for line in lines:
+        if anchor and blocks and anchor.search(line.text) and any(
+                anchor.search(seen.text) for seen in blocks[-1][0] + blocks[-1][1]):
+            blocks.append(([line], []))
+            continue
+        starts_entry = line.heading or line.bold or DATE_RANGE.search(line.text) and not line.bullet
+        if not blocks or (not line.bullet and (starts_entry or blocks[-1][1])):
+            if blocks and not blocks[-1][1] and not line.heading and not line.bold and len(blocks[-1][0]) < 3:
+                blocks[-1][0].append(line)  # Second header line, e.g. "Company | 2019 - 2021"
+                continue
+            blocks.append(([line], []))
+        elif line.bullet or len(line.text) > 80:
+            blocks[-1][1].append(line)
+        else:
+            blocks[-1][0].append(line)
+    return blocks
+
+
+def _parts(text: str) -> List[str]:
+    text = re.sub(r'[()\[\]]', ' ', text)
+    return [part.strip(' ,|-–—') for part in _PART_SPLIT.split(text) if part.strip(' ,|-–—')]
+
+
+def _dates(header: List[Line]) -> Tuple[str, str, str]:
+    """(start, end, header text without the date range)"""
+    text = ' | '.join(line.text for line in header)
+    match = DATE_RANGE.search(text)
+    if match:
+        end = match.group('end')
+        end = 'Present' if end.lower() in ('present', 'current', 'now', 'today') else end
+        return match.group('start'), end, text[:match.start()] + text[match.end():]
+    return '', '', text
+
+
+def _experience(lines: List[Line]) -> Tuple[List[Dict], List[float]]:
+    entries, scores = [], []
+    for header, details in _blocks(lines):
+        start, end, rest = _dates(header)
+        title = company = ''
+        at = re.search(r'^(?P<title>.+?)\s+(?:at|@)\s+(?P<company>.+)$', rest.split(' | ')[0])
+        if at:
+            title, company = at.group('title'), at.group('company')
+        else:
+            parts = _parts(rest)
+            if parts:
+                title = parts[0]
+                company = parts[1] if len(parts) > 1 else ''
+                if company and JOB_TITLE.search(company) and not JOB_TITLE.search(title):
+                    title, company = company, title
+        description = '\n'.join(line.text for line in details)
+        if not (title or company or description):
+            continue
+        entries.append({'title': title.strip(), 'company': company.strip(), 'start_date': start,
+                        'end_date': end, 'description': description})
+        score = 0.3 + 0.25 * bool(title) + 0.2 * bool(company) + 0.25 * bool(start)
+        if title and not JOB_TITLE.search(title):
+            score -= 0.15
+        scores.append(round(score, 2))
+    return entries, scores
+
+
+def _education(lines: List[Line]) -> Tuple[List[Dict], List[float]]:
+    entries, scores = [], []
+    for header, details in _blocks(lines, DEGREE):
+        start, end, rest = _dates(header)
+        text = ' | '.join([rest] + [line.text for line in details])
+        gpa = GPA.search(text)
+        years = YEAR.findall(text if not end else end)
+        year = end if end and not years else (years[-1] if years else '')
+        parts = _parts(YEAR.sub('', GPA.sub('', rest)))
+        degree = next((part for part in parts if DEGREE.search(part)), '')
+        institution = next((part for part in parts if INSTITUTION.search(part) and part != degree), '')
+        if not institution:
+            institution = next((part for part in parts if part != degree), '')
+        if not degree and institution:
+            degree = next((part for part in parts if part != institution), '')
+        if not (degree or institution):
+            continue
+        entries.append({'degree': degree, 'institution': institution, 'year': year,
+                        'gpa': gpa.group(1).replace(' ', '') if gpa else ''})
+        score = 0.3 + 0.3 * bool(DEGREE.search(degree)) + 0.25 * bool(INSTITUTION.search(institution)) + 0.15 * bool(year)
+        scores.append(round(score, 2))
+    return entries, scores
+
+
+def _skills(lines: List[Line]) -> List[str]:
+    skills, seen = [], set()
+    for line in lines:
+        text = _SKILL_LABEL.sub('', line.text)
+        for skill in _SKILL_SPLIT.split(text):
+            skill = skill.strip(' .')
+            if not skill or len(skill) > 40 or EMAIL.search(skill) or URL.search(skill):
+                continue
+            if skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    return skills
+
+
+def _certifications(lines: List[Line]) -> List[Dict]:
+    certifications = []
+    for line in lines:
+        years = YEAR.findall(line.text)
+        name = YEAR.sub('', line.text).strip(' ,-–—()|') if years else line.text
+        certifications.append({'name': name, 'date': years[-1] if years else ''})
+    return certifications
+
+
+def _languages(lines: List[Line]) -> List[Dict]:
+    languages = []
+    for line in lines:
+        for item in re.split(r'\s*[,;|•·]\s*', line.text):
+            match = _LANGUAGE.match(item.strip())
+            if match and match.group('language'):
+                languages.append({'language': match.group('language').strip(),
+                                  'proficiency': (match.group('level') or '').strip()})
+    return languages
+
+
+def extract_resume_data(markdown: str) -> Extraction:
+    """Structured data (with per-field confidence) from resume markdown"""
+    header, sections, has_title = split_sections(markdown)
+    # Contact details are looked for in the header first, then anywhere near the top
+    search = header + [line for lines in sections.values() for line in lines][:20]
+    personal_info, contact_confidence = _contact(header, has_title, search)
+
+    summary_lines = sections.get('summary', [])
+    summary = ' '.join(line.text for line in summary_lines)
+    experience, experience_scores = _experience(sections.get('experience', []))
+    education, education_scores = _education(sections.get('education', []))
+    skills = _skills(sections.get('skills', []))
+    certifications = _certifications(sections.get('certifications', []))
+    languages = _languages(sections.get('languages', []))
+
+    confidence = {
+        'personal_info': contact_confidence,
+        'summary': 0.9 if summary else 0.0,
+        'experience': experience_scores,
+        'education': education_scores,
+        'skills': (0.9 if len(skills) > 1 else 0.6) if skills else 0.0,
+    }
+    # Overall: how much of a pre-filled builder the user can trust as is
+    weighted = [
+        (contact_confidence['name'], 2), (contact_confidence['email'], 2), (contact_confidence['phone'], 1),
+        (sum(experience_scores) / len(experience_scores) if experience_scores else 0.0, 3),
+        (sum(education_scores) / len(education_scores) if education_scores else 0.0, 2),
+        (confidence['skills'], 2), (confidence['summary'], 1),
+    ]
+    overall = round(sum(score * weight for score, weight in weighted) / sum(weight for _, weight in weighted), 2)
+
+    resume_data = ResumeData(
+        personal_info=personal_info,
+        summary=summary or None,
+        education=education,
+        experience=experience,
+        skills=skills,
+        certifications=certifications or None,
+        languages=languages or None,
+    )
+    return Extraction(resume_data, confidence, overall)
+
+
+def _text(entry: Dict, key: str) -> str:
+    """A field of user-supplied resume data as stripped text, whatever type it was sent as"""
+    value = entry.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def resume_markdown(resume_data: ResumeData) -> str:
+    """Format ResumeData as resume markdown (the layout the AI prompt asks for), without an LLM"""
+    info = resume_data.personal_info or {}
+    parts = [f"# {_text(info, 'name') or 'Resume'}\n"]
+    contact = [_text(info, key) for key in ('email', 'phone', 'location', 'linkedin', 'portfolio')]
+    if any(contact):
+        parts.append(' | '.join(value for value in contact if value) + "\n")
+
+    if resume_data.summary and resume_data.summary.strip():
+        parts.append(f"## Professional Summary\n\n{resume_data.summary.strip()}\n")
+
+    experience = [exp for exp in resume_data.experience if _text(exp, 'title') or _text(exp, 'company')]
+    if experience:
+        lines = ["## Professional Experience\n"]
+        for exp in experience:
+            heading = ' - '.join(value for value in (_text(exp, 'title'), _text(exp, 'company')) if value)
+            start = _text(exp, 'start_date')
+            end = _text(exp, 'end_date') or ('Present' if start else '')
+            if start or end:
+                heading += f" ({' - '.join(value for value in (start, end) if value)})"
+            lines.append(f"### {heading}")
+            for detail in _text(exp, 'description').splitlines():
+                detail = _BULLET.sub('', detail.strip())
+                if detail:
+                    lines.append(f"- {detail}")
+            lines.append('')
+        parts.append('\n'.join(lines))
+
+    education = [edu for edu in resume_data.education if _text(edu, 'degree') or _text(edu, 'institution')]
+    if education:
+        lines = ["## Education\n"]
+        for edu in education:
+            line = f"- **{_text(edu, 'degree')}**, {_text(edu, 'institution')}"
+            if _text(edu, 'year'):
+                line += f" ({_text(edu, 'year')})"
+            if _text(edu, 'gpa'):
+                line += f" - GPA: {_text(edu, 'gpa')}"
+            lines.append(line)
+        parts.append('\n'.join(lines) + '\n')
+
+    if resume_data.skills:
+        parts.append(f"## Skills\n\n{', '.join(resume_data.skills)}\n")
+
+    if resume_data.certifications:
+        lines = ["## Certifications\n"]
+        for cert in resume_data.certifications:
+            name = _text(cert, 'name')
+            if name:
+                date = _text(cert, 'date')
+                lines.append(f"- {name}" + (f" ({date})" if date else ''))
+        parts.append('\n'.join(lines) + '\n')
+
+    if resume_data.languages:
+        items = []
+        for language in resume_data.languages:
+            name = _text(language, 'language')
+            if name:
+                level = _text(language, 'proficiency')
+                items.append(f"{name} ({level})" if level else name)
+        if items:
+            parts.append(f"## Languages\n\n{', '.join(items)}\n")
+
+    return '\n'.join(parts).strip() + '\n'
@@ -0,0 +1,228 @@
+"""
+Stylesheet generation for resume templates
+The CSS of a render depends only on the template and its customization, so
+each distinct combination is built, minified and interned once and reused
+"""
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+from app.config import settings
+from app.services.template_registry import DEFAULT_TEMPLATE_ID, get_stylesheet_template
+from app.services.template_specs import get_spec
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_WHITESPACE = re.compile(r'\s+')
+_AROUND_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_AFTER_COLON = re.compile(r':\s+')
+_LENGTH = re.compile(r'^([\d.]+)([a-z%]*)$')
+
+# At-rules that xhtml2pdf applies to the document while parsing them; they
+# are re-parsed for every PDF, everything else is parsed once and shared
+_SIDE_EFFECT_AT_RULES = re.compile(r'@(page|font-face|frame|import)\b', re.I)
+
+
+class StyleOptions(NamedTuple):
+    """Everything the generated CSS depends on"""
+    template_id: str
+    font_size: Optional[str]
+    spacing: Optional[str]
+    header_color: str
+    accent_color: str
+    bold_sections: bool
+    two_column: bool
+    custom_css: str
+    one_page: bool
+    scale: Optional[float] = None
+
+
+def style_options(template_id: Optional[str], customization: Optional[Dict] = None, one_page: bool = True,
+                  scale: Optional[float] = None) -> StyleOptions:
+    """
+    Normalize a customization dict so equivalent customizations share one stylesheet.
+    `scale` (set by the one-page fit engine) shrinks the chosen font sizes and spacing.
+    """
+    template_id = template_id or DEFAULT_TEMPLATE_ID
+    custom = customization or {}
+    spec = get_spec(template_id)
+
+    font_size = custom.get('font_size')
+    spacing = custom.get('spacing')
+    if one_page and scale is None:
+        # The fixed one-page constraint overrides font size and spacing
+        font_size = spacing = None
+    else:
+        font_size = font_size if font_size in spec.typography.font_sizes else 'medium'
+        spacing = spacing if spacing in spec.typography.spacing else 'normal'
+
+    return StyleOptions(
+        template_id=template_id,
+        font_size=font_size,
+        spacing=spacing,
+        header_color=custom.get('header_color') or spec.palette.header,
+        accent_color=custom.get('accent_color') or spec.palette.accent,
+        bold_sections=bool(custom.get('bold_sections')),
+        two_column=bool(custom.get('two_column')),
+        custom_css=custom.get('custom_css') or '',
+        one_page=bool(one_page),
+        scale=round(scale, 2) if scale is not None else None,
+    )
+
+
+def scale_length(value: str, scale: float) -> str:
+    """Scale a CSS length such as '10pt' or '0.5in'"""
+    match = _LENGTH.match(value)
+    if not match:
+        return value
+    return f"{round(float(match.group(1)) * scale, 2):g}{match.group(2)}"
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = _COMMENT.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    css = _AROUND_PUNCTUATION.sub(r'\1', css)
+    css = _AFTER_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+
+def resolve_sizes(options: StyleOptions) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Font sizes and spacing (as CSS lengths) for a set of options"""
+    typography = get_spec(options.template_id).typography
+    if options.scale is not None:
+        fonts = {k: scale_length(v, options.scale) for k, v in typography.font_sizes[options.font_size]}
+        spacing = {k: scale_length(v, options.scale) for k, v in typography.spacing[options.spacing]}
+        return fonts, spacing
+    if options.one_page:
+        return dict(typography.one_page_fonts), dict(typography.one_page_spacing)
+    return dict(typography.font_sizes[options.font_size]), dict(typography.spacing[options.spacing])
+
+
+@lru_cache(maxsize=settings.STYLESHEET_CACHE_SIZE)
+def build_stylesheet(options: StyleOptions) -> str:
+    """Render, minify and intern the stylesheet for one set of options"""
+    fonts, spacing = resolve_sizes(options)
+    css = get_stylesheet_template(options.template_id).render(
+        fonts=fonts,
+        spacing=spacing,
+        header_color=options.header_color,
+        accent_color=options.accent_color,
+        section_font_weight='700' if options.bold_sections else '600',
+        column_style='display: grid; grid-template-columns: 2fr 1fr; gap: 20px;' if options.two_column else '',
+        custom_css=options.custom_css,
+    )
+    return sys.intern(minify_css(css))
+
+
+def get_stylesheet(template_id: Optional[str], customization: Optional[Dict] = None, one_page: bool = True) -> str:
+    """Get the (cached) stylesheet for a template and customization"""
+    return build_stylesheet(style_options(template_id, customization, one_page))
+
+
+# ===================== Shared CSS for xhtml2pdf =====================
+
+_parsed_css: "OrderedDict[str, Tuple]" = OrderedDict()
+_parsed_css_lock = threading.Lock()
+_shared_css_enabled = False
+
+
+def _split_side_effect_rules(css: str) -> Tuple[str, str]:
+    """Split CSS text into (side-effect at-rules, plain rules)"""
+    if not _SIDE_EFFECT_AT_RULES.search(css):
+        return '', css
+
+    side_effects, plain = [], []
+    pos = 0
+    for match in _SIDE_EFFECT_AT_RULES.finditer(css):
+        start = match.start()
+        if start < pos:
+            continue  # Nested inside a rule we already extracted (e.g. @frame in @page)
+        plain.append(css[pos:start])
+        brace = css.find('{', start)
+        semicolon = css.find(';', start)
+        if brace == -1 or (semicolon != -1 and semicolon < brace):
+            # Block-less rule such as @import url(...);
+            end = len(css) if semicolon == -1 else semicolon + 1
+        else:
+            depth, end = 0, len(css)
+            for i in range(brace, len(css)):
+                if css[i] == '{':
+                    depth += 1
+                elif css[i] == '}':
+                    depth -= 1
+                    if depth == 0:
+                        end = i + 1
+                        break
+        side_effects.append(css[start:end])
+        pos = end
+    plain.append(css[pos:])
+    return '\n'.join(side_effects), ''.join(plain)
+
+
+def _merge_parsed(*parsed: Tuple) -> Tuple:
+    from xhtml2pdf.w3c.css import CSSRuleset
+    normal, important = CSSRuleset(), CSSRuleset()
+    for normal_rules, important_rules in parsed:
+        normal.mergeStyles(normal_rules)
+        important.mergeStyles(important_rules)
+    return normal, important
+
+
+def _parse_shared(css_parser, css: str) -> Tuple:
+    """Parse CSS with xhtml2pdf, reusing the parsed rules of text seen before"""
+    side_effects, plain = _split_side_effect_rules(css)
+
+    with _parsed_css_lock:
+        parsed = _parsed_css.get(plain)
+        if parsed is not None:
+            _parsed_css.move_to_end(plain)
+    if parsed is None:
+        parsed = css_parser.parse(plain)
+        with _parsed_css_lock:
+            _parsed_css[plain] = parsed
+            while len(_parsed_css) > settings.STYLESHEET_CACHE_SIZE:
+                _parsed_css.popitem(last=False)
+
+    if not side_effects:
+        return parsed
+    # @page and friends configure the document, so they run for every PDF
+    return _merge_parsed(parsed, css_parser.parse(side_effects))
+
+
+def enable_shared_pdf_css() -> bool:
+    """
+    Make xhtml2pdf parse each distinct stylesheet once instead of once per document.
+    Parsed rulesets are read-only during layout, so they are shared between PDFs.
+    """
+    global _shared_css_enabled
+    if _shared_css_enabled:
+        return True
+    try:
+        from xhtml2pdf import context as pisa_context
+        from xhtml2pdf.w3c import css as pisa_css
+    except ImportError:
+        return False
+
+    def parseCSS(self):
+        import weakref
+
+        # Mirrors pisaContext.parseCSS, but goes through the shared cache
+        self.cssBuilder = pisa_context.pisaCSSBuilder(mediumSet=["all", "print", "pdf"])
+        self.cssBuilder._c = weakref.ref(self)
+        pisa_context.pisaCSSBuilder.c = property(lambda builder: builder._c())
+
+        self.cssParser = pisa_context.pisaCSSParser(self.cssBuilder)
+        self.cssParser.rootPath = self.pathDirectory
+        self.cssParser._c = weakref.ref(self)
+        pisa_context.pisaCSSParser.c = property(lambda parser: parser._c())
+
+        self.css = _parse_shared(self.cssParser, self.cssText)
+        self.cssDefault = _parse_shared(self.cssParser, self.cssDefaultText)
+        self.cssCascade = pisa_css.CSSCascadeStrategy(userAgent=self.cssDefault, user=self.css)
+        self.cssCascade.parser = self.cssParser
+
+    pisa_context.pisaContext.parseCSS = parseCSS
+    _shared_css_enabled = True
+    return True
@@ -0,0 +1,112 @@
+"""
+Registry of compiled Jinja2 resume templates
+Every template ID maps to a file in app/templates/resume and is compiled
+once (with an on-disk bytecode cache) instead of on every render.
+Stylesheets live in app/templates/resume/styles; templates without their
+own stylesheet use the default template's. Palettes, sizes and other
+per-template settings come from the specs (template_specs).
+"""
+import os
+import re
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from app.config import settings
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'resume')
+TEMPLATE_EXTENSION = '.html'
+STYLESHEET_DIR = 'styles'
+STYLESHEET_EXTENSION = '.css'
+DEFAULT_TEMPLATE_ID = 'minimalist-clean'
+
+_LI_OPEN = re.compile(r'<li>')
+
+_environment: Optional[Environment] = None
+_templates: Dict[str, Template] = {}
+_stylesheets: Dict[str, Template] = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=settings.SECTION_CACHE_SIZE)
+def _bullets(html: str, glyph: str) -> str:
+    """Prefix every list item with an explicit bullet span (xhtml2pdf ignores li:before)"""
+    return _LI_OPEN.sub(f'<li><span class="bullet">{glyph}</span>', html)
+
+
+def _strip_scheme(url: str) -> str:
+    """Drop the http(s):// prefix from a URL for display"""
+    return url.replace('https://', '').replace('http://', '')
+
+
+def _bytecode_cache_dir() -> str:
+    directory = settings.TEMPLATE_CACHE_DIR or os.path.join(tempfile.gettempdir(), 'ai-resume-templates')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def get_environment() -> Environment:
+    """Return the shared Jinja2 environment, creating it on first use"""
+    global _environment
+    if _environment is None:
+        with _lock:
+            if _environment is None:
+                env = Environment(
+                    loader=FileSystemLoader(TEMPLATE_DIR),
+                    bytecode_cache=FileSystemBytecodeCache(_bytecode_cache_dir()),
+                    autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=True),
+                    auto_reload=False,
+                    trim_blocks=True,
+                    lstrip_blocks=True,
+                )
+                env.filters['bullets'] = _bullets
+                env.filters['strip_scheme'] = _strip_scheme
+                _environment = env
+    return _environment
+
+
+def available_templates() -> List[str]:
+    """List the template IDs that have a template file"""
+    return sorted(
+        name[:-len(TEMPLATE_EXTENSION)]
+        for name in os.listdir(TEMPLATE_DIR)
+        if name.endswith(TEMPLATE_EXTENSION) and not name.startswith('_')
+    )
+
+
+def _stylesheet_path(template_id: str) -> str:
+    return f'{STYLESHEET_DIR}/{template_id}{STYLESHEET_EXTENSION}'
+
+
+def load_templates() -> Dict[str, Template]:
+    """Compile every registered template and stylesheet. Safe to call more than once."""
+    env = get_environment()
+    for template_id in available_templates():
+        if template_id not in _templates:
+            _templates[template_id] = env.get_template(template_id + TEMPLATE_EXTENSION)
+        if template_id not in _stylesheets:
+            if os.path.exists(os.path.join(TEMPLATE_DIR, STYLESHEET_DIR, template_id + STYLESHEET_EXTENSION)):
+                _stylesheets[template_id] = env.get_template(_stylesheet_path(template_id))
+            else:
+                _stylesheets[template_id] = env.get_template(_stylesheet_path(DEFAULT_TEMPLATE_ID))
+    return _templates
+
+
+def get_template(template_id: Optional[str]) -> Template:
+    """Get the compiled template for an ID, falling back to the default template"""
+    if not _templates:
+        load_templates()
+    return _templates.get(template_id or DEFAULT_TEMPLATE_ID) or _templates[DEFAULT_TEMPLATE_ID]
+
+
+def get_stylesheet_template(template_id: Optional[str]) -> Template:
+    """Get the compiled stylesheet template for an ID, falling back to the default template"""
+    if not _stylesheets:
+        load_templates()
+    return _stylesheets.get(template_id or DEFAULT_TEMPLATE_ID) or _stylesheets[DEFAULT_TEMPLATE_ID]
+
+
+def render_template(template_id: Optional[str], **context) -> str:
+    """Render a registered template with the given context"""
+    return get_template(template_id).render(**context)
@@ -0,0 +1,240 @@
+"""
+Declarative template specs
+Each template is described by app/templates/specs/<id>.json: palette,
+typography, bullet glyphs, the native PDF theme and the DOCX styling. Specs
+inherit every top-level block they leave out from the spec they extend (the
+default template unless "extends" says otherwise). They are validated and
+compiled once at startup, and the same spec drives the HTML, PDF and DOCX
+renderers and the template catalog.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, StringConstraints, ValidationError, field_validator
+from app.services.template_registry import DEFAULT_TEMPLATE_ID, available_templates
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates', 'specs')
+SPEC_EXTENSION = '.json'
+
+HexColor = Annotated[str, StringConstraints(pattern=r'^#[0-9a-fA-F]{6}$')]
+DocxColor = Annotated[str, StringConstraints(pattern=r'^[0-9a-fA-F]{6}$')]  # Word colors have no '#'
+Length = Annotated[str, StringConstraints(pattern=r'^\d+(\.\d+)?(pt|px|in)$')]
+Rule = Optional[Tuple[str, float]]  # (color or 'accent', width in points)
+
+
+class _Spec(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
+
+class Palette(_Spec):
+    header: HexColor
+    accent: HexColor
+
+
+class FontSizes(_Spec):
+    base: Length
+    name: Length
+    section: Length
+
+
+class Spacing(_Spec):
+    padding: Length
+    margin_section: Length
+    margin_item: Length
+
+
+class Typography(_Spec):
+    font_sizes: Dict[str, FontSizes]  # By customization font_size; 'medium' is the fallback
+    spacing: Dict[str, Spacing]  # By customization spacing; 'normal' is the fallback
+    one_page_fonts: FontSizes
+    one_page_spacing: Spacing
+
+    @field_validator('font_sizes')
+    @classmethod
+    def _has_medium(cls, value):
+        if 'medium' not in value:
+            raise ValueError("font_sizes needs a 'medium' entry")
+        return value
+
+    @field_validator('spacing')
+    @classmethod
+    def _has_normal(cls, value):
+        if 'normal' not in value:
+            raise ValueError("spacing needs a 'normal' entry")
+        return value
+
+
+class Bullets(_Spec):
+    html: str = '•'
+    pdf: str = '•'
+
+
+class PdfTheme(_Spec):
+    """Native (ReportLab) layout; colors other than the palette are fixed per layout"""
+    layout: str
+    native_default: bool = True  # Rendered natively under PDF_ENGINE=auto
+    font: str
+    bold_font: str
+    name_font: str
+    name_align: Literal['left', 'center']
+    name_upper: bool
+    contact_align: Literal['left', 'center']
+    text: HexColor
+    muted: HexColor
+    item: HexColor
+    strong: Optional[HexColor] = None
+    name_color: Optional[HexColor] = None
+    separator: str
+    separator_color: HexColor
+    header_rule: Rule = None
+    title_rule: Rule = None
+    title_underline: Rule = None
+    title_prefix: str = ''
+    title_upper: bool = True
+    page_background: Optional[HexColor] = None
+    header_box: Optional[Tuple[str, str]] = None  # (background, border)
+    section_box: Optional[HexColor] = None
+    show_linkedin: bool = False
+
+
+class DocxName(_Spec):
+    size: float
+    color: Optional[DocxColor] = None
+    center: bool
+
+
+class DocxContact(_Spec):
+    size: float
+    center: bool
+
+
+class DocxHeading(_Spec):
+    color: Optional[DocxColor] = None
+    size: Optional[float] = None
+
+
+class DocxStyle(_Spec):
+    font: str
+    name: DocxName
+    contact: DocxContact
+    headings: Dict[str, DocxHeading] = {}
+
+
+class TemplateSpec(_Spec):
+    id: str
+    name: str
+    description: str = ''
+    category: str = ''
+    extends: Optional[str] = None
+    palette: Palette
+    typography: Typography
+    bullets: Bullets = Bullets()
+    pdf: PdfTheme
+    docx: DocxStyle
+    docx_base: str  # Template whose DOCX base document this template uses
+
+
+class SpecError(ValueError):
+    """A spec file is missing, malformed or fails validation"""
+
+
+_specs: Dict[str, TemplateSpec] = {}
+_catalog: Tuple[List[Dict], str] = ([], '')
+_lock = threading.Lock()
+
+
+def _read_raw() -> Dict[str, Dict]:
+    raw = {}
+    for name in sorted(os.listdir(SPEC_DIR)):
+        if not name.endswith(SPEC_EXTENSION):
+            continue
+        template_id = name[:-len(SPEC_EXTENSION)]
+        with open(os.path.join(SPEC_DIR, name), encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise SpecError(f"{name}: {e}")
+        if data.get('id', template_id) != template_id:
+            raise SpecError(f"{name}: id {data.get('id')!r} does not match the file name")
+        data['id'] = template_id
+        raw[template_id] = data
+    if DEFAULT_TEMPLATE_ID not in raw:
+        raise SpecError(f"Missing spec for the default template {DEFAULT_TEMPLATE_ID!r}")
+    return raw
+
+
+def _resolve(template_id: str, raw: Dict[str, Dict], resolved: Dict[str, Dict], chain: Tuple[str, ...] = ()) -> Dict:
+    """Merge a spec over the spec it extends (top-level blocks are inherited whole)"""
+    if template_id in resolved:
+        return resolved[template_id]
+    if template_id in chain:
+        raise SpecError(f"Spec inheritance cycle: {' -> '.join(chain + (template_id,))}")
+    if template_id not in raw:
+        raise SpecError(f"{chain[-1]} extends unknown template {template_id!r}")
+
+    own = raw[template_id]
+    parent_id = own.get('extends', DEFAULT_TEMPLATE_ID if template_id != DEFAULT_TEMPLATE_ID else None)
+    merged = {}
+    if parent_id:
+        parent = _resolve(parent_id, raw, resolved, chain + (template_id,))
+        merged.update({key: value for key, value in parent.items() if key not in ('name', 'description', 'category', 'extends')})
+    merged.update(own)
+    merged['docx_base'] = template_id if 'docx' in own else merged.get('docx_base', template_id)
+    resolved[template_id] = merged
+    return merged
+
+
+def _build_catalog(specs: Dict[str, TemplateSpec]) -> Tuple[List[Dict], str]:
+    catalog = [
+        {
+            'id': spec.id,
+            'name': spec.name,
+            'description': spec.description,
+            'category': spec.category,
+            'palette': spec.palette.model_dump(),
+            'layout': spec.pdf.layout,
+            'native_pdf': spec.pdf.native_default,
+        }
+        for spec in specs.values()
+    ]
+    payload = json.dumps(catalog, sort_keys=True).encode('utf-8')
+    return catalog, f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+
+
+def load_specs() -> Dict[str, TemplateSpec]:
+    """Validate and compile every spec file. Safe to call more than once."""
+    global _catalog
+    with _lock:
+        if _specs:
+            return _specs
+        raw = _read_raw()
+        resolved: Dict[str, Dict] = {}
+        specs = {}
+        for template_id in raw:
+            try:
+                specs[template_id] = TemplateSpec(**_resolve(template_id, raw, resolved))
+            except ValidationError as e:
+                raise SpecError(f"{template_id}{SPEC_EXTENSION}: {e}")
+
+        missing = sorted(set(available_templates()) - set(specs))
+        if missing:
+            print(f"[TEMPLATES] No spec for {', '.join(missing)}; using {DEFAULT_TEMPLATE_ID}")
+        _specs.update(specs)
+        _catalog = _build_catalog(_specs)
+        print(f"[TEMPLATES] Compiled {len(_specs)} template specs")
+    return _specs
+
+
+def get_spec(template_id: Optional[str]) -> TemplateSpec:
+    """Get the compiled spec for an ID, falling back to the default template"""
+    specs = _specs or load_specs()
+    return specs.get(template_id or DEFAULT_TEMPLATE_ID) or specs[DEFAULT_TEMPLATE_ID]
+
+
+def catalog() -> Tuple[List[Dict], str]:
+    """(catalog entries, ETag) for the template catalog endpoint; built once at load time"""
+    if not _specs:
+        load_specs()
+    return _catalog
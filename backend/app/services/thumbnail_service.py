@@ -0,0 +1,157 @@
+"""
+First-page thumbnails of saved resumes
+Thumbnails are rasterized with pypdfium2 from the stored PDF export (see
+artifact_store). Each image is stored on disk under the hash of everything
+that affects it, so a resume is only rasterized again after it changes;
+the least recently used images are pruned beyond THUMBNAIL_CACHE_MAX_FILES.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+from app.config import settings
+
+try:
+    import pypdfium2 as pdfium
+    HAS_RASTERIZER = True
+except ImportError:
+    HAS_RASTERIZER = False
+
+THUMBNAIL_FORMATS = {'png': 'image/png', 'webp': 'image/webp'}
+MIN_WIDTH, MAX_WIDTH = 80, 1200
+
+# Bump when the rendering of thumbnails changes so stale files are not served
+THUMBNAIL_VERSION = 1
+
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_writes_since_prune = 0
+
+
+def thumbnail_key(content: str, title: str, template: Optional[Dict], personal_info: Optional[Dict],
+                  customization: Optional[Dict], width: int, image_format: str) -> str:
+    """Hash of everything that affects a thumbnail"""
+    payload = json.dumps(
+        [THUMBNAIL_VERSION, settings.PDF_ENGINE, content, title, template, personal_info, customization, width, image_format],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cache_key(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+              customization: Optional[Dict] = None, width: Optional[int] = None, image_format: str = 'png') -> str:
+    """The key get_thumbnail() serves a request under (width clamped to the allowed range); no rendering"""
+    width = min(max(width or settings.THUMBNAIL_WIDTH, MIN_WIDTH), MAX_WIDTH)
+    return thumbnail_key(content, title, template, personal_info, customization, width, image_format)
+
+
+def _cache_dir() -> str:
+    directory = settings.THUMBNAIL_CACHE_DIR or os.path.join(tempfile.gettempdir(), 'ai-resume-thumbnails')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def prune(max_files: Optional[int] = None) -> int:
+    """Delete the least recently used thumbnails beyond THUMBNAIL_CACHE_MAX_FILES"""
+    max_files = settings.THUMBNAIL_CACHE_MAX_FILES if max_files is None else max_files
+    directory = _cache_dir()
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith('.tmp'):
+            continue  # Being written right now
+        try:
+            entries.append((os.path.getmtime(os.path.join(directory, name)), name))
+        except OSError:
+            continue
+    removed = 0
+    for _, name in sorted(entries)[:max(len(entries) - max_files, 0)]:
+        try:
+            os.remove(os.path.join(directory, name))
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def render_pdf(content: str, title: str, template: Optional[Dict], personal_info: Optional[Dict],
+               customization: Optional[Dict]) -> bytes:
+    """Get the PDF export of a resume (pre-rendered, or rendered now) as bytes"""
+    from app.services.artifact_store import read_or_render
+
+    return read_or_render(content, title, template=template, personal_info=personal_info,
+                          customization=customization, export_format='pdf')
+
+
+def rasterize_first_page(pdf: bytes, width: int, image_format: str) -> bytes:
+    """Rasterize the first page of a PDF to an image `width` pixels wide"""
+    document = pdfium.PdfDocument(pdf)
+    try:
+        page = document[0]
+        bitmap = page.render(scale=width / page.get_width())
+        image = bitmap.to_pil().convert('RGB')
+    finally:
+        document.close()
+
+    out = io.BytesIO()
+    if image_format == 'webp':
+        image.save(out, format='WEBP', quality=80, method=4)
+    else:
+        image.save(out, format='PNG', optimize=True)
+    return out.getvalue()
+
+
+def get_thumbnail(content: str, title: str, template: Optional[Dict] = None, personal_info: Optional[Dict] = None,
+                  customization: Optional[Dict] = None, width: Optional[int] = None,
+                  image_format: str = 'png') -> Tuple[bytes, str]:
+    """
+    Return (image bytes, cache key) for the first page of a resume.
+    The image is read from the on-disk cache when the resume is unchanged.
+    """
+    global _writes_since_prune
+    if not HAS_RASTERIZER:
+        raise RuntimeError("Thumbnails need pypdfium2, which is not installed")
+    if image_format not in THUMBNAIL_FORMATS:
+        raise ValueError(f"Unsupported thumbnail format: {image_format}")
+    width = min(max(width or settings.THUMBNAIL_WIDTH, MIN_WIDTH), MAX_WIDTH)
+
+    key = thumbnail_key(content, title, template, personal_info, customization, width, image_format)
+    path = os.path.join(_cache_dir(), f"{key}.{image_format}")
+
+    # One render per key, even when the dashboard asks for it several times at once
+    try:
+        with _lock_for(key):
+            try:
+                with open(path, 'rb') as f:
+                    image = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                try:
+                    os.utime(path)  # Pruning drops the least recently used files
+                except OSError:
+                    pass
+                return image, key
+
+            image = rasterize_first_page(render_pdf(content, title, template, personal_info, customization), width, image_format)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(image)
+            os.replace(temp_path, path)
+            print(f"[THUMBNAIL] Rendered {width}px {image_format} ({len(image)} bytes)")
+
+            _writes_since_prune += 1
+            if _writes_since_prune >= 50:
+                _writes_since_prune = 0
+                prune()
+    finally:
+        with _locks_guard:
+            _locks.pop(key, None)
+    return image, key
@@ -0,0 +1,83 @@
+"""
+Background warm-up of the export and parser stacks
+Imports the heavy rendering libraries and renders a throwaway PDF and DOCX
+so the first real download does not pay for font, stylesheet and module
+initialization
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+WARMUP_RESUME = """# Warm Up
+
+**Email:** warmup@example.com | **Phone:** 000 000 0000
+
+## Summary
+
+Renderer warm-up document.
+
+## Experience
+
+### Engineer - Example Corp
+- Rendered a **bold** and *italic* bullet
+"""
+
+_thread: Optional[threading.Thread] = None
+warmup_timings: Dict[str, float] = {}
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def warm_up_renderers() -> Dict[str, float]:
+    """Import the export/parser services and render each format once"""
+    start = time.perf_counter()
+
+    from app.services import export_service, resume_parser  # noqa: F401
+    warmup_timings['imports'] = time.perf_counter() - start
+
+    from app.services.template_registry import load_templates
+    load_templates()
+
+    # Exercise both PDF engines: templates can be routed to either one
+    step = time.perf_counter()
+    export_service.generate_native_pdf(WARMUP_RESUME, 'Warm Up')
+    if export_service.HAS_XHTML2PDF:
+        from app.services.fit_engine import render_pdf_bytes
+        from app.services.template_html_generator import generate_template_html
+        render_pdf_bytes(generate_template_html(WARMUP_RESUME))
+    warmup_timings['pdf'] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    from app.services.docx_writer import load_bases
+    load_bases()
+    docx_file = export_service.generate_docx(WARMUP_RESUME, 'Warm Up')
+    _remove(docx_file)
+    warmup_timings['docx'] = time.perf_counter() - step
+
+    warmup_timings['total'] = time.perf_counter() - start
+    print(f"[WARMUP] Renderers ready in {warmup_timings['total']:.2f}s "
+          f"(imports {warmup_timings['imports']:.2f}s, pdf {warmup_timings['pdf']:.2f}s, docx {warmup_timings['docx']:.2f}s)")
+    return warmup_timings
+
+
+def _run():
+    try:
+        warm_up_renderers()
+    except Exception as e:
+        # Warm-up is an optimization; a failure here must never take the app down
+        print(f"[WARMUP][ERROR] Renderer warm-up failed: {e}")
+
+
+def start_background_warmup() -> threading.Thread:
+    """Run warm_up_renderers in a daemon thread (once per process)"""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_run, name='renderer-warmup', daemon=True)
+        _thread.start()
+    return _thread
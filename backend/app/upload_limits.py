@@ -0,0 +1,64 @@
+"""
+Size-bounded request bodies for upload endpoints
+Starlette parses multipart bodies before the route runs, so the limit is
+enforced here, on the raw ASGI stream: a request announcing a larger
+Content-Length is refused up front, and a chunked or lying one is cut off as
+soon as it crosses the limit, before the rest is read.
+"""
+from typing import Iterable
+from fastapi import HTTPException, status
+from starlette.formparsers import MultiPartParser
+from starlette.responses import JSONResponse
+from app.config import settings
+
+# Uploaded files stay in memory up to this size, then go to a temp file
+MultiPartParser.max_file_size = settings.UPLOAD_SPOOL_BYTES
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    if max_bytes < 1024 * 1024:
+        size = f"{round(max_bytes / 1024, 1):g} KB" if max_bytes >= 1024 else f"{max_bytes} bytes"
+    else:
+        size = f"{round(max_bytes / (1024 * 1024), 1):g} MB"
+    return f"File too large. The maximum upload size is {size}."
+
+
+class UploadSizeLimitMiddleware:
+    """Reject POST bodies over max_bytes on the given paths while they stream in"""
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or scope['path'] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope['headers']:
+            if name == b'content-length' and value.isdigit() and int(value) > self.max_bytes:
+                print(f"[UPLOAD][ERROR] Refused {int(value)} byte body on {scope['path']}")
+                response = JSONResponse(
+                    {'detail': _too_large_detail(self.max_bytes)},
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > self.max_bytes:
+                    print(f"[UPLOAD][ERROR] Body on {scope['path']} exceeded {self.max_bytes} bytes")
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=_too_large_detail(self.max_bytes),
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,173 @@
+"""
+Mixed-traffic load test for the API: concurrent clients hammer a uvicorn
+server with the authenticated requests the editor sends (list, get, update,
+profile, format-only generate), and latency percentiles and throughput are
+reported per route and overall.
+
+By default a server is started from this checkout against a fresh SQLite
+database. Point --url at a running server (e.g. one started from an older
+checkout) to compare the two under the same load.
+
+Run from the backend directory:
+    python benchmarks/bench_async_db.py [--clients 32] [--seconds 15] [--url http://127.0.0.1:8000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESUME_DATA = {
+    'personal_info': {'name': 'Jane Doe', 'email': 'jane@example.com', 'phone': '+1 555 123 4567'},
+    'summary': 'Senior engineer with 10 years of experience building scalable systems.',
+    'experience': [{'title': 'Staff Engineer', 'company': 'Acme Corp', 'duration': '2019 - Present',
+                    'description': 'Led migration of 40 services to Kubernetes, cutting costs by 30%'}],
+    'education': [{'degree': 'M.Sc. Computer Science', 'institution': 'TU Berlin', 'year': '2014'}],
+    'skills': ['Python', 'Go', 'SQL', 'Kubernetes'],
+}
+
+# Share of requests per route, roughly what an editing session sends
+MIX = (('list', 30), ('get', 30), ('update', 15), ('me', 15), ('generate', 10))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    workdir = tempfile.mkdtemp(prefix='bench-async-db-')
+    env = dict(os.environ,
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+               SECRET_KEY='benchmark',
+               PRERENDER_ENABLED='false',
+               RENDERER_WARMUP='false',
+               PYTHONPATH=BACKEND_DIR)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get('/health')).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError('Server did not start')
+
+
+async def login(client: httpx.AsyncClient, index: int) -> dict:
+    email = f'bench{index}-{os.getpid()}@example.com'
+    await client.post('/api/auth/register', json={'name': 'Bench', 'email': email, 'password': 'benchmark'})
+    response = await client.post('/api/auth/login', json={'email': email, 'password': 'benchmark'})
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
+
+
+async def request(client: httpx.AsyncClient, kind: str, headers: dict, resume_ids: list):
+    resume_id = random.choice(resume_ids)
+    if kind == 'list':
+        return await client.get('/api/resumes/', headers=headers)
+    if kind == 'get':
+        return await client.get(f'/api/resumes/{resume_id}', headers=headers)
+    if kind == 'update':
+        return await client.put(f'/api/resumes/{resume_id}', headers=headers,
+                                json={'content': f'# Jane Doe\n\nRevision {random.random()}'})
+    if kind == 'me':
+        return await client.get('/api/auth/me', headers=headers)
+    return await client.post('/api/resumes/generate', headers=headers,
+                             json={'resume_data': RESUME_DATA, 'use_ai': False})
+
+
+async def client_loop(client, headers, resume_ids, stop_at, latencies, errors):
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    while time.monotonic() < stop_at:
+        kind = random.choices(kinds, weights)[0]
+        start = time.perf_counter()
+        try:
+            status = (await request(client, kind, headers, resume_ids)).status_code
+        except httpx.TransportError as e:
+            status = type(e).__name__
+        latencies[kind].append((time.perf_counter() - start) * 1000)
+        if status != 200:
+            key = f'{kind} {status}'
+            errors[key] = errors.get(key, 0) + 1
+
+
+def _percentile(values, pct):
+    return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else (values[0] if values else 0.0)
+
+
+async def run(url: str, clients: int, seconds: float, users: int):
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        await wait_ready(client)
+        sessions = []
+        for index in range(users):
+            headers = await login(client, index)
+            resume_ids = []
+            for n in range(5):
+                response = await client.post('/api/resumes/', headers=headers,
+                                             json={'title': f'Resume {n}', 'content': '# Jane Doe\n\nDraft'})
+                resume_ids.append(response.json()['id'])
+            sessions.append((headers, resume_ids))
+
+        latencies = {kind: [] for kind, _ in MIX}
+        errors = {}
+        stop_at = time.monotonic() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, *sessions[i % users], stop_at, latencies, errors)
+                               for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"{url}: {clients} clients, {seconds:.0f} s, {users} users")
+    print(f"{'route':<10} {'requests':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    everything = []
+    for kind, values in latencies.items():
+        everything.extend(values)
+        print(f"{kind:<10} {len(values):>8} {_percentile(values, 50):>8.1f} "
+              f"{_percentile(values, 95):>8.1f} {_percentile(values, 99):>8.1f}")
+    print(f"{'all':<10} {total:>8} {_percentile(everything, 50):>8.1f} "
+          f"{_percentile(everything, 95):>8.1f} {_percentile(everything, 99):>8.1f}")
+    print(f"throughput: {total / elapsed:.0f} req/s, errors: {errors or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help='Benchmark a running server instead of starting one')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=15)
+    parser.add_argument('--users', type=int, default=8)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        port = _free_port()
+        server = start_server(port)
+        url = f'http://127.0.0.1:{port}'
+    try:
+        asyncio.run(run(url, args.clients, args.seconds, args.users))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+DOCX parsing benchmark: the python-docx object model (the previous
+parse_docx) vs the streaming OOXML parser, for documents of growing length.
+Reports the median time of each, and the peak RSS growth of a fresh process
+parsing the document once (python-docx builds its tree with lxml, whose
+allocations tracemalloc cannot see). Linux only.
+
+Run from the backend directory:
+    python benchmarks/bench_docx_parse.py [runs]
+"""
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from docx import Document  # noqa: E402
+from app.services.ooxml_parser import docx_to_markdown  # noqa: E402
+
+SECTION_COUNTS = (5, 50, 250, 1000)
+
+
+def build_docx(sections: int) -> bytes:
+    """Headings, paragraphs, bullet lists and a small table per section"""
+    doc = Document()
+    for section in range(sections):
+        doc.add_heading(f'Experience {section + 1}', 2)
+        doc.add_paragraph(f'Staff Engineer - Acme Corp ({2000 + section % 20} - Present)')
+        for line in range(8):
+            doc.add_paragraph(f'Led project {line} across three teams, cutting deploy time by {line + 1}0%',
+                              style='List Bullet')
+        table = doc.add_table(rows=3, cols=3)
+        for row in table.rows:
+            for index, cell in enumerate(row.cells):
+                cell.text = f'Skill {index}'
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def python_docx_markdown(data: bytes) -> str:
+    """The previous parse_docx: paragraphs first, then every table"""
+    doc = Document(io.BytesIO(data))
+    markdown_content = []
+    for para in doc.paragraphs:
+        text = para.text.strip()
+        if not text:
+            continue
+        if para.style.name.startswith('Heading'):
+            level = para.style.name.replace('Heading', '').strip()
+            markdown_content.append(f"{'#' * int(level) if level in ('1', '2', '3') else '####'} {text}\n")
+        else:
+            markdown_content.append(f"{text}\n\n")
+    for table in doc.tables:
+        markdown_content.append("\n")
+        for row in table.rows:
+            markdown_content.append(f"| {' | '.join(cell.text.strip() for cell in row.cells)} |\n")
+        markdown_content.append("\n")
+    return "".join(markdown_content).strip()
+
+
+PARSERS = {
+    'python-docx': python_docx_markdown,
+    'ooxml': lambda data: docx_to_markdown(io.BytesIO(data)),
+}
+
+
+def _median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _status_kb(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def _peak_mb(parser: str, data: bytes) -> float:
+    """Peak RSS growth of a fresh process parsing the document once"""
+    with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
+        f.write(data)
+    try:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', parser, f.name],
+                             capture_output=True, text=True, check=True).stdout
+    finally:
+        os.remove(f.name)
+    return int(out.split()[-1]) / 1024
+
+
+def _child(parser: str, path: str):
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')  # Reset the high-water mark to the current RSS
+    baseline = _status_kb('VmRSS')
+    PARSERS[parser](data)
+    print(_status_kb('VmHWM') - baseline)
+
+
+def main(runs: int = 3):
+    print(f"median of {runs} runs")
+    print(f"{'sections':>9}{'size':>9}{'python-docx':>22}{'ooxml':>22}")
+    for sections in SECTION_COUNTS:
+        data = build_docx(sections)
+        row = f"{sections:>9}{len(data) / 1024:>7.0f}KB"
+        for parser, fn in PARSERS.items():
+            row += f"{_median_ms(lambda: fn(data), runs):>12.0f}ms{_peak_mb(parser, data):>8.1f}MB"
+        print(row)
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(*sys.argv[2:4])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,120 @@
+"""
+PDF engine benchmark: native ReportLab renderer vs markdown -> HTML -> xhtml2pdf
+Reports render time per template and a visual difference score between the
+two outputs (mean absolute grayscale difference of downsampled first pages).
+
+Run from the backend directory:
+    python benchmarks/bench_pdf_engines.py [runs]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from app.services import pdf_renderer  # noqa: E402
+from app.services.fit_engine import render_pdf_bytes  # noqa: E402
+from app.services.template_html_generator import generate_template_html  # noqa: E402
+from app.services.template_registry import available_templates  # noqa: E402
+
+# Native output is accepted as the default engine when it stays within this
+# visual difference (percent) of the xhtml2pdf output
+VISUAL_TOLERANCE = 8.0
+THUMBNAIL_SIZE = (85, 110)
+
+SAMPLE_RESUME = """# Jane Doe
+
+**Email:** jane@example.com | **Phone:** +1 555 123 4567
+**Location:** Berlin, Germany
+
+## Professional Summary
+
+Senior engineer with **10 years** of experience building *scalable* systems.
+
+## Experience
+
+### Staff Engineer - Acme Corp (2019 - Present)
+- Led migration of 40 services to Kubernetes, cutting costs by 30%
+- Mentored 12 engineers and ran the architecture review board
+- Designed the event pipeline handling 2B messages per day
+
+### Engineer - Foo & Bar (2014 - 2019)
+- Built billing pipeline processing $2M/day
+- Reduced p99 latency of the checkout API from 800ms to 120ms
+
+## Education
+
+- **M.Sc. Computer Science**, TU Berlin (2014)
+
+## Skills
+
+Python, Go, SQL, Kubernetes, AWS, Terraform, PostgreSQL, Kafka
+"""
+
+
+def render_native(template_id):
+    return pdf_renderer.render_pdf(SAMPLE_RESUME, 'Jane Doe', {'id': template_id}, scale=1.0)
+
+
+def render_html(template_id):
+    html = generate_template_html(SAMPLE_RESUME, {'id': template_id}, one_page=True, fit_scale=1.0)
+    return render_pdf_bytes(html)
+
+
+def timed(render, template_id, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pdf = render(template_id)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), pdf
+
+
+def visual_difference(pdf_a: bytes, pdf_b: bytes) -> float:
+    """
+    Mean absolute difference (percent) between the "ink" of the two first pages.
+    Ink is each pixel's distance from its page's background color, so a page
+    background the HTML engine fails to paint does not dominate the score.
+    """
+    import pypdfium2 as pdfium
+    from PIL import ImageChops, ImageFilter, ImageStat
+
+    def ink(pdf):
+        page = pdfium.PdfDocument(pdf)[0]
+        image = page.render(scale=0.5).to_pil().convert('L')
+        image = image.resize(THUMBNAIL_SIZE).filter(ImageFilter.GaussianBlur(1))
+        background = max(image.getcolors(256 * 256))[1]
+        return ImageChops.difference(image, image.point(lambda _: background))
+
+    difference = ImageChops.difference(ink(pdf_a), ink(pdf_b))
+    return ImageStat.Stat(difference).mean[0] / 255 * 100
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    # Warm both engines (imports, fonts, stylesheet caches)
+    render_native('minimalist-clean')
+    render_html('minimalist-clean')
+
+    print(f"{'template':<24}{'native ms':>11}{'xhtml2pdf ms':>14}{'speedup':>9}{'visual diff':>13}")
+    speedups, differences = [], []
+    for template_id in available_templates():
+        native_time, native_pdf = timed(render_native, template_id, runs)
+        html_time, html_pdf = timed(render_html, template_id, runs)
+        difference = visual_difference(native_pdf, html_pdf)
+        speedups.append(html_time / native_time)
+        differences.append(difference)
+        print(f"{template_id:<24}{native_time * 1000:>11.1f}{html_time * 1000:>14.1f}"
+              f"{html_time / native_time:>8.1f}x{difference:>12.1f}%")
+
+    print(f"\nMedian speedup {statistics.median(speedups):.1f}x (tolerance {VISUAL_TOLERANCE}%)")
+    for template_id, difference in zip(available_templates(), differences):
+        verdict = 'within tolerance' if difference <= VISUAL_TOLERANCE else 'exceeds tolerance'
+        default = 'native' if pdf_renderer.is_native_default(template_id) else 'html'
+        print(f"  {template_id:<24}{verdict:<20}PDF_ENGINE=auto uses {default}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+PDF text extraction benchmark: in-process page loop vs page ranges spread
+over the parse worker pool, for documents of growing length. Both paths
+must produce the same markdown.
+
+Run from the backend directory:
+    python benchmarks/bench_pdf_parse.py [runs]
+"""
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services import parse_pool  # noqa: E402
+from app.services.resume_parser import parse_pdf_pdfplumber  # noqa: E402
+
+PAGE_COUNTS = (2, 10, 30)
+
+
+def build_pdf(pages: int) -> bytes:
+    """An academic-CV-like document: a heading and dense publication lines per page"""
+    out = io.BytesIO()
+    pdf = canvas.Canvas(out, pagesize=letter)
+    for page in range(pages):
+        y = 740
+        pdf.setFont('Helvetica-Bold', 12)
+        pdf.drawString(54, y, f'PUBLICATIONS {page + 1}')
+        pdf.setFont('Helvetica', 9)
+        for line in range(60):
+            y -= 11
+            pdf.drawString(54, y, f'[{page * 60 + line}] Doe, J. et al. Scalable systems for resume parsing, '
+                                  f'Journal of Examples {2000 + line % 20}, pp. {line}-{line + 9}.')
+        pdf.showPage()
+    pdf.save()
+    return out.getvalue()
+
+
+def _median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(runs: int = 3):
+    workers = parse_pool.worker_count()
+    parse_pool.get_executor().submit(int).result()  # Start the workers outside the timings
+    print(f"{os.cpu_count()} CPUs, {workers} parse workers, median of {runs} runs")
+    print(f"{'pages':>6}{'in-process':>14}{'pool':>12}")
+    for pages in PAGE_COUNTS:
+        data = build_pdf(pages)
+
+        settings.PARSE_WORKERS = 1
+        sequential_result = parse_pdf_pdfplumber(data)
+        sequential = _median_ms(lambda: parse_pdf_pdfplumber(data), runs)
+
+        settings.PARSE_WORKERS = workers
+        settings.PARSE_PARALLEL_MIN_PAGES = 1
+        assert parse_pdf_pdfplumber(data) == sequential_result
+        pooled = _median_ms(lambda: parse_pdf_pdfplumber(data), runs)
+        print(f"{pages:>6}{sequential:>12.0f}ms{pooled:>10.0f}ms")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
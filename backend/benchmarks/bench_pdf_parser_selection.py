@@ -0,0 +1,75 @@
+"""
+PDF parser selection benchmark: pdfplumber on every page (the old default)
+vs the adaptive parser (PyPDF2 fast pass, pdfplumber only on pages that fail
+the quality check), for single-column documents and for documents where one
+page in four has two columns.
+
+Run from the backend directory:
+    python benchmarks/bench_pdf_parser_selection.py [runs]
+"""
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from reportlab.lib.pagesizes import letter  # noqa: E402
+from reportlab.pdfgen import canvas  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services.resume_parser import parse_pdf_adaptive, parse_pdf_pdfplumber  # noqa: E402
+
+PAGE_COUNTS = (1, 4, 12)
+
+
+def build_pdf(pages: int, two_column_every: int = 0) -> bytes:
+    out = io.BytesIO()
+    pdf = canvas.Canvas(out, pagesize=letter)
+    for page in range(pages):
+        two_column = two_column_every and page % two_column_every == two_column_every - 1
+        y = 740
+        pdf.setFont('Helvetica-Bold', 12)
+        pdf.drawString(54, y, f'EXPERIENCE {page + 1}')
+        pdf.setFont('Helvetica', 9)
+        for line in range(50):
+            y -= 13
+            if two_column:
+                pdf.drawString(54, y, f'Led project {line} across three teams and two')
+                pdf.drawString(320, y, f'Python, Go, SQL and Kubernetes skill {line}')
+            else:
+                pdf.drawString(54, y, f'Led project {line} across three teams, cutting deploy time by {line % 9 + 1}0% '
+                                      f'and mentoring engineers.')
+        pdf.showPage()
+    pdf.save()
+    return out.getvalue()
+
+
+def _median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(runs: int = 5):
+    settings.PARSE_WORKERS = 1  # Compare the extractors, not the worker pool
+    print(f"median of {runs} runs")
+    print(f"{'pages':>6}{'layout':>8}{'pdfplumber':>14}{'adaptive':>12}  parser")
+    for pages in PAGE_COUNTS:
+        for two_column_every in ((0, 4) if pages >= 4 else (0,)):
+            data = build_pdf(pages, two_column_every)
+            layout = _median_ms(lambda: parse_pdf_pdfplumber(data), runs)
+            adaptive = _median_ms(lambda: parse_pdf_adaptive(data), runs)
+            metadata = parse_pdf_adaptive(data).metadata
+            label = '2-col' if two_column_every else '1-col'
+            print(f"{pages:>6}{label:>8}{layout:>12.0f}ms{adaptive:>10.0f}ms  "
+                  f"{metadata['parser']} {metadata['layout_pages']}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,134 @@
+"""
+SQLite concurrency benchmark: the default rollback journal vs performance
+mode (WAL, synchronous=NORMAL, mmap), through the app's async engine and
+pool. Reader tasks fetch single resumes and per-user lists while writer tasks
+update resumes, all at once; reports reads/s, writes/s, latency percentiles
+and 'database is locked' failures. Each mode runs in a fresh process on a
+fresh database file, since the engines read their settings at import.
+
+Run from the backend directory:
+    python benchmarks/bench_sqlite_modes.py [seconds] [readers] [writers]
+"""
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERS = 50
+RESUMES_PER_USER = 4
+CONTENT = '# Jane Doe\n\n' + '- Led migration of 40 services to Kubernetes, cutting costs by 30%\n' * 60
+
+
+def _percentile(values, pct):
+    return statistics.quantiles(values, n=100)[pct - 1] if len(values) > 1 else (values[0] if values else 0.0)
+
+
+async def _workload(seconds: float, readers: int, writers: int) -> dict:
+    from sqlalchemy import select
+    from sqlalchemy.exc import OperationalError
+    import app.models as models
+    from app.database import AsyncSessionLocal, async_engine, init_db
+
+    init_db()
+    async with AsyncSessionLocal() as db:
+        for user_index in range(USERS):
+            user = models.User(name='Bench', email=f'bench{user_index}@example.com', password_hash='x')
+            db.add(user)
+            await db.flush()
+            db.add_all(models.Resume(user_id=user.id, title=f'Resume {n}', content=CONTENT)
+                       for n in range(RESUMES_PER_USER))
+        await db.commit()
+        resume_ids = list(await db.scalars(select(models.Resume.id)))
+        user_ids = list(await db.scalars(select(models.User.id)))
+
+    latencies = {'read': [], 'write': []}
+    locked = {'read': 0, 'write': 0}
+    stop_at = time.monotonic() + seconds
+
+    async def reader():
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    if random.random() < 0.5:
+                        await db.get(models.Resume, random.choice(resume_ids))
+                    else:
+                        (await db.scalars(select(models.Resume).where(
+                            models.Resume.user_id == random.choice(user_ids)
+                        ).order_by(models.Resume.created_at.desc()))).all()
+            except OperationalError:
+                locked['read'] += 1
+                continue
+            latencies['read'].append((time.perf_counter() - start) * 1000)
+
+    async def writer():
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    resume = await db.get(models.Resume, random.choice(resume_ids))
+                    resume.content = f'{CONTENT}\nRevision {random.random()}'
+                    await db.commit()
+            except OperationalError:
+                locked['write'] += 1
+                continue
+            latencies['write'].append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[reader() for _ in range(readers)], *[writer() for _ in range(writers)])
+    elapsed = time.perf_counter() - started
+    await async_engine.dispose()
+
+    return {
+        kind: {
+            'per_second': len(values) / elapsed,
+            'p50': _percentile(values, 50),
+            'p95': _percentile(values, 95),
+            'locked': locked[kind],
+        }
+        for kind, values in latencies.items()
+    }
+
+
+def _child(seconds: str, readers: str, writers: str):
+    print(json.dumps(asyncio.run(_workload(float(seconds), int(readers), int(writers)))))
+
+
+def run_mode(performance_mode: bool, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix='bench-sqlite-') as workdir:
+        env = dict(os.environ,
+                   DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+                   SECRET_KEY='benchmark',
+                   SQLITE_PERFORMANCE_MODE=str(performance_mode).lower())
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', str(seconds), str(readers),
+                              str(writers)], env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(seconds: float = 10, readers: int = 12, writers: int = 3):
+    print(f"{readers} readers + {writers} writers for {seconds:.0f} s per mode, "
+          f"{USERS * RESUMES_PER_USER} resumes of {len(CONTENT)} chars")
+    print(f"{'mode':<12} {'op':<6} {'ops/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'locked':>7}")
+    for label, performance_mode in (('rollback', False), ('performance', True)):
+        result = run_mode(performance_mode, seconds, readers, writers)
+        for kind in ('read', 'write'):
+            row = result[kind]
+            print(f"{label:<12} {kind:<6} {row['per_second']:>8.0f} {row['p50']:>8.1f} "
+                  f"{row['p95']:>8.1f} {row['locked']:>7}")
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--child']:
+        _child(*sys.argv[2:5])
+    else:
+        args = sys.argv[1:]
+        main(float(args[0]) if args else 10,
+             int(args[1]) if len(args) > 1 else 12,
+             int(args[2]) if len(args) > 2 else 3)
@@ -0,0 +1,64 @@
+"""
+Cold-start benchmark for the API
+Compares importing app.main (heavy services loaded lazily) with importing it
+together with the export, parser and AI services (the old eager behaviour).
+
+Run from the backend directory:
+    python benchmarks/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['reportlab', 'xhtml2pdf', 'docx', 'pdfplumber', 'PyPDF2', 'openai', 'groq']
+
+LAZY = "import app.main"
+EAGER = ("import app.main, app.services.export_service, "
+         "app.services.resume_parser, app.services.ai_service")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ','.join(loaded))
+"""
+
+
+def measure(statement: str, runs: int):
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    env.setdefault('SECRET_KEY', 'benchmark')
+    env['PYTHONPATH'] = BACKEND_DIR
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+
+    timings, loaded = [], ''
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        elapsed, _, loaded = result.stdout.strip().splitlines()[-1].partition(' ')
+        timings.append(float(elapsed))
+    return timings, loaded
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Cold-start import time over {runs} fresh interpreters\n")
+    results = {}
+    for label, statement in (('lazy (app.main)', LAZY), ('eager (app.main + services)', EAGER)):
+        timings, loaded = measure(statement, runs)
+        results[label] = statistics.median(timings)
+        print(f"{label:<30} median {results[label] * 1000:8.1f} ms   "
+              f"min {min(timings) * 1000:8.1f} ms   heavy modules loaded: {loaded or 'none'}")
+
+    lazy, eager = results['lazy (app.main)'], results['eager (app.main + services)']
+    print(f"\nStartup is {eager - lazy:.2f}s ({eager / lazy:.1f}x) faster with lazy imports")
+
+
+if __name__ == "__main__":
+    main()
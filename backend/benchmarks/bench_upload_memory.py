@@ -0,0 +1,88 @@
+"""
+Upload ingestion memory benchmark
+Ingests PDFs of growing size (a one-page resume padded with an embedded
+attachment) the way /api/resumes/upload now does (streamed into a spooled
+temp file, sniffed and parsed in place) and the way it used to (whole upload
+read into memory, parsed from a BytesIO copy), and reports the peak Python
+heap allocation of each.
+
+Run from the backend directory:
+    python benchmarks/bench_upload_memory.py
+"""
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+from pypdf import PdfReader, PdfWriter  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.services.export_service import generate_pdf  # noqa: E402
+from app.services.resume_parser import detect_file_type, parse_resume_file  # noqa: E402
+
+SAMPLE_RESUME = """# Jane Doe
+
+**Email:** jane@example.com | **Phone:** +1 555 123 4567
+
+## Experience
+
+### Staff Engineer - Acme Corp (2019 - Present)
+- Led migration of 40 services to Kubernetes, cutting costs by 30%
+- Mentored 12 engineers and ran the architecture review board
+
+## Skills
+
+Python, Go, SQL, Kubernetes, AWS
+"""
+
+SIZES_MB = (1, 4, 16)
+CHUNK = 64 * 1024  # Roughly what the ASGI server hands the multipart parser
+
+
+def padded_pdf(base: bytes, size: int) -> bytes:
+    writer = PdfWriter(clone_from=PdfReader(io.BytesIO(base)))
+    writer.add_attachment('padding.bin', os.urandom(size))
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    base = open(generate_pdf(SAMPLE_RESUME, 'Bench'), 'rb').read()
+    path = os.path.join(tempfile.gettempdir(), 'bench-upload.pdf')
+
+    def before():
+        # What upload_resume used to do: await file.read(), then BytesIO in the parser
+        with open(path, 'rb') as f:
+            content = f.read()
+        parse_resume_file(content, '.pdf')
+
+    def after():
+        with open(path, 'rb') as f, tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_BYTES) as spooled:
+            for chunk in iter(lambda: f.read(CHUNK), b''):
+                spooled.write(chunk)
+            parse_resume_file(spooled, detect_file_type(spooled))
+
+    print(f"{'upload':>10}{'before (read + copy)':>24}{'after (spooled)':>18}")
+    for size_mb in SIZES_MB:
+        with open(path, 'wb') as f:
+            f.write(padded_pdf(base, size_mb * 1024 * 1024))
+        print(f"{size_mb:>8}MB{_peak_mb(before):>22.1f}MB{_peak_mb(after):>16.1f}MB")
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Regression tests for the section markdown renderer
+Run from the backend directory: python -m pytest test_markdown_renderer.py
+"""
+
+from app.services import markdown_renderer
+
+
+def test_reference_links_do_not_resolve_across_sections():
+    markdown_renderer.clear_cache()
+    first, second = markdown_renderer.convert_sections(["See [my site][1].", "Refs\n\n[1]: http://evil.example"])
+    assert 'evil.example' not in first
+    assert '<a' not in first
+    # The cached fragment for the first section stays correct on its own
+    assert markdown_renderer.convert_section("See [my site][1].") == first
+
+
+def test_sections_match_standalone_conversion():
+    markdown_renderer.clear_cache()
+    texts = ["- one\n- two", "Plain paragraph", "```\ncode\n```"]
+    batched = markdown_renderer.convert_sections(texts)
+    markdown_renderer.clear_cache()
+    assert batched == [markdown_renderer.convert_section(text) for text in texts]
+
+
+if __name__ == "__main__":
+    test_reference_links_do_not_resolve_across_sections()
+    test_sections_match_standalone_conversion()
+    print("OK")
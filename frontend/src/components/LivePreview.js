@@ -0,0 +1,154 @@
+import React, { useState, useEffect, useRef } from 'react';
+
+// Split resume markdown the way the server's live document does:
+// a header, then one section per '## ' line.
+const splitSections = (text) => {
+  const model = { header: '', sections: [] };
+  let current = null;
+  (text.match(/[^\n]*\n|[^\n]+$/g) || []).forEach((line) => {
+    if (line.startsWith('## ')) {
+      current = { title: line.slice(3).replace(/\r?\n$/, ''), body: '' };
+      model.sections.push(current);
+    } else if (current) {
+      current.body += line;
+    } else {
+      model.header += line;
+    }
+  });
+  return model;
+};
+
+// Smallest single replacement turning `before` into `after`
+const splice = (before, after) => {
+  let start = 0;
+  while (start < before.length && start < after.length && before[start] === after[start]) {
+    start += 1;
+  }
+  let end = 0;
+  while (
+    end < before.length - start &&
+    end < after.length - start &&
+    before[before.length - 1 - end] === after[after.length - 1 - end]
+  ) {
+    end += 1;
+  }
+  return { start, end: before.length - end, text: after.slice(start, after.length - end) };
+};
+
+// Section-level deltas from one version of the content to the next
+const diffContent = (before, after) => {
+  const prev = splitSections(before);
+  const next = splitSections(after);
+  if (prev.sections.length !== next.sections.length) {
+    return [{ op: 'replace', text: after }];
+  }
+  const ops = [];
+  if (prev.header !== next.header) {
+    ops.push({ op: 'header', text: next.header });
+  }
+  next.sections.forEach((section, index) => {
+    const old = prev.sections[index];
+    if (old.title !== section.title) {
+      ops.push({ op: 'title', index, text: section.title });
+    }
+    if (old.body !== section.body) {
+      ops.push({ op: 'splice', index, ...splice(old.body, section.body) });
+    }
+  });
+  return ops;
+};
+
+// Server-rendered preview kept up to date over a WebSocket: edits are sent as
+// deltas and only the changed header/section HTML comes back.
+const LivePreview = ({ resumeId, token, content }) => {
+  const [html, setHtml] = useState('');
+  const [ats, setAts] = useState(null);
+  const [connected, setConnected] = useState(false);
+  const socketRef = useRef(null);
+  const iframeRef = useRef(null);
+  const sentRef = useRef(null);
+  const seqRef = useRef(0);
+  const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+
+  useEffect(() => {
+    if (!resumeId || !token) return undefined;
+
+    const url = `${API_URL.replace(/^http/, 'ws')}/api/resumes/${resumeId}/live?token=${encodeURIComponent(token)}`;
+    const socket = new WebSocket(url);
+    socketRef.current = socket;
+    sentRef.current = null;
+
+    socket.onopen = () => setConnected(true);
+    socket.onclose = () => setConnected(false);
+    socket.onmessage = (event) => {
+      const message = JSON.parse(event.data);
+      if (message.type === 'full') {
+        setHtml(message.html);
+      } else if (message.type === 'patch') {
+        const doc = iframeRef.current?.contentDocument;
+        if (!doc) return;
+        Object.entries(message.fragments).forEach(([fragment, fragmentHtml]) => {
+          const node = doc.querySelector(`[data-fragment="${fragment}"]`);
+          if (node) {
+            node.outerHTML = fragmentHtml;
+          }
+        });
+        if (message.css !== undefined) {
+          const style = doc.querySelector('style');
+          if (style) {
+            style.textContent = message.css;
+          }
+        }
+      } else if (message.type === 'ats') {
+        setAts(message);
+      } else if (message.type === 'error') {
+        // Our copy of the document drifted from the server's; send it whole
+        console.error('Live preview error:', message.detail);
+        sentRef.current = null;
+      }
+    };
+
+    return () => {
+      socket.close();
+      socketRef.current = null;
+    };
+  }, [API_URL, resumeId, token]);
+
+  useEffect(() => {
+    const socket = socketRef.current;
+    if (!connected || !socket || socket.readyState !== WebSocket.OPEN) return;
+
+    if (sentRef.current === null) {
+      // Once per connection (and after an error) send the whole text so both sides agree
+      sentRef.current = content;
+      socket.send(JSON.stringify({ type: 'delta', seq: ++seqRef.current, ops: [{ op: 'replace', text: content }] }));
+      return;
+    }
+    const ops = diffContent(sentRef.current, content);
+    if (ops.length) {
+      socket.send(JSON.stringify({ type: 'delta', seq: ++seqRef.current, ops }));
+      sentRef.current = content;
+    }
+  }, [content, connected]);
+
+  return (
+    <div>
+      <div className="flex items-center justify-between mb-2">
+        <h4 className="font-semibold text-gray-700">Preview:</h4>
+        <span className="text-xs text-gray-500">
+          {connected ? (ats ? `ATS score: ${ats.score}` : 'Live') : 'Connecting...'}
+        </span>
+      </div>
+      {/* Resume markdown can carry raw HTML: no scripts run; same origin only so patches reach contentDocument */}
+      <iframe
+        ref={iframeRef}
+        title="Live resume preview"
+        srcDoc={html}
+        sandbox="allow-same-origin"
+        className="w-full h-96 bg-white rounded border border-gray-200"
+      />
+    </div>
+  );
+};
+
+export default LivePreview;
@@ -0,0 +1,60 @@
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
+
+// Server-rendered first-page preview of a saved resume. The URL is versioned
+// with the resume's last update so the browser can cache each image forever.
+const ResumeThumbnail = ({ resume, token, width = 320 }) => {
+  const [src, setSrc] = useState(null);
+  const [failed, setFailed] = useState(false);
+  const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+  const version = resume.updated_at || resume.created_at;
+
+  useEffect(() => {
+    let objectUrl = null;
+    let cancelled = false;
+
+    const fetchThumbnail = async () => {
+      try {
+        const response = await axios.get(
+          `${API_URL}/api/resumes/${resume.id}/thumbnail`,
+          {
+            params: { width, format: 'webp', v: version },
+            headers: { Authorization: `Bearer ${token}` },
+            responseType: 'blob'
+          }
+        );
+        if (!cancelled) {
+          objectUrl = window.URL.createObjectURL(response.data);
+          setSrc(objectUrl);
+        }
+      } catch (error) {
+        console.error('Failed to load thumbnail:', error);
+        if (!cancelled) {
+          setFailed(true);
+        }
+      }
+    };
+
+    fetchThumbnail();
+    return () => {
+      cancelled = true;
+      if (objectUrl) {
+        window.URL.revokeObjectURL(objectUrl);
+      }
+    };
+  }, [API_URL, resume.id, version, token, width]);
+
+  return (
+    <div className="aspect-[8.5/11] mb-4 bg-gray-100 rounded border border-gray-200 overflow-hidden flex items-center justify-center">
+      {src ? (
+        <img src={src} alt={`${resume.title} preview`} className="w-full h-full object-cover object-top" />
+      ) : failed ? (
+        <span className="text-sm text-gray-400">No preview</span>
+      ) : (
+        <div className="animate-pulse w-full h-full bg-gray-200"></div>
+      )}
+    </div>
+  );
+};
+
+export default ResumeThumbnail;
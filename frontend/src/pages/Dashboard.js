@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../contexts/AuthContext';
+import ResumeThumbnail from '../components/ResumeThumbnail';
 
 const Dashboard = () => {
   const [resumes, setResumes] = useState([]);
@@ -112,6 +113,7 @@ const Dashboard = () => {
                 key={resume.id}
                 className="bg-white rounded-lg shadow-md p-6 hover:shadow-lg transition"
               >
+                <ResumeThumbnail resume={resume} token={token} />
                 <h3 className="text-xl font-semibold mb-2">{resume.title}</h3>
                 <p className="text-sm text-gray-600 mb-4">
                   Created: {new Date(resume.created_at).toLocaleDateString()}
@@ -1,16 +1,33 @@
 import React, { useState } from 'react';
-import { useNavigate } from 'react-router-dom';
+import { useLocation, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../contexts/AuthContext';
 
+// Merge extracted resume data over the empty form, keeping at least one education/experience row
+const withPrefill = (empty, data) => {
+  if (!data) return empty;
+  return {
+    ...empty,
+    personal_info: { ...empty.personal_info, ...data.personal_info },
+    summary: data.summary || '',
+    education: data.education?.length ? data.education : empty.education,
+    experience: data.experience?.length ? data.experience : empty.experience,
+    skills: data.skills || [],
+    use_ai: false
+  };
+};
+
 const ResumeBuilder = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const { token } = useAuth();
   const navigate = useNavigate();
+  const location = useLocation();
   const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+  // Data extracted from an uploaded resume pre-fills the form
+  const prefill = location.state?.resumeData;
 
-  const [formData, setFormData] = useState({
+  const [formData, setFormData] = useState(() => withPrefill({
     personal_info: {
       name: '',
       email: '',
@@ -38,8 +55,9 @@ const ResumeBuilder = () => {
       }
     ],
     skills: [],
-    use_openai: false
-  });
+    use_openai: false,
+    use_ai: true
+  }, prefill));
 
   const [newSkill, setNewSkill] = useState('');
   const [resumeTitle, setResumeTitle] = useState('');
@@ -131,7 +149,8 @@ const ResumeBuilder = () => {
         `${API_URL}/api/resumes/generate`,
         {
           resume_data: formData,
-          use_openai: formData.use_openai
+          use_openai: formData.use_openai,
+          use_ai: formData.use_ai
         },
         {
           headers: { Authorization: `Bearer ${token}` }
@@ -421,6 +440,17 @@ const ResumeBuilder = () => {
                 Use OpenAI (default: Groq)
               </span>
             </label>
+            <label className="flex items-center mt-2">
+              <input
+                type="checkbox"
+                checked={!formData.use_ai}
+                onChange={(e) => setFormData({ ...formData, use_ai: !e.target.checked })}
+                className="mr-2"
+              />
+              <span className="text-sm text-gray-700">
+                Format only (keep my wording, skip the AI)
+              </span>
+            </label>
           </div>
 
           {/* Submit Button */}
@@ -429,7 +459,7 @@ const ResumeBuilder = () => {
             disabled={loading}
             className="w-full bg-primary-600 text-white py-3 rounded-md hover:bg-primary-700 disabled:opacity-50 disabled:cursor-not-allowed font-semibold"
           >
-            {loading ? 'Generating Resume...' : 'Generate Resume with AI'}
+            {loading ? 'Generating Resume...' : formData.use_ai ? 'Generate Resume with AI' : 'Generate Resume'}
           </button>
         </form>
       </div>
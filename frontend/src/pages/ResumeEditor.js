@@ -5,6 +5,7 @@ import ReactMarkdown from 'react-markdown';
 import { useAuth } from '../contexts/AuthContext';
 import ATSChecker from '../components/ATSChecker';
 import TemplateSwitcher from '../components/TemplateSwitcher';
+import LivePreview from '../components/LivePreview';
 
 // Available section types for adding new sections
 const SECTION_TYPES = [
@@ -308,12 +309,7 @@ const ResumeEditor = () => {
                 {/* Preview */}
                 {content && (
                   <div className="mt-4 border-t pt-4">
-                    <h4 className="font-semibold text-gray-700 mb-2">Preview:</h4>
-                    <div className="bg-gray-50 p-4 rounded border border-gray-200 max-h-96 overflow-y-auto">
-                      <div className="prose prose-sm max-w-none">
-                        <ReactMarkdown>{content}</ReactMarkdown>
-                      </div>
-                    </div>
+                    <LivePreview resumeId={id} token={token} content={content} />
                   </div>
                 )}
               </div>
@@ -14,6 +14,7 @@ const ResumeUpload = () => {
   const [success, setSuccess] = useState('');
   const [parsedContent, setParsedContent] = useState('');
   const [filename, setFilename] = useState('');
+  const [extracted, setExtracted] = useState(null);
   const [title, setTitle] = useState('');
   const [selectedTemplate, setSelectedTemplate] = useState(null);
   const [saving, setSaving] = useState(false);
@@ -60,6 +61,7 @@ const ResumeUpload = () => {
 
       setParsedContent(response.data.content);
       setFilename(response.data.filename);
+      setExtracted(response.data.extracted);
       setTitle(file.name.replace(/\.(pdf|docx)$/i, ''));
       setSuccess('Resume uploaded and parsed successfully!');
     } catch (err) {
@@ -346,12 +348,23 @@ const ResumeUpload = () => {
                     <label className="block text-sm font-medium text-gray-700">
                       Resume Content (Editable)
                     </label>
-                    <button
-                      onClick={() => setParsedContent('')}
-                      className="text-sm text-red-600 hover:text-red-800"
-                    >
-                      Clear & Upload New
-                    </button>
+                    <div className="flex items-center gap-4">
+                      {extracted && (
+                        <button
+                          onClick={() => navigate('/builder/classic', { state: { resumeData: extracted.resume_data } })}
+                          className="text-sm text-primary-600 hover:text-primary-800"
+                          title={`Extraction confidence: ${Math.round(extracted.overall_confidence * 100)}%`}
+                        >
+                          Open in Builder
+                        </button>
+                      )}
+                      <button
+                        onClick={() => setParsedContent('')}
+                        className="text-sm text-red-600 hover:text-red-800"
+                      >
+                        Clear & Upload New
+                      </button>
+                    </div>
                   </div>
                   <textarea
                     value={parsedContent}